@@ -276,7 +276,8 @@ detailed_node_map = {
             "next_node": "END",
             "tech_stack_used": ["Gemini Audio API", "pydub"],
             "updates": {
-                "podcast_audio_base64": "[SYSTEM] Base64 encoded MP3/WAV file",
+                "podcast_audio_data": "[SYSTEM] Raw PCM audio bytes",
+                "podcast_audio_base64": "[SYSTEM] Base64 encoded WAV file (inline_audio only)",
                 "podcast_duration_seconds": "[SYSTEM] Length of audio in seconds",
             },
             "example_output": {
@@ -5,7 +5,7 @@ Content enhancement node for LangGraph workflow.
 from loguru import logger
 
 from ...domain.models import WorkflowState
-from ...infrastructure.llm import get_llm_service
+from ...infrastructure.llm import normalize_provider
 from ...infrastructure.llm.service import LLMService
 from ...infrastructure.settings import get_settings
 from ...infrastructure.logging_utils import (
@@ -47,25 +47,23 @@ def enhance_content_node(state: WorkflowState) -> WorkflowState:
     provider = metadata.get("provider") or settings.llm.content_provider
     model = metadata.get("model") or settings.llm.content_model
 
-    if provider == "google":
-        provider = "gemini"
+    provider = normalize_provider(provider)
 
     llm = state.get("llm_service")
     if llm is None or not llm.is_available():
-        if content_key:
-            llm = LLMService(
-                api_key=content_key,
-                model=model,
-                provider=provider,
-                max_summary_points=settings.llm.max_summary_points,
-                max_slides=settings.llm.max_slides,
-                max_tokens_summary=settings.llm.max_tokens_summary,
-                max_tokens_slides=settings.llm.max_tokens_slides,
-                temperature_summary=settings.llm.temperature_summary,
-                temperature_slides=settings.llm.temperature_slides,
-            )
-        else:
-            llm = get_llm_service()
+        # Per-request service with this request's key (env keys when absent);
+        # the shared singleton may hold another caller's key
+        llm = LLMService(
+            api_key=content_key or None,
+            model=model,
+            provider=provider,
+            max_summary_points=settings.llm.max_summary_points,
+            max_slides=settings.llm.max_slides,
+            max_tokens_summary=settings.llm.max_tokens_summary,
+            max_tokens_slides=settings.llm.max_tokens_slides,
+            temperature_summary=settings.llm.temperature_summary,
+            temperature_slides=settings.llm.temperature_slides,
+        )
         state["llm_service"] = llm
     require_slide_llm = output_format in ("pptx", "pdf_from_pptx")
     if require_slide_llm:
@@ -2,10 +2,14 @@
 Source extraction node for unified workflow.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 from loguru import logger
 
+from ...infrastructure.llm import normalize_provider
 from ...infrastructure.logging_utils import (
     log_node_start,
     log_node_end,
@@ -22,6 +26,13 @@ from ...utils.source_utils import (
     detect_format,
 )
 
+# Shared by every extraction so worker threads are reused across requests
+# (threads start lazily, so the pool costs nothing until sources arrive)
+MAX_EXTRACT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_extract_executor = ThreadPoolExecutor(
+    max_workers=MAX_EXTRACT_WORKERS, thread_name_prefix="extract-source"
+)
+
 
 def extract_sources_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
     """
@@ -55,80 +66,32 @@ def extract_sources_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
     )
 
     try:
-        from ..parsers import WebParser, get_parser
-
-        content_blocks: list[dict] = []
-        source_count = 0
-
-        provider_name = provider.lower()
-        if provider_name == "google":
-            provider_name = "gemini"
-
-        for source in state.get("resolved_sources", []):
-            source_type = source.get("type", "")
-
-            if source_type == "file":
-                file_path_str = source.get("file_path", "")
-                if not file_path_str:
-                    continue
-                file_path = Path(file_path_str)
-
-                if is_image_file(file_path):
-                    content, metadata = extract_image_content(
-                        file_path,
-                        provider_name,
-                        model,
-                        api_key,
-                    )
-                else:
-                    parser = get_parser(detect_format(file_path))
-                    content, metadata = parser.parse(file_path)
-
-                if content:
-                    title = metadata.get("title") or file_path.name
-                    content_blocks.append(
-                        {
-                            "title": title,
-                            "source": str(file_path),
-                            "content": content,
-                        }
-                    )
-                    source_count += 1
-                    logger.debug(f"Parsed file: {file_path}")
-
-            elif source_type == "url":
-                url = source.get("url", "")
-                if not url:
-                    continue
-
-                parser_type = source.get("parser")
-                parser = WebParser(parser=parser_type)
-                content, metadata = parser.parse(url)
-                if content:
-                    title = metadata.get("title") or url
-                    content_blocks.append(
-                        {
-                            "title": title,
-                            "source": url,
-                            "content": content,
-                        }
-                    )
-                    source_count += 1
-                    logger.debug(f"Parsed URL: {url}")
-
-            elif source_type == "text":
-                content = source.get("content", "")
-                if content.strip():
-                    content_blocks.append(
-                        {
-                            "title": "Copied Text",
-                            "source": "text",
-                            "content": content.strip(),
-                        }
-                    )
-                    source_count += 1
-                    logger.debug("Added text content")
-
+        provider_name = normalize_provider(provider)
+
+        # Sources are independent (file parses, URL fetches, image OCR), so
+        # extract them concurrently; map() keeps the original order.
+        sources = state.get("resolved_sources", [])
+        extract = partial(
+            _extract_source_or_error,
+            provider_name=provider_name,
+            model=model,
+            api_key=api_key,
+        )
+        if len(sources) > 1:
+            extracted = list(_extract_executor.map(extract, sources))
+        else:
+            extracted = [extract(source) for source in sources]
+
+        # One failing source (e.g. an unreachable URL) should not discard
+        # the others; fail the node only when nothing could be extracted
+        failures = [result for result in extracted if isinstance(result, Exception)]
+        for failure in failures:
+            logger.warning(f"Skipping source that failed to extract: {failure}")
+        content_blocks = [block for block in extracted if isinstance(block, dict)]
+        source_count = len(content_blocks)
+
+        if not content_blocks and failures:
+            raise failures[0]
         if not content_blocks:
             state["errors"] = state.get("errors", []) + ["No valid sources provided"]
             set_skip_source_processing(state, "no_valid_sources")
@@ -154,3 +117,91 @@ def extract_sources_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
         log_node_end("extract_sources", success=False, details=str(exc))
 
     return state
+
+
+def _extract_source_or_error(
+    source: dict, provider_name: str, model: str, api_key: str
+) -> dict | Exception | None:
+    """Extract one source, returning the exception instead of raising it."""
+    try:
+        return _extract_source(source, provider_name, model, api_key)
+    except Exception as exc:
+        return exc
+
+
+# Parsers keep no per-call state, so one instance per format / web parser
+# type is shared across sources, threads and requests.
+@lru_cache(maxsize=16)
+def _get_file_parser(content_format: str):
+    from ..parsers import get_parser
+
+    return get_parser(content_format)
+
+
+@lru_cache(maxsize=16)
+def _get_web_parser(parser_type: str | None):
+    from ..parsers import WebParser
+
+    return WebParser(parser=parser_type)
+
+
+def _extract_source(
+    source: dict, provider_name: str, model: str, api_key: str
+) -> dict | None:
+    """Extract one resolved source into a content block, or None if empty."""
+    source_type = source.get("type", "")
+
+    if source_type == "file":
+        file_path_str = source.get("file_path", "")
+        if not file_path_str:
+            return None
+        file_path = Path(file_path_str)
+
+        if is_image_file(file_path):
+            content, metadata = extract_image_content(
+                file_path,
+                provider_name,
+                model,
+                api_key,
+            )
+        else:
+            parser = _get_file_parser(detect_format(file_path))
+            content, metadata = parser.parse(file_path)
+
+        if not content:
+            return None
+        logger.debug(f"Parsed file: {file_path}")
+        return {
+            "title": metadata.get("title") or file_path.name,
+            "source": str(file_path),
+            "content": content,
+        }
+
+    if source_type == "url":
+        url = source.get("url", "")
+        if not url:
+            return None
+
+        parser = _get_web_parser(source.get("parser"))
+        content, metadata = parser.parse(url)
+        if not content:
+            return None
+        logger.debug(f"Parsed URL: {url}")
+        return {
+            "title": metadata.get("title") or url,
+            "source": url,
+            "content": content,
+        }
+
+    if source_type == "text":
+        content = source.get("content", "")
+        if not content.strip():
+            return None
+        logger.debug("Added text content")
+        return {
+            "title": "Copied Text",
+            "source": "text",
+            "content": content.strip(),
+        }
+
+    return None
@@ -4,14 +4,12 @@ FAQ generation node for unified workflow.
 Extracts FAQ Q&A pairs from content using LLM.
 """
 
-import os
-
 from loguru import logger
 
 from ..unified_state import UnifiedWorkflowState
 from ...domain.prompts.faq_prompts import build_faq_extraction_prompt
 from ...infrastructure.api.services.common.json_utils import safe_json_parse
-from ...infrastructure.llm import LLMService
+from ...infrastructure.llm import LLMService, normalize_provider
 
 
 def generate_faq_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
@@ -62,18 +60,11 @@ def generate_faq_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
     log_progress("Extracting FAQ questions and answers...")
 
     try:
-        provider_name = provider if provider != "google" else "gemini"
-
-        key_mapping = {
-            "gemini": "GOOGLE_API_KEY",
-            "openai": "OPENAI_API_KEY",
-            "anthropic": "ANTHROPIC_API_KEY",
-        }
-        env_var = key_mapping.get(provider_name)
-        if env_var and api_key:
-            os.environ[env_var] = api_key
-
-        llm_service = LLMService(provider=provider_name, model=model)
+        provider_name = normalize_provider(provider)
+
+        llm_service = LLMService(
+            api_key=api_key or None, provider=provider_name, model=model
+        )
         prompt = build_faq_extraction_prompt(
             raw_content,
             faq_count=faq_count,
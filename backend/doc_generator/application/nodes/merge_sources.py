@@ -11,6 +11,7 @@ from ...infrastructure.logging_utils import (
 )
 from ..unified_state import UnifiedWorkflowState, is_document_type
 from ...utils.source_utils import (
+    SOURCE_SEPARATOR,
     should_skip_source_processing,
     skip_source_reason,
     merge_markdown_sources,
@@ -54,7 +55,7 @@ def merge_sources_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
     if is_document_type(output_type):
         merged_content = merge_markdown_sources(content_blocks)
     else:
-        merged_content = "\n\n---\n\n".join(
+        merged_content = SOURCE_SEPARATOR.join(
             block.get("content", "").strip()
             for block in content_blocks
             if block.get("content", "").strip()
@@ -6,14 +6,49 @@ Handles:
 - Mind map tree structure generation
 """
 
-import json
-import os
+import hashlib
+import re
+from functools import lru_cache
 
+import orjson
 from loguru import logger
 
+from ...infrastructure.api.services.common.json_utils import (
+    extract_code_block,
+    extract_json_from_text,
+)
+from ...infrastructure.api.services.common.response_cache import ResponseCache
+from ...infrastructure.api.services.common.semantic_cache import SemanticCache
+from ...infrastructure.logging_utils import log_node_progress
+from ...infrastructure.settings import get_settings
+from ...utils.source_utils import SOURCE_SEPARATOR
+from ...utils.token_utils import count_tokens, truncate_to_tokens
 from ..unified_state import UnifiedWorkflowState
 
 
+@lru_cache(maxsize=1)
+def _get_mindmap_cache() -> ResponseCache:
+    """Exact-match cache of trees generated for identical inputs."""
+    mindmap_settings = get_settings().mindmap
+    return ResponseCache(
+        maxsize=mindmap_settings.cache_size,
+        ttl_seconds=mindmap_settings.cache_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_mindmap_semantic_cache() -> SemanticCache | None:
+    """Similarity cache for lightly edited content (None when disabled)."""
+    mindmap_settings = get_settings().mindmap
+    if not mindmap_settings.semantic_cache_enabled:
+        return None
+    return SemanticCache(
+        threshold=mindmap_settings.semantic_cache_threshold,
+        maxsize=mindmap_settings.cache_size,
+        ttl_seconds=mindmap_settings.cache_ttl_seconds,
+    )
+
+
 def generate_mindmap_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
     """
     Generate mind map from extracted content.
@@ -43,7 +78,7 @@ def generate_mindmap_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
 
     try:
         source_count = state.get("metadata", {}).get("source_count", 1)
-        tree = generate_mindmap_tree(
+        tree, cached = _generate_mindmap_tree_cached(
             content=raw_content,
             mode=mode,
             provider=provider,
@@ -60,6 +95,9 @@ def generate_mindmap_node(state: UnifiedWorkflowState) -> UnifiedWorkflowState:
         state["mindmap_tree"] = tree
         state["mindmap_mode"] = mode
         state["completed"] = True
+        metadata = state.get("metadata", {})
+        metadata["mindmap_cached"] = cached
+        state["metadata"] = metadata
 
         logger.info(f"Generated mind map with root: {tree.get('title', 'Untitled')}")
 
@@ -81,34 +119,188 @@ def generate_mindmap_tree(
     source_count: int,
 ) -> dict | None:
     """Generate a mind map tree from content."""
-    if not content:
-        return None
+    tree, _cached = _generate_mindmap_tree_cached(
+        content, mode, provider, model, api_key, source_count
+    )
+    return tree
 
-    from ...infrastructure.llm import LLMService
 
-    provider_name = provider if provider != "google" else "gemini"
+def _generate_mindmap_tree_cached(
+    content: str,
+    mode: str,
+    provider: str,
+    model: str,
+    api_key: str,
+    source_count: int,
+) -> tuple[dict | None, bool]:
+    """Generate a mind map tree, reusing one built from the same inputs.
 
-    key_mapping = {
-        "gemini": "GOOGLE_API_KEY",
-        "openai": "OPENAI_API_KEY",
-        "anthropic": "ANTHROPIC_API_KEY",
-    }
-    env_var = key_mapping.get(provider_name)
-    if env_var and api_key:
-        os.environ[env_var] = api_key
+    Identical content hits the exact cache; when the semantic cache is
+    enabled, content whose leading excerpt embeds close to an earlier one
+    reuses that tree too. Entries are scoped to the API key that paid for
+    them and stored as encoded JSON, so every hit returns a fresh dict.
 
-    llm_service = LLMService(provider=provider_name, model=model)
+    Returns:
+        Tuple of (tree or None, whether it came from the cache)
+    """
+    if not content:
+        return None, False
+
+    content = _bound_content(content, get_settings().mindmap.max_content_tokens)
 
+    from ...infrastructure.llm import LLMService, normalize_provider
+
+    provider_name = normalize_provider(provider)
+    # The prompt embeds mode, source count and content, so it is built once
+    # and doubles as the exact-cache key input.
     prompt = _build_mindmap_prompt(content, mode, source_count)
-    response = llm_service.generate(prompt)
+    key_owner = _key_owner(api_key)
+    cache_key = ResponseCache.make_key(
+        "mindmap", key_owner, provider_name, model, prompt
+    )
+    cached_tree = _get_mindmap_cache().get(cache_key)
+    if cached_tree is not None:
+        logger.info(f"Mind map cache hit: mode={mode}, model={model}")
+        return orjson.loads(cached_tree), True
+
+    llm_service = LLMService(
+        api_key=api_key or None, provider=provider_name, model=model
+    )
+
+    semantic_cache = _get_mindmap_semantic_cache()
+    embedding = None
+    namespace = f"mindmap:{key_owner}:{provider_name}:{model}:{mode}:{source_count}"
+    if semantic_cache is not None:
+        excerpt = content[: get_settings().mindmap.semantic_cache_chars]
+        embedding = llm_service.embed_text(excerpt)
+        if embedding is not None:
+            cached_tree = semantic_cache.get(namespace, embedding)
+            if cached_tree is not None:
+                logger.info(f"Mind map semantic cache hit: mode={mode}, model={model}")
+                return orjson.loads(cached_tree), True
+
+    response = _stream_mindmap_response(llm_service, prompt)
     if not response:
-        return None
+        return None, False
 
     mindmap_json = _extract_json(response)
     if not mindmap_json:
-        return None
+        return None, False
+
+    tree = _build_tree_structure(mindmap_json, mode, source_count)
+    encoded = orjson.dumps(tree)
+    _get_mindmap_cache().set(cache_key, encoded)
+    if embedding is not None:
+        semantic_cache.set(namespace, embedding, encoded)
+    return tree, False
+
+
+def _key_owner(api_key: str) -> str:
+    """Short digest of the API key, so cached trees stay with their key."""
+    return hashlib.blake2b((api_key or "").encode(), digest_size=8).hexdigest()
+
+
+CONTENT_TRUNCATED_MARKER = "\n\n[Content truncated...]"
+
+
+def _bound_content(content: str, max_tokens: int) -> str:
+    """Cap prompt content at max_tokens, marker included (0 disables the cap).
 
-    return _build_tree_structure(mindmap_json, mode, source_count)
+    Cuts at the last source separator inside the budget when there is one,
+    so trailing sources are dropped whole rather than mid-sentence.
+    """
+    if max_tokens <= 0:
+        return content
+    # Scans only up to the budget; merged sources can be far larger
+    head = truncate_to_tokens(content, max_tokens)
+    if head is content:
+        return content
+
+    budget = max(max_tokens - count_tokens(CONTENT_TRUNCATED_MARKER), 0)
+    head = truncate_to_tokens(head, budget)
+    cut = head.rfind(SOURCE_SEPARATOR)
+    if cut > 0:
+        head = head[:cut]
+    logger.info(f"Mind map content truncated: {len(content)} -> {len(head)} chars")
+    return head + CONTENT_TRUNCATED_MARKER
+
+
+_LABEL_RE = re.compile(r'"label"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class _BranchTracker:
+    """Spot main branches closing while the mind map JSON streams in.
+
+    Tracks object nesting across chunks (ignoring braces inside strings).
+    Main branches are the objects three levels deep, i.e. the children of
+    ``central_node`` in the prompted format.
+    """
+
+    BRANCH_DEPTH = 3
+
+    def __init__(self):
+        self._buffer: list[str] = []
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._branch_start: int | None = None
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume a chunk and return labels of branches it completed."""
+        self._buffer.append(chunk)
+        closed: list[str] = []
+        for index, char in enumerate(chunk, start=self._offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == self.BRANCH_DEPTH:
+                    self._branch_start = index
+            elif char == "}":
+                if self._depth == self.BRANCH_DEPTH and self._branch_start is not None:
+                    label = self._branch_label(self._branch_start, index + 1)
+                    if label:
+                        closed.append(label)
+                    self._branch_start = None
+                self._depth -= 1
+        self._offset += len(chunk)
+        return closed
+
+    def _branch_label(self, start: int, end: int) -> str | None:
+        text = "".join(self._buffer)
+        self._buffer = [text]
+        match = _LABEL_RE.search(text, start, end)
+        if not match:
+            return None
+        try:
+            return orjson.loads(f'"{match.group(1)}"')
+        except orjson.JSONDecodeError:
+            return match.group(1)
+
+
+def _stream_mindmap_response(llm_service, prompt: str) -> str:
+    """Stream the mind map response, reporting each main branch as it closes.
+
+    Branch labels go out through the workflow progress callback so the
+    client sees the map take shape before the full JSON has arrived.
+    """
+    tracker = _BranchTracker()
+    chunks: list[str] = []
+    branch_count = 0
+    for chunk in llm_service.stream_generate(prompt, step="mindmap_generation"):
+        chunks.append(chunk)
+        for label in tracker.feed(chunk):
+            branch_count += 1
+            log_node_progress("mindmap_branch", branch_count, label)
+    return "".join(chunks)
 
 
 def _build_mindmap_prompt(content: str, mode: str, source_count: int) -> str:
@@ -222,79 +414,59 @@ def _build_tree_structure(data: dict, mode: str, source_count: int) -> dict:
 
 
 def _parse_mindmap_item(node_data: dict) -> dict:
-    """Recursively parse node data into the expected format."""
-    if not node_data:
-        return {"label": "Unknown", "children": []}
-
-    label = node_data.get("label", node_data.get("name", node_data.get("text", "Node")))
-    children = node_data.get("children", [])
+    """Parse node data into the expected format.
 
-    parsed_children = [
-        _parse_mindmap_item(child) for child in children if isinstance(child, dict)
-    ]
+    Walks the tree with an explicit stack so deeply nested LLM output cannot
+    hit the recursion limit.
+    """
+    root: dict = {}
+    stack: list[tuple[dict, dict]] = [(node_data, root)]
+    while stack:
+        source, target = stack.pop()
+        if not source:
+            target.update(label="Unknown", children=[])
+            continue
 
-    result = {"label": label}
-    if parsed_children:
-        result["children"] = parsed_children
+        target["label"] = source.get(
+            "label", source.get("name", source.get("text", "Node"))
+        )
+        child_sources = [
+            child for child in source.get("children", []) if isinstance(child, dict)
+        ]
+        if child_sources:
+            children = [{} for _ in child_sources]
+            target["children"] = children
+            stack.extend(zip(child_sources, children))
 
-    return result
+    return root
 
 
 def _extract_json(text: str) -> dict | None:
-    """Extract JSON object from text."""
+    """Extract JSON object from text.
+
+    The happy paths (bare JSON, or one fenced block) take a single parse;
+    the brace scan only runs for JSON embedded in prose.
+    """
     if not text:
         return None
 
     def _parse_candidate(candidate: str) -> dict | None:
         try:
-            parsed = json.loads(candidate)
+            parsed = orjson.loads(candidate)
             return parsed if isinstance(parsed, dict) else None
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return None
 
-    direct = _parse_candidate(text)
-    if direct is not None:
-        return direct
-
-    cleaned = text.strip()
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
-
-    cleaned_parsed = _parse_candidate(cleaned)
-    if cleaned_parsed is not None:
-        return cleaned_parsed
-
-    start_idx = cleaned.find("{")
-    if start_idx == -1:
-        return None
+    stripped = text.strip()
+    if stripped.startswith("{"):
+        direct = _parse_candidate(stripped)
+        if direct is not None:
+            return direct
 
-    brace_count = 0
-    in_string = False
-    escape_next = False
+    block = extract_code_block(stripped)
+    if block:
+        fenced = _parse_candidate(block)
+        if fenced is not None:
+            return fenced
 
-    for i in range(start_idx, len(cleaned)):
-        ch = cleaned[i]
-        if escape_next:
-            escape_next = False
-            continue
-        if ch == "\\":
-            escape_next = True
-            continue
-        if ch == '"' and not escape_next:
-            in_string = not in_string
-            continue
-        if in_string:
-            continue
-        if ch == "{":
-            brace_count += 1
-        elif ch == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                return _parse_candidate(cleaned[start_idx : i + 1])
-
-    return None
+    return extract_json_from_text(stripped)
@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import base64
-
 from loguru import logger
 
 from ..unified_state import UnifiedWorkflowState
-from ...utils.podcast_utils import build_tts_prompt, synthesize_with_retry, wave_bytes
+from ...infrastructure.logging_utils import log_node_progress
+from ...utils.podcast_utils import build_tts_prompt, synthesize_pooled, wav_base64
 
 
 def synthesize_podcast_audio_node(
@@ -20,7 +19,8 @@ def synthesize_podcast_audio_node(
         state: Current workflow state with podcast_dialogue
 
     Returns:
-        Updated state with podcast_audio_base64
+        Updated state with podcast_audio_data (and podcast_audio_base64
+        when the request asked for inline audio)
     """
     dialogue = state.get("podcast_dialogue", [])
     request_data = state.get("request_data", {})
@@ -50,13 +50,23 @@ def synthesize_podcast_audio_node(
 
     try:
         tts_prompt = build_tts_prompt(dialogue, speakers)
-        audio_data = synthesize_with_retry(tts_prompt, speakers, gemini_api_key)
+        chunk_count = 0
+
+        def report_chunk(chunk: bytes) -> None:
+            # Progress only; the audio itself is delivered once, via audio_url
+            nonlocal chunk_count
+            chunk_count += 1
+            log_node_progress(
+                "podcast_audio_chunk", chunk_count, f"{len(chunk)} bytes"
+            )
 
-        wav_data = wave_bytes(audio_data)
-        audio_base64 = base64.b64encode(wav_data).decode()
+        audio_data = synthesize_pooled(
+            tts_prompt, speakers, gemini_api_key, on_chunk=report_chunk
+        )
 
         state["podcast_audio_data"] = audio_data
-        state["podcast_audio_base64"] = audio_base64
+        if request_data.get("inline_audio"):
+            state["podcast_audio_base64"] = wav_base64(audio_data)
         state["podcast_duration_seconds"] = len(audio_data) / (
             24000 * 2
         )  # 24kHz, 16-bit
@@ -45,21 +45,13 @@ def generate_podcast_script_node(state: UnifiedWorkflowState) -> UnifiedWorkflow
     )
 
     try:
-        from ...infrastructure.llm import LLMService
-        import os
+        from ...infrastructure.llm import LLMService, normalize_provider
 
-        provider_name = provider if provider != "google" else "gemini"
+        provider_name = normalize_provider(provider)
 
-        key_mapping = {
-            "gemini": "GOOGLE_API_KEY",
-            "openai": "OPENAI_API_KEY",
-            "anthropic": "ANTHROPIC_API_KEY",
-        }
-        env_var = key_mapping.get(provider_name)
-        if env_var and api_key:
-            os.environ[env_var] = api_key
-
-        llm_service = LLMService(provider=provider_name, model=model)
+        llm_service = LLMService(
+            api_key=api_key or None, provider=provider_name, model=model
+        )
 
         speaker_list = ", ".join([f"{s['name']} ({s['role']})" for s in speakers])
         source_count = state.get("metadata", {}).get("source_count", 1)
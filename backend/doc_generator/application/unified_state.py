@@ -60,7 +60,7 @@ class UnifiedWorkflowState(TypedDict, total=False):
         podcast_script: Generated dialogue script
         podcast_dialogue: Parsed dialogue entries
         podcast_audio_data: Raw PCM audio data
-        podcast_audio_base64: Base64-encoded WAV audio
+        podcast_audio_base64: Base64-encoded WAV audio (inline_audio requests)
 
         # --- Mind Map Generation ---
         mindmap_mode: Generation mode (summarize, detailed, hierarchical)
@@ -156,7 +156,7 @@ class UnifiedWorkflowState(TypedDict, total=False):
     #
     # PODCAST NODES:
     # - podcast_generate_script: Updates `podcast_script`, `podcast_dialogue`, `podcast_title`.
-    # - podcast_synthesize_audio: Updates `podcast_audio_base64`, `podcast_duration_seconds`.
+    # - podcast_synthesize_audio: Updates `podcast_audio_data`, `podcast_audio_base64`, `podcast_duration_seconds`.
     #
     # MINDMAP NODES:
     # - mindmap_generate: Updates `mindmap_tree`.
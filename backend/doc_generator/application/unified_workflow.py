@@ -256,7 +256,8 @@ def build_unified_workflow(checkpointer: Any = None) -> StateGraph:
     # podcast_synthesize_audio
     # Input: podcast_dialogue, speakers, gemini_api_key
     # Core: Gemini TTS synthesis, build WAV, compute duration.
-    # Output: podcast_audio_base64, podcast_duration_seconds
+    # Output: podcast_audio_data, podcast_audio_base64 (inline_audio only),
+    #         podcast_duration_seconds
     workflow.add_node("podcast_synthesize_audio", synthesize_podcast_audio_node)
 
     # ==========================================
@@ -688,19 +689,16 @@ async def run_unified_workflow_async_with_session(
     """
     import asyncio
 
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        lambda: run_unified_workflow_with_session(
-            output_type=output_type,
-            request_data=request_data,
-            api_key=api_key,
-            gemini_api_key=gemini_api_key,
-            user_id=user_id,
-            session_id=session_id,
-            reuse_content=reuse_content,
-            progress_callback=progress_callback,
-        ),
+    return await asyncio.to_thread(
+        run_unified_workflow_with_session,
+        output_type=output_type,
+        request_data=request_data,
+        api_key=api_key,
+        gemini_api_key=gemini_api_key,
+        user_id=user_id,
+        session_id=session_id,
+        reuse_content=reuse_content,
+        progress_callback=progress_callback,
     )
 
 
@@ -777,8 +775,7 @@ async def run_unified_workflow_async(
 
     # Execute workflow
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, workflow.invoke, initial_state)
+        result = await asyncio.to_thread(workflow.invoke, initial_state)
     except Exception as e:
         logger.error(f"Workflow execution failed: {e}")
         result = initial_state
@@ -33,6 +33,7 @@ from ..infrastructure.settings import (
     ParserSettings,
     WebParserSettings,
     ImageGenerationSettings,
+    IdeaCanvasSettings,
 )
 
 
@@ -57,4 +58,5 @@ __all__ = [
     "ParserSettings",
     "WebParserSettings",
     "ImageGenerationSettings",
+    "IdeaCanvasSettings",
 ]
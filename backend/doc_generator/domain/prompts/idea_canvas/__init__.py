@@ -3,6 +3,9 @@
 from .prompts import (
     completion_check_prompt,
     first_question_prompt,
+    format_history_entry,
+    history_summary_prompt,
+    history_summary_system_prompt,
     next_question_prompt,
     question_system_prompt,
 )
@@ -12,4 +15,7 @@ __all__ = [
     "first_question_prompt",
     "next_question_prompt",
     "completion_check_prompt",
+    "format_history_entry",
+    "history_summary_system_prompt",
+    "history_summary_prompt",
 ]
@@ -195,23 +195,34 @@ Generate the FIRST question to start exploring this idea. This should be a found
 Return the question as JSON."""
 
 
-def next_question_prompt(
-    idea: str, conversation_history: list[dict], question_count: int
-) -> str:
+def format_history_entry(index: int, question: str, answer: str) -> str:
+    """Format one Q&A turn as it appears in conversation history prompts.
+
+    Args:
+        index: 1-based turn number
+        question: Question text
+        answer: Answer text
+
+    Returns:
+        Formatted history entry
+    """
+    return f"\nQ{index}: {question}\nA{index}: {answer}\n"
+
+
+def next_question_prompt(idea: str, history_text: str, question_count: int) -> str:
     """Get the prompt for generating the next question.
 
+    The idea and history come first and only ever grow by appending, so
+    consecutive turns share a byte-identical prefix for provider prompt caching.
+
     Args:
         idea: The user's initial idea
-        conversation_history: List of previous Q&A pairs
+        history_text: Previous Q&A turns, pre-rendered with format_history_entry
         question_count: How many questions have been asked so far
 
     Returns:
         User prompt string
     """
-    history_text = ""
-    for i, item in enumerate(conversation_history, 1):
-        history_text += f"\nQ{i}: {item['question']}\nA{i}: {item['answer']}\n"
-
     return f"""Original idea: "{idea}"
 
 Conversation so far:
@@ -241,6 +252,35 @@ Otherwise, generate the NEXT logical question that addresses the most important
 Return your response as JSON."""
 
 
+def history_summary_system_prompt() -> str:
+    """Get the system prompt for compacting older conversation turns.
+
+    Returns:
+        System prompt string
+    """
+    return """You condense idea exploration sessions into compact context notes.
+
+Preserve every decision, constraint, preference and open question the user expressed.
+Drop pleasantries and repeated wording. Write terse bullet points, grouped by topic.
+Return ONLY the notes, no preamble."""
+
+
+def history_summary_prompt(idea: str, history_text: str) -> str:
+    """Get the prompt for summarizing older conversation turns.
+
+    Args:
+        idea: The user's initial idea
+        history_text: Rendered Q&A turns to summarize
+
+    Returns:
+        User prompt string
+    """
+    return f"""Original idea: "{idea}"
+
+Summarize these earlier questions and answers into context notes for the rest of the session:
+{history_text}"""
+
+
 def completion_check_prompt(idea: str, conversation_history: list[dict]) -> str:
     """Get the prompt for checking if exploration is complete.
 
@@ -251,9 +291,10 @@ def completion_check_prompt(idea: str, conversation_history: list[dict]) -> str:
     Returns:
         User prompt string
     """
-    history_text = ""
-    for i, item in enumerate(conversation_history, 1):
-        history_text += f"\nQ{i}: {item['question']}\nA{i}: {item['answer']}\n"
+    history_text = "".join(
+        format_history_entry(i, item["question"], item["answer"])
+        for i, item in enumerate(conversation_history, 1)
+    )
 
     return f"""Original idea: "{idea}"
 
@@ -1,9 +1,14 @@
 """Prompts for mind map generation."""
 
+from functools import lru_cache
 
+
+@lru_cache(maxsize=8)
 def mindmap_system_prompt(mode: str) -> str:
     """Get the system prompt for mind map generation based on mode.
 
+    Results are cached; there is one prompt per mode.
+
     Args:
         mode: Generation mode (summarize, brainstorm, structure)
 
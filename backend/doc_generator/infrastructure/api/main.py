@@ -56,6 +56,10 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     print("==> PrismDocs API shutting down", flush=True)
+    if _routes_initialized:
+        from .services.unified_generation import close_unified_service
+
+        await close_unified_service()
 
 
 app = FastAPI(
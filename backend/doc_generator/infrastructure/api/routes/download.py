@@ -95,6 +95,7 @@ async def download_file(file_path: str, token: str | None = None) -> FileRespons
         ".jpg": "image/jpeg",
         ".jpeg": "image/jpeg",
         ".svg": "image/svg+xml",
+        ".wav": "audio/wav",
     }
     media_type = media_types.get(suffix, "application/octet-stream")
 
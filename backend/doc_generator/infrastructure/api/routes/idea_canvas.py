@@ -14,15 +14,18 @@ from ..schemas.idea_canvas import (
     CanvasProgressEvent,
     CanvasQuestionEvent,
     CanvasReadyEvent,
+    CanvasReadyWithQuestionEvent,
     GenerateApproachesRequest,
     GenerateApproachesResponse,
     GenerateReportRequest,
     GenerateReportResponse,
+    RefineApproachesBatchRequest,
+    RefineApproachesBatchResponse,
     RefineApproachRequest,
     RefineApproachResponse,
     StartCanvasRequest,
 )
-from ..services.idea_canvas import get_idea_canvas_service
+from ..services.idea_canvas import get_idea_canvas_service, get_refinement_coalescer
 
 router = APIRouter(tags=["idea-canvas"])
 
@@ -45,7 +48,7 @@ async def start_event_generator(
     service = get_idea_canvas_service()
 
     async for event in service.start_session(request, api_key, user_id):
-        if isinstance(event, CanvasReadyEvent):
+        if isinstance(event, (CanvasReadyEvent, CanvasReadyWithQuestionEvent)):
             yield {"event": "ready", "data": event.model_dump_json()}
         elif isinstance(event, CanvasQuestionEvent):
             yield {"event": "question", "data": event.model_dump_json()}
@@ -152,7 +155,7 @@ async def submit_answer(
 
     # Get session to determine provider
     service = get_idea_canvas_service()
-    session = service.get_session(request.session_id)
+    session = await service.load_session(request.session_id)
 
     if not session:
         # Return error stream
@@ -207,7 +210,7 @@ async def generate_canvas_report(
     service = get_idea_canvas_service()
 
     # Get session to determine which API key to use
-    session = service.get_session(request.session_id)
+    session = await service.load_session(request.session_id)
     if not session:
         from fastapi import HTTPException
 
@@ -220,11 +223,14 @@ async def generate_canvas_report(
 
     try:
         image_api_key = api_keys.image
-        report_data = service.generate_report(
-            request.session_id,
-            api_key,
-            image_api_key=image_api_key,
-        )
+        # The report is written back to the session; don't race an answer
+        async with service.session_lock(request.session_id):
+            report_data = await service.run_blocking(
+                service.generate_report,
+                request.session_id,
+                api_key,
+                image_api_key,
+            )
 
         response = GenerateReportResponse(
             session_id=request.session_id,
@@ -269,7 +275,7 @@ async def generate_canvas_mindmap(
     service = get_idea_canvas_service()
 
     # Get session to determine which API key to use
-    session = service.get_session(request.session_id)
+    session = await service.load_session(request.session_id)
     if not session:
         from fastapi import HTTPException
 
@@ -281,7 +287,7 @@ async def generate_canvas_mindmap(
     api_key = get_api_key_for_provider(session.provider, api_keys)
 
     try:
-        mindmap_data = service.generate_mindmap_from_session(
+        mindmap_data = await service.generate_mindmap_from_session(
             request.session_id,
             api_key,
         )
@@ -320,7 +326,7 @@ async def generate_approaches(
 
     service = get_idea_canvas_service()
 
-    session = service.get_session(request.session_id)
+    session = await service.load_session(request.session_id)
     if not session:
         from fastapi import HTTPException
 
@@ -331,7 +337,9 @@ async def generate_approaches(
     api_key = get_api_key_for_provider(session.provider, api_keys)
 
     try:
-        result = service.generate_approaches(request.session_id, api_key)
+        result = await service.run_blocking(
+            service.generate_approaches, request.session_id, api_key
+        )
         return GenerateApproachesResponse(approaches=result["approaches"])
     except Exception as e:
         logger.error(f"Failed to generate approaches: {e}")
@@ -368,7 +376,7 @@ async def refine_approach(
 
     service = get_idea_canvas_service()
 
-    session = service.get_session(request.session_id)
+    session = await service.load_session(request.session_id)
     if not session:
         from fastapi import HTTPException
 
@@ -379,14 +387,17 @@ async def refine_approach(
     api_key = get_api_key_for_provider(session.provider, api_keys)
 
     try:
-        result = service.refine_approach(
-            session_id=request.session_id,
-            api_key=api_key,
-            approach_index=request.approach_index,
-            element_id=request.element_id,
-            element_type=request.element_type,
-            refinement_answer=request.refinement_answer,
-            current_approach=request.current_approach.model_dump(by_alias=True),
+        # Rapid clicks on the same session are coalesced into one LLM call
+        result = await get_refinement_coalescer().refine(
+            request.session_id,
+            api_key,
+            {
+                "approach_index": request.approach_index,
+                "element_id": request.element_id,
+                "element_type": request.element_type,
+                "refinement_answer": request.refinement_answer,
+                "current_approach": request.current_approach.model_dump(by_alias=True),
+            },
         )
         return RefineApproachResponse(approach=result)
     except Exception as e:
@@ -394,3 +405,78 @@ async def refine_approach(
         from fastapi import HTTPException
 
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/canvas/refine/batch",
+    summary="Refine several approach elements at once",
+    description=(
+        "Apply multiple refinements in a single LLM call. "
+        "Returns the updated approaches in the same order as the refinements."
+    ),
+    response_model=RefineApproachesBatchResponse,
+)
+async def refine_approaches_batch(
+    request: RefineApproachesBatchRequest,
+    api_keys: APIKeys = Depends(extract_api_keys),
+):
+    """Refine several approach elements with one LLM call.
+
+    Args:
+        request: Batched refinement request
+        api_keys: API keys from headers
+
+    Returns:
+        Updated approaches, one per refinement
+    """
+    logger.info(
+        f"=== Refining Approaches (batch): session={request.session_id}, "
+        f"count={len(request.refinements)} ==="
+    )
+
+    service = get_idea_canvas_service()
+
+    session = await service.load_session(request.session_id)
+    if not session:
+        from fastapi import HTTPException
+
+        raise HTTPException(
+            status_code=404, detail=f"Session not found: {request.session_id}"
+        )
+
+    api_key = get_api_key_for_provider(session.provider, api_keys)
+
+    try:
+        results = await service.run_blocking(
+            service.refine_approaches_batch,
+            request.session_id,
+            api_key,
+            [
+                {
+                    **item.model_dump(exclude={"current_approach"}),
+                    "current_approach": item.current_approach.model_dump(by_alias=True),
+                }
+                for item in request.refinements
+            ],
+        )
+        return RefineApproachesBatchResponse(approaches=results)
+    except Exception as e:
+        logger.error(f"Failed to refine approaches: {e}")
+        from fastapi import HTTPException
+
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/canvas/stats",
+    summary="Get Idea Canvas session statistics",
+    description="Report active session count and session/semantic cache hit rates.",
+)
+async def get_canvas_stats():
+    """Get Idea Canvas session statistics.
+
+    Returns:
+        Session store and semantic cache counters
+    """
+    service = get_idea_canvas_service()
+    return await service.run_blocking(service.get_stats)
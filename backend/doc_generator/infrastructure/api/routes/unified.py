@@ -10,7 +10,7 @@ import os
 from pathlib import Path
 from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
 from loguru import logger
 from sse_starlette.sse import EventSourceResponse
 
@@ -42,6 +42,7 @@ from ..schemas.faq import (
 )
 from ..services.cache import CacheService
 from ..services.unified_generation import get_unified_service
+from ....utils.base64_utils import b64encode_ascii
 
 router = APIRouter(prefix="/unified", tags=["unified"])
 
@@ -64,6 +65,21 @@ def _get_max_inline_preview_bytes() -> int:
         return DEFAULT_INLINE_PREVIEW_BYTES
 
 
+def _wants_inline_preview(
+    request: GenerateRequest, preview: bool | None, prefer: str | None
+) -> bool:
+    """Decide whether to embed the generated file in the complete event.
+
+    An explicit ``?preview=`` wins, then ``Prefer: return=minimal`` turns
+    previews off, then the request body's inline_preview applies.
+    """
+    if preview is not None:
+        return preview
+    if prefer and "return=minimal" in prefer.lower():
+        return False
+    return request.inline_preview
+
+
 def get_cache_service() -> CacheService:
     """Get or create cache service."""
     global _cache_service
@@ -94,6 +110,12 @@ async def generate_with_session(
     session_id: str | None = Query(
         None, description="Optional session ID for content reuse"
     ),
+    preview: bool | None = Query(
+        None, description="Override inline_preview for this request"
+    ),
+    prefer: str | None = Header(
+        None, description="`return=minimal` skips the inline preview"
+    ),
 ) -> EventSourceResponse:
     """Generate content with session-based checkpointing.
 
@@ -116,6 +138,7 @@ async def generate_with_session(
     # - CacheService: Checks if we've already generated this exact request before
     service = get_unified_service()
     cache_service = get_cache_service()
+    inline_preview = _wants_inline_preview(request, preview, prefer)
 
     # 3. Define Event Generator
     # This async generator will yield events (progress, complete, error) one by one.
@@ -161,11 +184,9 @@ async def generate_with_session(
 
                 pdf_base64 = None
                 markdown_content = None
-                if cached_file_path:
+                if inline_preview and cached_file_path:
                     cached_path = service.storage.base_output_dir / cached_file_path
                     if cached_path.exists():
-                        import base64
-
                         suffix = cached_path.suffix.lower()
                         max_preview_bytes = _get_max_inline_preview_bytes()
                         file_size = cached_path.stat().st_size
@@ -176,9 +197,7 @@ async def generate_with_session(
                                     and file_size <= max_preview_bytes
                                 ):
                                     with open(cached_path, "rb") as f:
-                                        pdf_base64 = base64.b64encode(f.read()).decode(
-                                            "utf-8"
-                                        )
+                                        pdf_base64 = b64encode_ascii(f.read())
                                 else:
                                     logger.info(
                                         "Skipping inline PDF preview (%s bytes > %s)",
@@ -237,6 +256,7 @@ async def generate_with_session(
             image_model=request.image_model,
             user_id=api_keys.user_id,
             session_id=session_id,
+            inline_preview=inline_preview,
         ):
             if isinstance(event, CompleteEvent):
                 output_path = service.storage.base_output_dir / event.file_path
@@ -305,6 +325,7 @@ async def generate_podcast_with_session(
             model=request.model,
             user_id=api_keys.user_id,
             session_id=session_id,
+            inline_audio=request.inline_audio,
         ):
             if isinstance(event, PodcastCompleteEvent):
                 yield {"event": "complete", "data": event.model_dump_json()}
@@ -1,5 +1,7 @@
 """File upload route."""
 
+import asyncio
+
 from fastapi import APIRouter, File, UploadFile
 
 from ..schemas.responses import UploadResponse
@@ -45,17 +47,17 @@ async def upload_file(file: UploadFile = File(...)) -> UploadResponse:
     """
     storage = get_storage_service()
 
-    content = await file.read()
-    # StorageService.save_upload: persist uploaded source and return file_id.
-    file_id = storage.save_upload(
-        content=content,
-        filename=file.filename or "unknown",
-        mime_type=file.content_type or "application/octet-stream",
+    filename = file.filename or "unknown"
+    mime_type = file.content_type or "application/octet-stream"
+    # StorageService.save_upload_stream: copy the spooled upload to disk in
+    # chunks (off the event loop) and return file_id.
+    file_id = await asyncio.to_thread(
+        storage.save_upload_stream, file.file, filename, mime_type
     )
 
     return UploadResponse(
         file_id=file_id,
-        filename=file.filename or "unknown",
-        size=len(content),
-        mime_type=file.content_type or "application/octet-stream",
+        filename=filename,
+        size=storage.get_upload_path(file_id).stat().st_size,
+        mime_type=mime_type,
     )
@@ -130,6 +130,19 @@ class CanvasQuestion(BaseModel):
     context: str | None = None  # Additional context about the question
 
 
+class CanvasQuestionLLM(BaseModel):
+    """Question payload requested from the LLM via structured output."""
+
+    question: str
+    type: QuestionType = QuestionType.SINGLE_CHOICE
+    options: list[QuestionOption] = Field(default_factory=list)
+    approaches: list[ApproachOption] = Field(default_factory=list)
+    context: str | None = None
+    # Set on follow-up questions once enough has been gathered
+    suggest_complete: bool = False
+    summary: str | None = None
+
+
 class CanvasNode(BaseModel):
     """A node in the canvas tree."""
 
@@ -142,6 +155,9 @@ class CanvasNode(BaseModel):
     options: list[QuestionOption] = Field(default_factory=list)
     selected_option_id: str | None = None
 
+    # Sessions reuse built states between mutations, so fields must not be reassigned
+    model_config = ConfigDict(frozen=True)
+
 
 class CanvasState(BaseModel):
     """Current state of the canvas."""
@@ -153,6 +169,8 @@ class CanvasState(BaseModel):
     question_count: int = 0
     is_complete: bool = False
 
+    model_config = ConfigDict(frozen=True)
+
 
 # SSE Event Models
 
@@ -196,6 +214,15 @@ class CanvasReadyEvent(BaseModel):
     canvas: CanvasState
 
 
+class CanvasReadyWithQuestionEvent(BaseModel):
+    """Event indicating the session is ready, carrying its first question."""
+
+    type: Literal["ready_with_question"] = "ready_with_question"
+    session_id: str
+    question: CanvasQuestion
+    canvas: CanvasState
+
+
 class GenerateReportRequest(BaseModel):
     """Request to generate a report from a canvas session."""
 
@@ -280,3 +307,26 @@ class RefineApproachResponse(BaseModel):
     """Response with the refined approach."""
 
     approach: Approach
+
+
+class RefinementItem(BaseModel):
+    """A single refinement within a batched refine request."""
+
+    approach_index: int
+    element_id: str
+    element_type: Literal["diagram", "task"]
+    refinement_answer: str
+    current_approach: Approach
+
+
+class RefineApproachesBatchRequest(BaseModel):
+    """Request to refine several approach elements in one LLM call."""
+
+    session_id: str
+    refinements: list[RefinementItem] = Field(min_length=1)
+
+
+class RefineApproachesBatchResponse(BaseModel):
+    """Response with refined approaches, in the same order as the request."""
+
+    approaches: list[Approach]
@@ -3,7 +3,7 @@
 from enum import Enum
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_serializer
 
 from .requests import Provider, SourceItem
 
@@ -67,6 +67,34 @@ class MindMapNode(BaseModel):
     children: list["MindMapNode"] = Field(default_factory=list)
 
 
+def _unique_node_ids(root: dict) -> None:
+    """Rename repeated node IDs in a dumped tree, keeping the first in pre-order.
+
+    Identical subtrees may share one MindMapNode, so the same ID can appear
+    more than once; the viewer needs every ID to be unique.
+    """
+    all_ids = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        all_ids.add(node["id"])
+        stack.extend(node["children"])
+
+    seen = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node_id = node["id"]
+        if node_id in seen:
+            suffix = 1
+            while f"{node_id}_{suffix}" in all_ids:
+                suffix += 1
+            node_id = node["id"] = f"{node_id}_{suffix}"
+            all_ids.add(node_id)
+        seen.add(node_id)
+        stack.extend(reversed(node["children"]))
+
+
 class MindMapTree(BaseModel):
     """Complete mind map tree structure."""
 
@@ -76,6 +104,12 @@ class MindMapTree(BaseModel):
     mode: MindMapMode
     nodes: MindMapNode
 
+    @model_serializer(mode="wrap")
+    def _serialize_with_unique_ids(self, handler):
+        data = handler(self)
+        _unique_node_ids(data["nodes"])
+        return data
+
 
 # SSE Event Models
 
@@ -84,7 +118,7 @@ class MindMapProgressEvent(BaseModel):
     """Progress event during mind map generation."""
 
     type: Literal["progress"] = "progress"
-    stage: str  # extracting, analyzing, generating
+    stage: str  # extracting, analyzing, generating, cached
     percent: float = Field(ge=0, le=100)
     message: str | None = None
 
@@ -79,6 +79,11 @@ class PodcastRequest(BaseModel):
         le=10,
         description="Target podcast duration in minutes",
     )
+    inline_audio: bool = Field(
+        default=False,
+        description="Also return the WAV as base64 in the complete event "
+        "(audio_url is always set)",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -127,7 +132,8 @@ class PodcastCompleteEvent(BaseModel):
     type: Literal["complete"] = "complete"
     title: str
     description: str
-    audio_base64: str  # Base64-encoded WAV audio
+    audio_url: str | None = None  # Download URL for the WAV file
+    audio_base64: str | None = None  # Base64-encoded WAV, only when inline_audio
     script: list[dict]  # The generated dialogue script
     duration_seconds: float
     session_id: str | None = None  # Session ID for checkpointing/content reuse
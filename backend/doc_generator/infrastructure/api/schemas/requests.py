@@ -110,6 +110,11 @@ class GenerateRequest(BaseModel):
     image_model: str = "gemini-2.5-flash-image"
     preferences: Preferences = Field(default_factory=Preferences)
     cache: CacheOptions = Field(default_factory=CacheOptions)
+    inline_preview: bool = Field(
+        default=False,
+        description="Also return the PDF as base64 or the markdown text in the "
+        "complete event (download_url is always set)",
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
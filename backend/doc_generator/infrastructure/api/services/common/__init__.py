@@ -1,9 +1,19 @@
 """Common utilities shared across API services."""
 
-from .json_utils import extract_json_from_text, safe_json_parse, clean_markdown_json
+from .json_utils import (
+    clean_markdown_json,
+    extract_code_block,
+    extract_json_from_text,
+    safe_json_parse,
+)
+from .response_cache import ResponseCache
+from .semantic_cache import SemanticCache
 
 __all__ = [
     "extract_json_from_text",
     "safe_json_parse",
     "clean_markdown_json",
+    "extract_code_block",
+    "ResponseCache",
+    "SemanticCache",
 ]
@@ -8,6 +8,10 @@ additional text around JSON content.
 import json
 from typing import Any
 
+import orjson
+
+_JSON_DECODER = json.JSONDecoder()
+
 
 def extract_json_from_text(text: str) -> dict[str, Any] | None:
     """Extract a JSON object from text that may contain additional content.
@@ -16,9 +20,10 @@ def extract_json_from_text(text: str) -> dict[str, Any] | None:
     in markdown code blocks or surrounded by explanatory text.
 
     The algorithm:
-    1. Find the first '{' character
-    2. Track nested braces to find the matching '}'
-    3. Attempt to parse the extracted substring as JSON
+    1. Find the next '{' character
+    2. Decode a JSON value starting there with ``raw_decode``, which scans in
+       C and handles braces inside strings
+    3. On failure, move on to the following '{'
 
     Args:
         text: Text that may contain a JSON object
@@ -36,45 +41,13 @@ def extract_json_from_text(text: str) -> dict[str, Any] | None:
     if not text:
         return None
 
-    # Find the first opening brace
     start_idx = text.find("{")
-    if start_idx == -1:
-        return None
-
-    # Track braces to find matching closing brace
-    brace_count = 0
-    in_string = False
-    escape_next = False
-
-    for i in range(start_idx, len(text)):
-        char = text[i]
-
-        if escape_next:
-            escape_next = False
-            continue
-
-        if char == "\\":
-            escape_next = True
-            continue
-
-        if char == '"' and not escape_next:
-            in_string = not in_string
-            continue
-
-        if in_string:
-            continue
-
-        if char == "{":
-            brace_count += 1
-        elif char == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                # Found matching brace, try to parse
-                json_str = text[start_idx : i + 1]
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    return None
+    while start_idx != -1:
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text, start_idx)
+            return data
+        except json.JSONDecodeError:
+            start_idx = text.find("{", start_idx + 1)
 
     return None
 
@@ -107,12 +80,32 @@ def clean_markdown_json(text: str) -> str:
     return cleaned.strip()
 
 
+def extract_code_block(text: str) -> str | None:
+    """Return the body of the first fenced code block in text, if any.
+
+    Handles fences preceded by prose and unterminated fences (truncated
+    output); the language tag line (e.g. ``json``) is skipped.
+
+    Example:
+        >>> extract_code_block('Result:\n```json\n{"key": "value"}\n```')
+        '{"key": "value"}'
+    """
+    start = text.find("```")
+    if start == -1:
+        return None
+    body_start = text.find("\n", start)
+    if body_start == -1:
+        return None
+    end = text.find("```", body_start)
+    return text[body_start + 1 : end if end != -1 else len(text)].strip()
+
+
 def safe_json_parse(text: str) -> dict[str, Any] | None:
     """Safely parse JSON with multiple fallback strategies.
 
     Tries:
-    1. Direct JSON parsing
-    2. Clean markdown wrappers and parse
+    1. Direct JSON parsing (only when the text starts like JSON)
+    2. Parse the body of a markdown code block
     3. Extract JSON from arbitrary text
 
     Args:
@@ -124,18 +117,22 @@ def safe_json_parse(text: str) -> dict[str, Any] | None:
     if not text:
         return None
 
+    stripped = text.strip()
+
     # Strategy 1: Direct parse
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
-
-    # Strategy 2: Clean markdown and parse
-    try:
-        cleaned = clean_markdown_json(text)
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
+    if stripped[:1] in ("{", "["):
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+
+    # Strategy 2: Parse the fenced block
+    block = extract_code_block(stripped)
+    if block:
+        try:
+            return orjson.loads(block)
+        except orjson.JSONDecodeError:
+            pass
 
     # Strategy 3: Extract from arbitrary text
-    return extract_json_from_text(text)
+    return extract_json_from_text(stripped)
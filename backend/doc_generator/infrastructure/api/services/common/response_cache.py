@@ -0,0 +1,72 @@
+"""In-process exact-match cache for LLM-generated responses.
+
+Entries are keyed by a hash of the canonical inputs that produced them, so
+regenerating an unchanged artifact (e.g. the same session's report) skips
+the LLM call. Entries expire after a TTL; a regeneration inside that window
+returns the cached result rather than a fresh sample.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL."""
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 3600):
+        """Initialize response cache.
+
+        Args:
+            maxsize: Maximum entries kept (least recently used evicted first)
+            ttl_seconds: Time-to-live for each entry
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from JSON-serializable inputs.
+
+        Args:
+            parts: Inputs that determine the response
+
+        Returns:
+            Hex digest of the canonical JSON encoding
+        """
+        canonical = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for a key, or None on a miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under a key."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
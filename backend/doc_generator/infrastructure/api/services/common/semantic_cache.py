@@ -0,0 +1,107 @@
+"""In-process semantic cache for LLM responses.
+
+Entries are stored against an embedding vector. A lookup embeds the new
+input and returns the cached value of the most similar entry in the same
+namespace when the cosine similarity clears a threshold, so near-identical
+inputs (e.g. "build a todo app" vs "build a TODO app") skip the LLM call.
+"""
+
+import math
+import operator
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def _normalize(vector: list[float]) -> list[float] | None:
+    """Scale a vector to unit length so similarity is a plain dot product."""
+    norm = math.sqrt(sum(map(operator.mul, vector, vector)))
+    if not norm:
+        return None
+    return [value / norm for value in vector]
+
+
+class SemanticCache:
+    """Thread-safe, TTL-bounded cache keyed by embedding similarity."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        maxsize: int = 256,
+        ttl_seconds: float = 3600,
+    ):
+        """Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            maxsize: Maximum entries kept per namespace (oldest evicted first)
+            ttl_seconds: Time-to-live for each entry
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._namespaces: dict[str, OrderedDict[int, tuple[float, list[float], Any]]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, namespace: str, embedding: list[float]) -> Any | None:
+        """Return the cached value most similar to the embedding, if any.
+
+        Args:
+            namespace: Partition to search (e.g. step, provider and template)
+            embedding: Embedding of the lookup input
+
+        Returns:
+            Cached value or None on a miss
+        """
+        query = _normalize(embedding)
+        now = time.monotonic()
+        best_score = self.threshold
+        best_value = None
+
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries and query is not None:
+                expired = [key for key, (expires_at, _, _) in entries.items() if expires_at <= now]
+                for key in expired:
+                    del entries[key]
+                for _, vector, value in entries.values():
+                    if len(vector) != len(query):
+                        continue
+                    score = sum(map(operator.mul, vector, query))
+                    if score >= best_score:
+                        best_score = score
+                        best_value = value
+
+            if best_value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return best_value
+
+    def set(self, namespace: str, embedding: list[float], value: Any) -> None:
+        """Store a value against an embedding.
+
+        Args:
+            namespace: Partition to store in
+            embedding: Embedding of the input that produced the value
+            value: Value to cache
+        """
+        vector = _normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            entries[self._next_id] = (time.monotonic() + self.ttl_seconds, vector, value)
+            self._next_id += 1
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._namespaces.clear()
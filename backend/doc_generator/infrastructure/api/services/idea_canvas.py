@@ -1,19 +1,40 @@
 """Idea Canvas service with interactive Q&A streaming."""
 
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
+import random
+import re
+import secrets
+import tempfile
+import threading
+import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
-from typing import AsyncIterator
-
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Protocol
+
+import orjson
 from loguru import logger
 
 from ....domain.prompts.idea_canvas import (
     first_question_prompt,
+    format_history_entry,
+    history_summary_prompt,
+    history_summary_system_prompt,
     next_question_prompt,
     question_system_prompt,
 )
-from ....infrastructure.llm import LLMService
+from ....infrastructure.llm import LLMService, normalize_provider
+from ....utils.base64_utils import b64encode_ascii
+from ...settings import get_settings
 from ..schemas.idea_canvas import (
     AnswerRequest,
     ApproachOption,
@@ -24,13 +45,522 @@ from ..schemas.idea_canvas import (
     CanvasProgressEvent,
     CanvasQuestion,
     CanvasQuestionEvent,
-    CanvasReadyEvent,
+    CanvasQuestionLLM,
+    CanvasReadyWithQuestionEvent,
     CanvasState,
     CanvasTemplate,
     QuestionOption,
     QuestionType,
     StartCanvasRequest,
 )
+from .common import ResponseCache, SemanticCache
+
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+_JSON_DECODER = json.JSONDecoder()
+
+# System prompts depend only on the template, so build each one once
+_QUESTION_SYSTEM_PROMPTS: dict[CanvasTemplate, str] = {
+    template: question_system_prompt(template.value) for template in CanvasTemplate
+}
+
+
+# Approach system prompts are static; module constants keep the prefix
+# byte-identical across calls so provider prompt caches can hit.
+_APPROACHES_SYSTEM_PROMPT = """You are an expert solution architect. Generate exactly 4 different implementation approaches for the given idea.
+
+For each approach, provide:
+1. A unique descriptive name (e.g., "Microservices", "Serverless", "Monolith", "Hybrid")
+2. A mermaid diagram showing the architecture or flow
+3. A list of implementation tasks with tech stack and complexity
+
+Return ONLY valid JSON in this exact format:
+{
+  "approaches": [
+    {
+      "id": "approach_1",
+      "name": "Descriptive Name",
+      "mermaidCode": "flowchart TD\\n    A[Start] --> B[Process]\\n    B --> C[End]",
+      "tasks": [
+        {
+          "id": "task_1",
+          "name": "Task Name",
+          "description": "What this task involves",
+          "techStack": "React, Node.js",
+          "complexity": "Medium"
+        }
+      ]
+    }
+  ]
+}
+
+MERMAID RULES:
+- Use flowchart TD (top-down) or LR (left-right) for architecture
+- Use sequenceDiagram for interactions
+- Use graph for simple flows
+- Always use simple node IDs like A, B, C, A1, B2 (letters/numbers only)
+- Put all human-readable text inside brackets, not in the node ID
+- Keep labels SHORT (2-4 words) and avoid parentheses, commas, and colons
+- Avoid subgraphs, pipes, and complex shapes; use plain rectangles
+- Keep diagrams clear, readable, and presentation-friendly
+
+TASK RULES:
+- 4-8 tasks per approach
+- Complexity: Low, Medium, or High
+- Tech stack: comma-separated technologies
+- Description: 1-2 sentences explaining the task"""
+
+_REFINE_SYSTEM_PROMPT = """You are refining an implementation approach based on user feedback.
+
+Update ONLY the relevant parts of the approach while keeping the overall structure.
+Return the complete updated approach in the same JSON format.
+
+{
+  "id": "approach_id",
+  "name": "Approach Name",
+  "mermaidCode": "updated mermaid code",
+  "tasks": [updated tasks array]
+}"""
+
+_REFINE_BATCH_SYSTEM_PROMPT = """You are refining implementation approaches based on user feedback.
+
+You will receive a numbered list of refinement requests. For each one, update ONLY the
+relevant parts of its approach while keeping the overall structure. If several requests
+target the same approach, apply all of them and return the same combined approach for each.
+
+Return ONLY valid JSON in this exact format:
+{
+  "updates": [
+    {
+      "index": 0,
+      "approach": {
+        "id": "approach_id",
+        "name": "Approach Name",
+        "mermaidCode": "updated mermaid code",
+        "tasks": [updated tasks array]
+      }
+    }
+  ]
+}"""
+
+
+# Report prompts lead with static rules shared by every template so providers
+# can reuse the cached prefix; per-template wording comes last.
+_REPORT_SYSTEM_PREFIX = """You write planning documents from a user's idea exploration session.
+
+The document must be in Markdown format.
+
+FORMATTING AND CODE:
+- Use # for the main title, ## for sections, ### for subsections, and - for lists
+- Put every code example in a fenced code block with a language tag (```python, ```sql, ```bash), never as plain text or bullets
+- For technical projects, include complete, commented examples: Python for backend logic, APIs and automation; SQL for schemas, queries and migrations; bash for setup and deployment
+
+READABILITY:
+- Start each major section with a 1-2 sentence overview paragraph
+- Prefer short paragraphs (2-4 sentences) over large text walls
+- Use bullet lists for decisions, requirements, risks, and next steps
+- Use tables where helpful (e.g., MVP scope, roadmap, metrics, tradeoffs)
+- Keep bullet points concise (ideally one line each)
+- Split large code examples into smaller focused snippets with ### subheadings
+- Avoid repeating the same heading or section twice
+
+Make the document actionable, specific, and tailored to the decisions made during the exploration session.
+"""
+
+_REPORT_SYSTEM_SUFFIX = """
+You are an {writer_role}. Your task is to generate a comprehensive {doc_type} document based on the user's idea exploration session.
+
+Structure it with the following sections (adapt as needed based on the idea):
+
+{sections_guidance}"""
+
+_STARTUP_SECTIONS = """1. **Hook & Problem Statement**
+   - Start with one compelling story OR one striking statistic that illustrates the problem
+   - Explain why this problem matters NOW (timing, market trends, urgency)
+   - Define the user/customer clearly - who exactly experiences this pain?
+   - Current workflow: How do they solve this problem today? What's broken/inefficient?
+
+2. **Solution Overview**
+   - What is the core solution and how does it solve the problem?
+   - Key differentiators from existing solutions
+   - MVP scope: What are the essential features for launch?
+
+3. **Market Opportunity & Audience**
+   - Target market size (TAM, SAM, SOM if applicable)
+   - Customer segments and personas
+   - Customer acquisition strategy
+   - Go-to-market approach
+
+4. **Business / Impact Model**
+   - Revenue streams OR impact metrics (for non-profit/internal tools)
+   - Impact generated:
+     * Productivity improvements (time saved, efficiency gains)
+     * Quality improvements
+     * Cost savings
+     * Revenue potential or risk reduction
+   - Integration and adoption path - how will users transition to this solution?
+   - Pricing strategy (if applicable)
+
+5. **Implementation Roadmap**
+   - Phase 1 (MVP): Core features and timeline
+   - Phase 2: Growth features
+   - Future: Long-term vision
+
+6. **Team & Resources**
+   - Key roles needed
+   - Technology requirements
+   - Budget considerations
+
+7. **Risk Analysis & Mitigation**
+   - Key risks (market, technical, execution)
+   - Mitigation strategies
+
+8. **Next Steps**
+   - Immediate action items to validate and begin"""
+
+_TECHNICAL_SECTIONS = """1. **Executive Summary** - A brief overview of the project (2-3 paragraphs)
+2. **Project Overview** - Goals, target users, and key value propositions
+3. **Technical Architecture** - Recommended tech stack, system components, and architecture patterns
+4. **Feature Breakdown** - Detailed list of features organized by priority (MVP, Phase 2, Future)
+5. **Implementation Roadmap** - Phased approach with milestones and estimated timelines
+6. **Code Examples** - Include relevant Python/SQL code snippets for key components
+7. **Risk Analysis** - Potential challenges and mitigation strategies
+8. **Success Metrics** - KPIs and how to measure project success
+9. **Next Steps** - Immediate action items to get started"""
+
+_PROJECT_SPEC_SECTIONS = """1. **Executive Summary** - Brief overview of the project scope
+2. **Project Goals & Objectives** - What success looks like
+3. **Scope & Deliverables** - What's included and excluded
+4. **Requirements** - Functional and non-functional requirements
+5. **Timeline & Milestones** - Key dates and checkpoints
+6. **Resources & Budget** - Required resources and cost estimates
+7. **Risks & Dependencies** - Potential blockers and how to mitigate
+8. **Acceptance Criteria** - How deliverables will be validated"""
+
+_FEATURE_SECTIONS = """1. **Feature Overview** - What this feature does and why it matters
+2. **User Stories** - Who benefits and how
+3. **Functional Requirements** - Detailed behavior specifications
+4. **UI/UX Considerations** - Interface and experience design notes
+5. **Technical Approach** - How to implement this feature
+6. **Edge Cases & Error Handling** - What could go wrong and how to handle it
+7. **Testing Strategy** - How to validate the feature works correctly
+8. **Rollout Plan** - How to release this feature safely"""
+
+_CUSTOM_SECTIONS = """Analyze the idea and questions/answers to determine the appropriate document structure.
+Choose sections that make sense for this specific idea. Examples:
+
+For creative projects (books, art, music):
+- Vision & Concept, Target Audience, Creative Direction, Content Outline, Production Plan, Distribution Strategy
+
+For business ideas:
+- Executive Summary, Market Analysis, Value Proposition, Business Model, Go-to-Market Strategy, Financial Projections
+
+For personal projects (travel, events, learning):
+- Overview, Goals & Objectives, Planning Details, Timeline, Budget, Resources Needed
+
+For research or academic work:
+- Abstract, Background, Methodology, Expected Outcomes, Timeline, References
+
+Choose the most appropriate structure based on the actual idea content."""
+
+# template -> (sections guidance, document type, writer role)
+_TEMPLATE_CONFIG: dict[str, tuple[str, str, str]] = {
+    "startup": (_STARTUP_SECTIONS, "Startup Plan", "expert startup advisor and business strategist"),
+    "web_app": (_TECHNICAL_SECTIONS, "Implementation Plan", "expert technical writer and product strategist"),
+    "ai_agent": (_TECHNICAL_SECTIONS, "Implementation Plan", "expert technical writer and product strategist"),
+    "tech_stack": (_TECHNICAL_SECTIONS, "Implementation Plan", "expert technical writer and product strategist"),
+    "project_spec": (_PROJECT_SPEC_SECTIONS, "Project Specification", "expert project manager and technical writer"),
+    "implement_feature": (_FEATURE_SECTIONS, "Feature Implementation Spec", "expert product manager and technical writer"),
+}
+# Custom/general ideas adapt the structure to the content
+_DEFAULT_TEMPLATE_CONFIG = (
+    _CUSTOM_SECTIONS,
+    "Comprehensive Plan",
+    "expert writer who adapts to any domain",
+)
+
+
+def _build_report_system_prompt(config: tuple[str, str, str]) -> str:
+    """Build a template's report system prompt from its config."""
+    sections_guidance, doc_type, writer_role = config
+    return _REPORT_SYSTEM_PREFIX + _REPORT_SYSTEM_SUFFIX.format(
+        writer_role=writer_role,
+        doc_type=doc_type,
+        sections_guidance=sections_guidance,
+    )
+
+
+_REPORT_SYSTEM_PROMPTS: dict[str, str] = {
+    name: _build_report_system_prompt(config) for name, config in _TEMPLATE_CONFIG.items()
+}
+_DEFAULT_REPORT_SYSTEM_PROMPT = _build_report_system_prompt(_DEFAULT_TEMPLATE_CONFIG)
+
+_MINDMAP_REPORT_SYSTEM_PROMPT = """You are an expert technical writer. Generate a concise implementation plan based on the exploration session. 
+Focus on actionable items organized by category. Use markdown format with clear headers."""
+
+_MINDMAP_SYSTEM_PROMPT = """You are an expert at creating clear, hierarchical mind maps.
+
+Your task is to analyze an implementation plan and generate a mind map structure as JSON.
+
+The JSON structure must follow this exact format:
+{
+  "title": "Project Name",
+  "summary": "Brief 1-2 sentence summary of the implementation",
+  "nodes": {
+    "id": "root",
+    "label": "Project Name",
+    "children": [
+      {
+        "id": "1",
+        "label": "Component/Phase 1",
+        "children": [
+          {"id": "1.1", "label": "Task/Feature", "children": []},
+          {"id": "1.2", "label": "Task/Feature", "children": []}
+        ]
+      }
+    ]
+  }
+}
+
+Rules:
+1. The root node should be the project/idea name
+2. First-level children should be major components, phases, or categories
+3. Deeper levels should break down into specific tasks, features, or sub-components
+4. Each node must have unique "id", concise "label" (max 50 chars), and "children" array
+5. Make labels actionable and clear
+6. Determine the appropriate depth based on content complexity (2-6 levels as needed)
+7. Return ONLY the JSON object, no markdown code blocks"""
+
+
+# Default completion budgets; most reports land well under 2500 tokens
+REPORT_MAX_TOKENS = 2500
+MINDMAP_MAX_TOKENS = 3000
+
+
+# A response wrapped in a ```/```markdown/```json fence; the closing fence is
+# optional because long responses can be cut off at max_tokens.
+_FENCE_RE = re.compile(r"^\s*```(?:markdown|json)?[ \t]*\n?(.*?)(?:\n?```)?\s*$", re.DOTALL)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return an LLM response without its wrapping code fence, if any."""
+    match = _FENCE_RE.match(text)
+    return (match.group(1) if match else text).strip()
+
+
+# Markdown line per canvas node type in the report's decision tree
+_DECISION_TREE_LINES: dict[CanvasNodeType, str] = {
+    CanvasNodeType.ROOT: "- 💡 **{}**",
+    CanvasNodeType.QUESTION: "- ❓ *{}*",
+    CanvasNodeType.ANSWER: "- ✅ **{}**",
+    CanvasNodeType.APPROACH: "- 🔧 **{}**",
+}
+
+
+@lru_cache(maxsize=64)
+def _get_llm_service(provider: str, model: str, api_key: str | None) -> LLMService:
+    """Get a shared LLMService so SDK clients and their connection pools are reused."""
+    return LLMService(api_key=api_key, provider=provider, model=model)
+
+
+# Backoff between Gemini fallback attempts: capped exponential plus jitter,
+# bounded by a total deadline so brown-outs fail fast.
+FALLBACK_BACKOFF_BASE_SECONDS = 0.2
+FALLBACK_BACKOFF_MAX_SECONDS = 2.0
+FALLBACK_JITTER_SECONDS = 0.2
+FALLBACK_DEADLINE_SECONDS = 8.0
+# Models that reported overload are skipped for this long
+MODEL_COOLDOWN_SECONDS = 30.0
+_model_overloaded_until: dict[str, float] = {}
+
+
+def _is_overload_error(error: Exception) -> bool:
+    """Check if an error is a 503/overload that another model may not hit."""
+    error_str = str(error).lower()
+    return "503" in error_str or "overload" in error_str or "unavailable" in error_str
+
+
+@lru_cache(maxsize=32)
+def _gemini_fallback_list(preferred: str | None) -> tuple[str, ...]:
+    """Gemini models to try in order, starting with the preferred one (deduplicated)."""
+    return tuple(
+        dict.fromkeys(
+            [
+                preferred or "gemini-2.5-flash",
+                "gemini-2.5-pro",
+                "gemini-2.5-flash",
+                "gemini-3-flash-preview",
+                "gemini-3-pro-preview",
+            ]
+        )
+    )
+
+
+def _fallback_candidates(preferred: str | None) -> list[str]:
+    """Fallback models to try now, skipping recently overloaded ones unless all are."""
+    models = _gemini_fallback_list(preferred)
+    now = time.monotonic()
+    return [m for m in models if _model_overloaded_until.get(m, 0.0) <= now] or list(
+        models
+    )
+
+
+def _fallback_delay(attempt: int) -> float:
+    """Backoff before the given (1-based) retry attempt."""
+    return min(
+        FALLBACK_BACKOFF_MAX_SECONDS,
+        FALLBACK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1),
+    ) + random.uniform(0, FALLBACK_JITTER_SECONDS)
+
+
+def _mark_overloaded(model: str, error: Exception) -> None:
+    """Put an overloaded model on cooldown."""
+    logger.warning(
+        f"Model {model} overloaded, trying next model. Error: {str(error)[:100]}"
+    )
+    _model_overloaded_until[model] = time.monotonic() + MODEL_COOLDOWN_SECONDS
+
+
+# Characters dropped from, and runs collapsed in, PDF filenames
+_TITLE_STRIP_RE = re.compile(r"[^\w\s-]")
+_TITLE_COLLAPSE_RE = re.compile(r"[-\s]+")
+
+
+@lru_cache(maxsize=1)
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """Shared process pool so PDF rendering never holds the API process's GIL."""
+    workers = get_settings().idea_canvas.pdf_workers
+    return ProcessPoolExecutor(
+        max_workers=workers or max(1, (os.cpu_count() or 1) // 2),
+        # Spawn avoids forking a process that already runs threads
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _render_pdf_base64(title: str, markdown_content: str) -> str:
+    """Render markdown to a PDF and return it base64-encoded.
+
+    Runs inside a PDF worker process, so it must stay a top-level function.
+    """
+    try:
+        from ....infrastructure.generators.pdf.generator import PDFGenerator
+
+        pdf_generator = PDFGenerator()
+
+        # Create temporary directory for output
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+
+            # Generate a clean filename from the title
+            # Remove special characters and limit length
+            clean_title = _TITLE_COLLAPSE_RE.sub(
+                "_", _TITLE_STRIP_RE.sub("", title).strip()
+            )[:50]
+
+            # Prepare content for PDF generator
+            content = {
+                "title": title,
+                "markdown": markdown_content,
+            }
+
+            metadata = {
+                "title": title,  # PDF generator uses this for display title
+                "custom_filename": (
+                    clean_title if clean_title else "canvas_report"
+                ),  # For file output
+                "source": "Idea Canvas",
+                "created_at": datetime.now().isoformat(),
+                "content_type": "Implementation Spec",
+            }
+
+            # Generate PDF
+            pdf_path = pdf_generator.generate(content, metadata, temp_path)
+
+            pdf_bytes = pdf_path.read_bytes()
+            return b64encode_ascii(pdf_bytes)
+
+    except Exception as e:
+        logger.error(f"Failed to generate PDF: {e}")
+        return ""
+
+
+@dataclass
+class CanvasGraph:
+    """Flat canvas tree stored as parallel per-node lists.
+
+    Nodes are only ever appended and always after their parent, so index
+    order is a topological order and the nested ``CanvasNode`` tree can be
+    built bottom-up without recursion.
+    """
+
+    ids: list[str] = field(default_factory=list)
+    types: list[CanvasNodeType] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    descriptions: list[str | None] = field(default_factory=list)
+    options: list[list[QuestionOption]] = field(default_factory=list)
+    selected_option_ids: list[str | None] = field(default_factory=list)
+    parent_idx: list[int] = field(default_factory=list)
+    children_idx: list[list[int]] = field(default_factory=list)
+    index_by_id: dict[str, int] = field(default_factory=dict)
+
+    def add(
+        self,
+        node_id: str,
+        node_type: CanvasNodeType,
+        label: str,
+        description: str | None = None,
+        parent: int = -1,
+        options: list[QuestionOption] | None = None,
+        selected_option_id: str | None = None,
+    ) -> int:
+        """Append a node under ``parent`` (-1 for the root) and return its index."""
+        idx = len(self.ids)
+        self.ids.append(node_id)
+        self.types.append(node_type)
+        self.labels.append(label)
+        self.descriptions.append(description)
+        self.options.append(options or [])
+        self.selected_option_ids.append(selected_option_id)
+        self.parent_idx.append(parent)
+        self.children_idx.append([])
+        self.index_by_id[node_id] = idx
+        if parent >= 0:
+            self.children_idx[parent].append(idx)
+        return idx
+
+    def deepest_answer(self) -> int:
+        """Follow the last answer child from the root; new questions attach here."""
+        idx = 0
+        while self.children_idx[idx]:
+            answers = [
+                child
+                for child in self.children_idx[idx]
+                if self.types[child] == CanvasNodeType.ANSWER
+            ]
+            if not answers:
+                break
+            idx = answers[-1]
+        return idx
+
+    def to_node(self) -> CanvasNode:
+        """Build the nested ``CanvasNode`` tree used by the API schema."""
+        built: list[CanvasNode | None] = [None] * len(self.ids)
+        for idx in range(len(self.ids) - 1, -1, -1):
+            built[idx] = CanvasNode(
+                id=self.ids[idx],
+                type=self.types[idx],
+                label=self.labels[idx],
+                description=self.descriptions[idx],
+                children=[built[child] for child in self.children_idx[idx]],
+                options=self.options[idx],
+                selected_option_id=self.selected_option_ids[idx],
+            )
+        return built[0]
 
 
 class CanvasSession:
@@ -50,19 +580,38 @@ class CanvasSession:
         self.provider = provider
         self.model = model
         self.conversation_history: list[dict] = []
-        self.nodes: CanvasNode = CanvasNode(
-            id="root",
-            type=CanvasNodeType.ROOT,
-            label=idea[:150] + ("..." if len(idea) > 150 else ""),
-            description=idea,
-            children=[],
+        # Append-only rendered Q&A turns; earlier entries are never rewritten
+        # so each turn's prompt extends the previous one byte-for-byte.
+        self.prompt_buffer: list[str] = []
+        self.history_text = ""
+        self._history_digest = hashlib.sha256()
+        # Markdown of the last generated report and the session fingerprint
+        # it was generated from, reused by the mind map while still current
+        self.last_report_markdown: str | None = None
+        self.last_report_fingerprint: str | None = None
+        self.graph = CanvasGraph()
+        self.graph.add(
+            "root",
+            CanvasNodeType.ROOT,
+            idea[:150] + ("..." if len(idea) > 150 else ""),
+            idea,
         )
         self.current_question_id: str | None = None
+        self.current_question_label = ""
         self.current_question_options: list[QuestionOption] = (
             []
         )  # Store current question's options
+        self._option_lookup: dict[str, str] = {}  # option id/label -> option id
         self.question_count = 0
-        self.is_complete = False
+        self._is_complete = False
+        # Bumped on every tree/state mutation so get_state() can reuse its result
+        self._state_version = 0
+        self._cached_state: CanvasState | None = None
+        self._cached_state_version = -1
+        self._cached_nodes: CanvasNode | None = None
+        self._cached_nodes_version = -1
+        self._cached_decision_tree = ""
+        self._cached_decision_tree_version = -1
 
     def add_question(
         self,
@@ -71,94 +620,433 @@ class CanvasSession:
         options: list[QuestionOption] | None = None,
     ) -> None:
         """Add a question node to the tree."""
-        question_node = CanvasNode(
-            id=question_id,
-            type=CanvasNodeType.QUESTION,
-            label=question[:120] + ("..." if len(question) > 120 else ""),
-            description=question,
-            children=[],
+        label = question[:120] + ("..." if len(question) > 120 else "")
+        self.graph.add(
+            question_id,
+            CanvasNodeType.QUESTION,
+            label,
+            question,
+            parent=self.graph.deepest_answer(),
         )
-        self._find_and_add_child(self.nodes, question_node)
+        self._state_version += 1
         self.current_question_id = question_id
-        self.current_question_options = options or []  # Store options for later
+        self.current_question_label = label
+        self._set_current_options(options or [])  # Store options for later
         self.question_count += 1
 
+    def _set_current_options(self, options: list[QuestionOption]) -> None:
+        """Set the open question's options and index them by ID and label."""
+        self.current_question_options = options
+        self._option_lookup = {opt.id: opt.id for opt in options} | {
+            opt.label: opt.id for opt in options
+        }
+
     def add_answer(
         self, answer: str, answer_id: str, selected_option_id: str | None = None
     ) -> None:
         """Add an answer node to the tree with all available options."""
-        answer_node = CanvasNode(
-            id=answer_id,
-            type=CanvasNodeType.ANSWER,
-            label=answer[:120] + ("..." if len(answer) > 120 else ""),
-            description=answer,
-            children=[],
-            options=self.current_question_options,  # Store all options that were available
-            selected_option_id=selected_option_id,  # Mark which was selected
-        )
         # Find the current question and add answer as its child
-        if self.current_question_id:
-            self._add_child_to_node(self.nodes, self.current_question_id, answer_node)
+        question_idx = self.graph.index_by_id.get(self.current_question_id)
+        if question_idx is not None:
+            self.graph.add(
+                answer_id,
+                CanvasNodeType.ANSWER,
+                answer[:120] + ("..." if len(answer) > 120 else ""),
+                answer,
+                parent=question_idx,
+                options=self.current_question_options,  # Store all options that were available
+                selected_option_id=selected_option_id,  # Mark which was selected
+            )
+            self._state_version += 1
         # Clear current question options after adding answer
         self.current_question_options = []
+        self._option_lookup = {}
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the exploration has been marked complete."""
+        return self._is_complete
+
+    @is_complete.setter
+    def is_complete(self, value: bool) -> None:
+        if value != self._is_complete:
+            self._is_complete = value
+            self._state_version += 1
+
+    def add_turn(self, question: str, answer: str) -> None:
+        """Record a Q&A turn in the history and the append-only prompt buffer."""
+        self.conversation_history.append({"question": question, "answer": answer})
+        entry = format_history_entry(len(self.conversation_history), question, answer)
+        self.prompt_buffer.append(entry)
+        self.history_text += entry
+        self._history_digest.update(entry.encode("utf-8"))
+
+    @property
+    def history_token_count(self) -> int:
+        """Rough token count of the rendered history (~4 characters per token)."""
+        return len(self.history_text) // 4
+
+    def compact_history(self, summary: str, keep_recent: int) -> None:
+        """Replace all but the most recent prompt turns with a summary.
+
+        Only the prompt buffer is compacted; ``conversation_history`` keeps
+        every turn for approaches, reports and mind maps. The new buffer
+        becomes the stable prefix that later turns append to.
+        """
+        recent = self.prompt_buffer[-keep_recent:]
+        first_kept = len(self.conversation_history) - len(recent) + 1
+        self.prompt_buffer = [
+            f"\nSummary of earlier answers (before Q{first_kept}):\n{summary}\n",
+            *recent,
+        ]
+        self.history_text = "".join(self.prompt_buffer)
+        self._history_digest = hashlib.sha256(self.history_text.encode("utf-8"))
+
+    @property
+    def full_history_text(self) -> str:
+        """Every Q&A turn rendered in order, ignoring prompt-buffer compaction."""
+        return "".join(
+            format_history_entry(i, item.get("question", ""), item.get("answer", ""))
+            for i, item in enumerate(self.conversation_history, 1)
+        )
+
+    @property
+    def history_digest(self) -> str:
+        """Rolling hash of the history prefix, for debugging prompt-cache misses."""
+        return self._history_digest.hexdigest()[:12]
+
+    def match_option(self, answer: str) -> str | None:
+        """Return the ID of the current option matching an answer's ID or label."""
+        return self._option_lookup.get(answer)
+
+    def to_dict(self) -> dict:
+        """Serialize the session for an external session store."""
+        graph = self.graph
+        return {
+            "session_id": self.session_id,
+            "idea": self.idea,
+            "template": self.template.value,
+            "provider": self.provider,
+            "model": self.model,
+            "conversation_history": self.conversation_history,
+            "prompt_buffer": self.prompt_buffer,
+            "graph": {
+                "ids": graph.ids,
+                "types": [node_type.value for node_type in graph.types],
+                "labels": graph.labels,
+                "descriptions": graph.descriptions,
+                "options": [
+                    [opt.model_dump() for opt in options] for options in graph.options
+                ],
+                "selected_option_ids": graph.selected_option_ids,
+                "parent_idx": graph.parent_idx,
+            },
+            "current_question_id": self.current_question_id,
+            "current_question_label": self.current_question_label,
+            "current_question_options": [
+                opt.model_dump() for opt in self.current_question_options
+            ],
+            "question_count": self.question_count,
+            "is_complete": self.is_complete,
+            "last_report_markdown": self.last_report_markdown,
+            "last_report_fingerprint": self.last_report_fingerprint,
+        }
 
-    def _find_and_add_child(self, node: CanvasNode, child: CanvasNode) -> bool:
-        """Find the deepest answer node and add child to it."""
-        # If this node has no children, add here
-        if not node.children:
-            node.children.append(child)
-            return True
-
-        # Try to find the deepest path (last answer node)
-        for i in range(len(node.children) - 1, -1, -1):
-            child_node = node.children[i]
-            if child_node.type == CanvasNodeType.ANSWER:
-                return self._find_and_add_child(child_node, child)
-
-        # If no answer nodes found, add to this node
-        node.children.append(child)
-        return True
-
-    def _add_child_to_node(
-        self, node: CanvasNode, target_id: str, child: CanvasNode
-    ) -> bool:
-        """Find a node by ID and add a child to it."""
-        if node.id == target_id:
-            node.children.append(child)
-            return True
-        for child_node in node.children:
-            if self._add_child_to_node(child_node, target_id, child):
-                return True
-        return False
+    @classmethod
+    def from_dict(cls, data: dict) -> "CanvasSession":
+        """Rebuild a session serialized by ``to_dict``."""
+        session = cls(
+            session_id=data["session_id"],
+            idea=data["idea"],
+            template=CanvasTemplate(data["template"]),
+            provider=data["provider"],
+            model=data["model"],
+        )
+        session.conversation_history = data["conversation_history"]
+        session.prompt_buffer = data["prompt_buffer"]
+        session.history_text = "".join(session.prompt_buffer)
+        session._history_digest = hashlib.sha256(session.history_text.encode("utf-8"))
+
+        graph_data = data["graph"]
+        session.graph = CanvasGraph()
+        for node in zip(
+            graph_data["ids"],
+            graph_data["types"],
+            graph_data["labels"],
+            graph_data["descriptions"],
+            graph_data["options"],
+            graph_data["selected_option_ids"],
+            graph_data["parent_idx"],
+        ):
+            node_id, node_type, label, description, options, selected, parent = node
+            session.graph.add(
+                node_id,
+                CanvasNodeType(node_type),
+                label,
+                description,
+                parent=parent,
+                options=[QuestionOption(**opt) for opt in options],
+                selected_option_id=selected,
+            )
+
+        session.current_question_id = data["current_question_id"]
+        session.current_question_label = data["current_question_label"]
+        session._set_current_options(
+            [QuestionOption(**opt) for opt in data["current_question_options"]]
+        )
+        session.question_count = data["question_count"]
+        session.is_complete = data["is_complete"]
+        session.last_report_markdown = data.get("last_report_markdown")
+        session.last_report_fingerprint = data.get("last_report_fingerprint")
+        return session
+
+    @property
+    def nodes(self) -> CanvasNode:
+        """Nested canvas tree, rebuilt from the flat graph only after it changes."""
+        if self._cached_nodes_version != self._state_version:
+            self._cached_nodes = self.graph.to_node()
+            self._cached_nodes_version = self._state_version
+        return self._cached_nodes
 
     def get_state(self) -> CanvasState:
-        """Get the current canvas state."""
-        return CanvasState(
-            session_id=self.session_id,
-            idea=self.idea,
-            template=self.template,
-            nodes=self.nodes,
-            question_count=self.question_count,
-            is_complete=self.is_complete,
+        """Get the current canvas state, rebuilt only after the session changes."""
+        if self._cached_state_version != self._state_version:
+            self._cached_state = CanvasState(
+                session_id=self.session_id,
+                idea=self.idea,
+                template=self.template,
+                nodes=self.nodes,
+                question_count=self.question_count,
+                is_complete=self.is_complete,
+            )
+            self._cached_state_version = self._state_version
+        return self._cached_state
+
+
+class SessionStore(Protocol):
+    """Storage backend for canvas sessions."""
+
+    def get(self, session_id: str) -> CanvasSession | None:
+        """Load a session, or None if it does not exist."""
+        ...
+
+    def save(self, session: CanvasSession) -> None:
+        """Persist a new or updated session."""
+        ...
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session, returning whether it existed."""
+        ...
+
+    def stats(self) -> dict:
+        """Return store size and hit/miss counters."""
+        ...
+
+
+class InMemorySessionStore:
+    """Keeps sessions in this process, bounded by count and idle TTL.
+
+    Sessions are lost on restart. Access refreshes a session's expiry and
+    recency; the least recently used session is evicted past ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 86400):
+        """Initialize in-memory session store.
+
+        Args:
+            maxsize: Maximum sessions kept
+            ttl_seconds: Idle time after which a session expires
+        """
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, tuple[float, CanvasSession]] = OrderedDict()
+        # Sessions are read from the event loop and from worker threads
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def _expire(self, now: float) -> None:
+        """Drop expired sessions; expiry order matches recency order."""
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[session_id]
+
+    def get(self, session_id: str) -> CanvasSession | None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._sessions[session_id] = (now + self._ttl_seconds, entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def save(self, session: CanvasSession) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._sessions[session.session_id] = (now + self._ttl_seconds, session)
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self._maxsize:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "max_sessions": self._maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class RedisSessionStore:
+    """Shares sessions across workers through Redis, serialized with orjson.
+
+    Calls block on the network; async code reaches the store through
+    ``IdeaCanvasService.run_blocking``.
+    """
+
+    KEY_PREFIX = "canvas:sess:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        """Initialize Redis session store.
+
+        Args:
+            url: Redis connection URL
+            ttl_seconds: Expiry applied on every save
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis package is required for the redis session store")
+        self._client = redis.Redis.from_url(url)
+        self._ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: str) -> CanvasSession | None:
+        payload = self._client.get(self.KEY_PREFIX + session_id)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return CanvasSession.from_dict(orjson.loads(payload))
+
+    def save(self, session: CanvasSession) -> None:
+        self._client.set(
+            self.KEY_PREFIX + session.session_id,
+            orjson.dumps(session.to_dict()),
+            ex=self._ttl_seconds,
+        )
+
+    def delete(self, session_id: str) -> bool:
+        return bool(self._client.delete(self.KEY_PREFIX + session_id))
+
+    def stats(self) -> dict:
+        # Session count is shared across workers; hit/miss counters are per worker
+        return {
+            "backend": "redis",
+            "sessions": sum(1 for _ in self._client.scan_iter(self.KEY_PREFIX + "*")),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _create_session_store() -> SessionStore:
+    """Create the session store selected in settings."""
+    canvas_settings = get_settings().idea_canvas
+    if canvas_settings.session_store == "redis":
+        return RedisSessionStore(
+            canvas_settings.redis_url, canvas_settings.session_ttl_seconds
         )
+    return InMemorySessionStore(
+        maxsize=canvas_settings.session_max_count,
+        ttl_seconds=canvas_settings.session_ttl_seconds,
+    )
 
 
 class IdeaCanvasService:
     """Service for managing idea canvas sessions."""
 
-    def __init__(self):
-        self._executor = ThreadPoolExecutor(max_workers=2)
-        self._sessions: dict[str, CanvasSession] = {}
+    def __init__(
+        self,
+        enable_semantic_cache: bool = False,
+        session_store: SessionStore | None = None,
+    ):
+        """Initialize idea canvas service.
+
+        Args:
+            enable_semantic_cache: Reuse first questions and approaches for
+                near-identical ideas based on embedding similarity
+            session_store: Where sessions are kept (defaults to the store
+                selected in settings)
+        """
+        canvas_settings = get_settings().idea_canvas
+        # Sized for concurrent sessions; streaming Q&A awaits async clients
+        # directly, so this pool only serves the remaining blocking calls.
+        self._executor = ThreadPoolExecutor(
+            max_workers=canvas_settings.max_workers
+            or min(32, (os.cpu_count() or 1) * 4),
+            thread_name_prefix="canvas-llm",
+        )
+        self._store = session_store or _create_session_store()
+        # Serializes read-modify-write of a session within this worker
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._report_cache: ResponseCache | None = None
+        if canvas_settings.report_cache_enabled:
+            self._report_cache = ResponseCache(
+                maxsize=canvas_settings.report_cache_size,
+                ttl_seconds=canvas_settings.report_cache_ttl_seconds,
+            )
+        self._semantic_cache: SemanticCache | None = None
+        if enable_semantic_cache:
+            self._semantic_cache = SemanticCache(
+                threshold=canvas_settings.semantic_cache_threshold,
+                maxsize=canvas_settings.semantic_cache_size,
+                ttl_seconds=canvas_settings.semantic_cache_ttl_seconds,
+            )
 
-    def _configure_api_key(self, provider: str, api_key: str) -> None:
-        """Configure API key in environment for the provider."""
-        if provider in ("gemini", "google"):
-            os.environ["GEMINI_API_KEY"] = api_key
-            os.environ["GOOGLE_API_KEY"] = api_key
-        elif provider == "openai":
-            os.environ["OPENAI_API_KEY"] = api_key
-        elif provider == "anthropic":
-            os.environ["ANTHROPIC_API_KEY"] = api_key
+    async def run_blocking(self, func, *args):
+        """Run a blocking call on the canvas thread pool without blocking the loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def session_lock(self, session_id: str) -> asyncio.Lock:
+        """Return the lock guarding updates to one session."""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    async def load_session(self, session_id: str) -> CanvasSession | None:
+        """Load a session without blocking the event loop."""
+        return await self.run_blocking(self._store.get, session_id)
+
+    async def _save_session(self, session: CanvasSession) -> None:
+        """Persist a session without blocking the event loop."""
+        await self.run_blocking(self._store.save, session)
+
+    def _embed_for_cache(
+        self, provider: str, model: str, api_key: str, text: str
+    ) -> list[float] | None:
+        """Embed text for a semantic cache lookup (None when caching is off)."""
+        if self._semantic_cache is None:
+            return None
+        return _get_llm_service(provider, model, api_key).embed_text(text)
 
     def _call_llm_with_fallback(
         self,
@@ -170,29 +1058,18 @@ class IdeaCanvasService:
         json_mode: bool,
         step_name: str,
         preferred_model: str | None = None,
+        api_key: str | None = None,
+        cache_key: str | None = None,
     ) -> str:
         """Call LLM with automatic model fallback on errors.
 
-        Tries multiple models in order if one fails with 503/overload errors.
+        Tries multiple models in order if one fails with 503/overload errors,
+        backing off between attempts and skipping recently overloaded models.
         """
-        # Define fallback models for Gemini (in order of preference)
-        gemini_models = [
-            preferred_model or "gemini-2.5-flash",
-            "gemini-2.5-pro",
-            "gemini-2.5-flash",
-            "gemini-3-flash-preview",
-            "gemini-3-pro-preview",
-        ]
-        # Remove duplicates while preserving order
-        seen = set()
-        gemini_models = [
-            m for m in gemini_models if m and not (m in seen or seen.add(m))
-        ]
-
         if provider not in ("gemini", "google"):
             # For non-Gemini providers, just use the preferred model
-            llm_service = LLMService(
-                provider=provider, model=preferred_model or "gpt-4.1-mini"
+            llm_service = _get_llm_service(
+                provider, preferred_model or "gpt-4.1-mini", api_key
             )
             return llm_service._call_llm(
                 system_prompt,
@@ -201,12 +1078,27 @@ class IdeaCanvasService:
                 temperature,
                 json_mode,
                 step_name,
+                cache_key,
             )
 
+        candidates = _fallback_candidates(preferred_model)
+        # Availability depends on the SDK and key, not the model: check it
+        # once. Each model has its own cached service; shared instances are
+        # never retargeted, since other requests are using them.
+        if not _get_llm_service(provider, candidates[0], api_key).is_available():
+            return ""
+
+        deadline = time.monotonic() + FALLBACK_DEADLINE_SECONDS
         last_error = None
-        for model in gemini_models:
+        for attempt, model in enumerate(candidates):
+            if attempt:
+                delay = _fallback_delay(attempt)
+                if time.monotonic() + delay > deadline:
+                    logger.warning(f"Fallback deadline reached before trying {model}")
+                    break
+                time.sleep(delay)
             try:
-                llm_service = LLMService(provider=provider, model=model)
+                llm_service = _get_llm_service(provider, model, api_key)
                 result = llm_service._call_llm(
                     system_prompt,
                     user_prompt,
@@ -214,19 +1106,13 @@ class IdeaCanvasService:
                     temperature,
                     json_mode,
                     step_name,
+                    cache_key,
                 )
                 return result
             except Exception as e:
-                error_str = str(e)
                 # Check if it's a 503/overload error that we should retry
-                if (
-                    "503" in error_str
-                    or "overload" in error_str.lower()
-                    or "unavailable" in error_str.lower()
-                ):
-                    logger.warning(
-                        f"Model {model} overloaded, trying next model. Error: {error_str[:100]}"
-                    )
+                if _is_overload_error(e):
+                    _mark_overloaded(model, e)
                     last_error = e
                     continue
                 else:
@@ -238,12 +1124,154 @@ class IdeaCanvasService:
             raise last_error
         raise ValueError("No models available")
 
+    async def _call_llm_with_fallback_async(
+        self,
+        provider: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+        step_name: str,
+        preferred_model: str | None = None,
+        api_key: str | None = None,
+        cache_key: str | None = None,
+    ) -> str:
+        """Async counterpart of _call_llm_with_fallback.
+
+        Awaits the provider's native async client, so no pool thread is held
+        while the model responds.
+        """
+        if provider not in ("gemini", "google"):
+            llm_service = _get_llm_service(
+                provider, preferred_model or "gpt-4.1-mini", api_key
+            )
+            return await llm_service._call_llm_async(
+                system_prompt,
+                user_prompt,
+                max_tokens,
+                temperature,
+                json_mode,
+                step_name,
+                cache_key,
+            )
+
+        candidates = _fallback_candidates(preferred_model)
+        # Availability depends on the SDK and key, not the model: check it
+        # once. Each model has its own cached service; shared instances are
+        # never retargeted, since other requests are using them.
+        if not _get_llm_service(provider, candidates[0], api_key).is_available():
+            return ""
+
+        deadline = time.monotonic() + FALLBACK_DEADLINE_SECONDS
+        last_error = None
+        for attempt, model in enumerate(candidates):
+            if attempt:
+                delay = _fallback_delay(attempt)
+                if time.monotonic() + delay > deadline:
+                    logger.warning(f"Fallback deadline reached before trying {model}")
+                    break
+                await asyncio.sleep(delay)
+            try:
+                llm_service = _get_llm_service(provider, model, api_key)
+                return await llm_service._call_llm_async(
+                    system_prompt,
+                    user_prompt,
+                    max_tokens,
+                    temperature,
+                    json_mode,
+                    step_name,
+                    cache_key,
+                )
+            except Exception as e:
+                if not _is_overload_error(e):
+                    raise
+                _mark_overloaded(model, e)
+                last_error = e
+
+        if last_error:
+            raise last_error
+        raise ValueError("No models available")
+
+    async def _compact_history(
+        self, session: CanvasSession, llm_service: LLMService
+    ) -> None:
+        """Summarize older turns once the history exceeds the token budget.
+
+        Keeps per-turn prefill roughly constant for long sessions. On failure
+        the full history is kept and the next turn tries again.
+        """
+        canvas_settings = get_settings().idea_canvas
+        keep_recent = canvas_settings.history_keep_recent_turns
+        if (
+            session.history_token_count <= canvas_settings.history_token_budget
+            or len(session.prompt_buffer) <= keep_recent
+        ):
+            return
+
+        older_text = "".join(session.prompt_buffer[:-keep_recent])
+        try:
+            summary = await llm_service._call_llm_async(
+                history_summary_system_prompt(),
+                history_summary_prompt(session.idea, older_text),
+                1000,
+                0.2,
+                False,
+                "compact_history",
+            )
+        except Exception as e:
+            logger.warning(f"History compaction failed, keeping full history: {e}")
+            return
+
+        if not summary or not summary.strip():
+            return
+
+        before = session.history_token_count
+        session.compact_history(summary.strip(), keep_recent)
+        logger.info(
+            f"Compacted canvas history: session={session.session_id}, "
+            f"tokens {before} -> {session.history_token_count}"
+        )
+
+    async def _generate_question_data(
+        self,
+        llm_service: LLMService,
+        system_prompt: str,
+        user_prompt: str,
+        step_name: str,
+    ) -> dict:
+        """Generate question data, preferring provider-native structured output.
+
+        Falls back to JSON mode plus tolerant parsing when the provider
+        cannot return a validated CanvasQuestionLLM.
+        """
+        structured = await llm_service._call_llm_structured_async(
+            system_prompt,
+            user_prompt,
+            2000,
+            0.7,
+            CanvasQuestionLLM,
+            step_name,
+        )
+        if structured is not None:
+            return structured.model_dump(exclude_unset=True)
+
+        response = await llm_service._call_llm_async(
+            system_prompt,
+            user_prompt,
+            2000,
+            0.7,
+            True,
+            step_name,
+        )
+        return self._parse_question_response(response)
+
     def _parse_question_response(self, response: str) -> dict:
         """Parse LLM response into question data."""
         try:
-            data = json.loads(response)
+            data = orjson.loads(response)
             return data
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Try to extract JSON from response
             return self._extract_json(response) or {}
 
@@ -252,23 +1280,15 @@ class IdeaCanvasService:
         if not text:
             return None
 
+        # raw_decode scans in C and handles strings/escapes, so try it at each
+        # candidate opening brace instead of walking characters in Python.
         start_idx = text.find("{")
-        if start_idx == -1:
-            return None
-
-        stack = []
-        for i in range(start_idx, len(text)):
-            ch = text[i]
-            if ch == "{":
-                stack.append(ch)
-            elif ch == "}":
-                if stack:
-                    stack.pop()
-                    if not stack:
-                        try:
-                            return json.loads(text[start_idx : i + 1])
-                        except json.JSONDecodeError:
-                            return None
+        while start_idx != -1:
+            try:
+                data, _ = _JSON_DECODER.raw_decode(text, start_idx)
+                return data
+            except json.JSONDecodeError:
+                start_idx = text.find("{", start_idx + 1)
         return None
 
     def _build_canvas_question(self, data: dict, question_id: str) -> CanvasQuestion:
@@ -280,7 +1300,7 @@ class IdeaCanvasService:
             for opt in data.get("options", []):
                 options.append(
                     QuestionOption(
-                        id=opt.get("id", f"opt_{uuid.uuid4().hex[:6]}"),
+                        id=opt.get("id") or f"opt_{secrets.token_hex(3)}",
                         label=opt.get("label", ""),
                         description=opt.get("description"),
                         recommended=opt.get("recommended", False),
@@ -292,7 +1312,7 @@ class IdeaCanvasService:
             for appr in data.get("approaches", []):
                 approaches.append(
                     ApproachOption(
-                        id=appr.get("id", f"appr_{uuid.uuid4().hex[:6]}"),
+                        id=appr.get("id") or f"appr_{secrets.token_hex(3)}",
                         title=appr.get("title", ""),
                         description=appr.get("description", ""),
                         pros=appr.get("pros", []),
@@ -317,7 +1337,7 @@ class IdeaCanvasService:
         api_key: str,
         user_id: str | None = None,
     ) -> AsyncIterator[
-        CanvasReadyEvent | CanvasQuestionEvent | CanvasProgressEvent | CanvasErrorEvent
+        CanvasReadyWithQuestionEvent | CanvasProgressEvent | CanvasErrorEvent
     ]:
         """Start a new canvas session and generate the first question.
 
@@ -332,9 +1352,7 @@ class IdeaCanvasService:
         try:
             # Create session
             session_id = f"sess_{uuid.uuid4().hex[:12]}"
-            provider = request.provider.value
-            if provider == "google":
-                provider = "gemini"
+            provider = normalize_provider(request.provider.value)
 
             session = CanvasSession(
                 session_id=session_id,
@@ -343,13 +1361,12 @@ class IdeaCanvasService:
                 provider=provider,
                 model=request.model,
             )
-            self._sessions[session_id] = session
+            await self._save_session(session)
 
             yield CanvasProgressEvent(message="Starting canvas session...")
 
             # Configure LLM
-            self._configure_api_key(provider, api_key)
-            llm_service = LLMService(provider=provider, model=request.model)
+            llm_service = _get_llm_service(provider, request.model, api_key)
 
             if not llm_service.is_available():
                 raise ValueError(f"LLM service not available for provider: {provider}")
@@ -357,39 +1374,41 @@ class IdeaCanvasService:
             yield CanvasProgressEvent(message="Generating first question...")
 
             # Generate first question
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-
-            system_prompt = question_system_prompt(request.template.value)
+            system_prompt = _QUESTION_SYSTEM_PROMPTS[request.template]
             user_prompt = first_question_prompt(request.idea, request.template.value)
 
-            response = await loop.run_in_executor(
-                self._executor,
-                llm_service._call_llm,
-                system_prompt,
-                user_prompt,
-                2000,
-                0.7,
-                True,
-                "first_question",
+            # Near-identical ideas on the same template share a first question
+            cache_namespace = f"first_question:{provider}:{request.template.value}"
+            embedding = await self.run_blocking(
+                self._embed_for_cache,
+                provider,
+                request.model,
+                api_key,
+                request.idea,
             )
+            question_data = (
+                self._semantic_cache.get(cache_namespace, embedding) if embedding else None
+            )
+
+            if question_data is None:
+                question_data = await self._generate_question_data(
+                    llm_service, system_prompt, user_prompt, "first_question"
+                )
+                if embedding and question_data:
+                    self._semantic_cache.set(cache_namespace, embedding, question_data)
+            else:
+                logger.info("Semantic cache hit for first question")
 
-            # Parse response
-            question_data = self._parse_question_response(response)
             question_id = f"q_{uuid.uuid4().hex[:8]}"
             question = self._build_canvas_question(question_data, question_id)
 
             # Add question to session with its options
             session.add_question(question.question, question_id, question.options)
+            await self._save_session(session)
 
-            # Yield ready event with first question
-            yield CanvasReadyEvent(
+            # Single frame carries the session and its first question
+            yield CanvasReadyWithQuestionEvent(
                 session_id=session_id,
-                canvas=session.get_state(),
-            )
-
-            yield CanvasQuestionEvent(
                 question=question,
                 canvas=session.get_state(),
             )
@@ -422,8 +1441,22 @@ class IdeaCanvasService:
         Yields:
             Canvas events
         """
+        # Answers to the same session are applied one at a time
+        async with self.session_lock(request.session_id):
+            async for event in self._submit_answer(request, api_key):
+                yield event
+
+    async def _submit_answer(
+        self, request: AnswerRequest, api_key: str
+    ) -> AsyncIterator[
+        CanvasQuestionEvent
+        | CanvasCompleteEvent
+        | CanvasProgressEvent
+        | CanvasErrorEvent
+    ]:
+        """Apply an answer and generate the next question (lock held)."""
         try:
-            session = self._sessions.get(request.session_id)
+            session = await self.load_session(request.session_id)
             if not session:
                 raise ValueError(f"Session not found: {request.session_id}")
 
@@ -437,57 +1470,36 @@ class IdeaCanvasService:
             )
 
             # Add answer to conversation history
-            session.conversation_history.append(
-                {
-                    "question": (
-                        session.nodes.children[-1].label
-                        if session.nodes.children
-                        else ""
-                    ),
-                    "answer": answer_str,
-                }
-            )
+            session.add_turn(session.current_question_label, answer_str)
 
             # Add answer node - find matching option ID if user selected an option
             answer_id = f"a_{uuid.uuid4().hex[:8]}"
-            selected_option_id = None
-            for opt in session.current_question_options:
-                if opt.label == answer_str or opt.id == answer_str:
-                    selected_option_id = opt.id
-                    break
+            selected_option_id = session.match_option(answer_str)
             session.add_answer(answer_str, answer_id, selected_option_id)
+            await self._save_session(session)
 
             # Configure LLM
-            self._configure_api_key(session.provider, api_key)
-            llm_service = LLMService(provider=session.provider, model=session.model)
+            llm_service = _get_llm_service(session.provider, session.model, api_key)
+
+            await self._compact_history(session, llm_service)
 
             yield CanvasProgressEvent(message="Generating next question...")
 
             # Generate next question
-            import asyncio
-
-            loop = asyncio.get_event_loop()
-
-            system_prompt = question_system_prompt(session.template.value)
+            system_prompt = _QUESTION_SYSTEM_PROMPTS[session.template]
             user_prompt = next_question_prompt(
                 session.idea,
-                session.conversation_history,
+                session.history_text,
                 session.question_count,
             )
-
-            response = await loop.run_in_executor(
-                self._executor,
-                llm_service._call_llm,
-                system_prompt,
-                user_prompt,
-                2000,
-                0.7,
-                True,
-                "next_question",
+            logger.debug(
+                f"Canvas prompt prefix: session={session.session_id}, "
+                f"turns={len(session.prompt_buffer)}, sha={session.history_digest}"
             )
 
-            # Parse response
-            question_data = self._parse_question_response(response)
+            question_data = await self._generate_question_data(
+                llm_service, system_prompt, user_prompt, "next_question"
+            )
 
             # Check if LLM suggests completion (primary decision maker)
             # Only use hard cap of 25 as absolute fallback
@@ -510,6 +1522,7 @@ class IdeaCanvasService:
                         "I think we've explored the key areas of your idea. "
                         "Ready to generate your implementation spec?"
                     )
+                await self._save_session(session)
                 yield CanvasCompleteEvent(
                     message=completion_msg,
                     canvas=session.get_state(),
@@ -520,6 +1533,7 @@ class IdeaCanvasService:
             question_id = f"q_{uuid.uuid4().hex[:8]}"
             question = self._build_canvas_question(question_data, question_id)
             session.add_question(question.question, question_id, question.options)
+            await self._save_session(session)
 
             yield CanvasQuestionEvent(
                 question=question,
@@ -535,14 +1549,26 @@ class IdeaCanvasService:
 
     def get_session(self, session_id: str) -> CanvasSession | None:
         """Get a session by ID."""
-        return self._sessions.get(session_id)
+        return self._store.get(session_id)
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
-            return True
-        return False
+        return self._store.delete(session_id)
+
+    def get_stats(self) -> dict:
+        """Get session store and semantic cache counters."""
+        stats = {"sessions": self._store.stats()}
+        if self._report_cache is not None:
+            stats["report_cache"] = {
+                "hits": self._report_cache.hits,
+                "misses": self._report_cache.misses,
+            }
+        if self._semantic_cache is not None:
+            stats["semantic_cache"] = {
+                "hits": self._semantic_cache.hits,
+                "misses": self._semantic_cache.misses,
+            }
+        return stats
 
     def generate_approaches(self, session_id: str, api_key: str) -> dict:
         """Generate 4 implementation approaches from the Q&A session.
@@ -554,61 +1580,24 @@ class IdeaCanvasService:
         Returns:
             Dict with list of 4 approaches, each containing mermaid diagram and tasks
         """
-        session = self._sessions.get(session_id)
+        session = self._store.get(session_id)
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
-        self._configure_api_key(session.provider, api_key)
-
         # Build Q&A summary
-        qa_summary = ""
-        for i, item in enumerate(session.conversation_history, 1):
-            question = item.get("question", "")
-            answer = item.get("answer", "")
-            qa_summary += f"\nQ{i}: {question}\nA{i}: {answer}\n"
-
-        system_prompt = """You are an expert solution architect. Generate exactly 4 different implementation approaches for the given idea.
-
-For each approach, provide:
-1. A unique descriptive name (e.g., "Microservices", "Serverless", "Monolith", "Hybrid")
-2. A mermaid diagram showing the architecture or flow
-3. A list of implementation tasks with tech stack and complexity
-
-Return ONLY valid JSON in this exact format:
-{
-  "approaches": [
-    {
-      "id": "approach_1",
-      "name": "Descriptive Name",
-      "mermaidCode": "flowchart TD\\n    A[Start] --> B[Process]\\n    B --> C[End]",
-      "tasks": [
-        {
-          "id": "task_1",
-          "name": "Task Name",
-          "description": "What this task involves",
-          "techStack": "React, Node.js",
-          "complexity": "Medium"
-        }
-      ]
-    }
-  ]
-}
+        qa_summary = session.full_history_text
 
-MERMAID RULES:
-- Use flowchart TD (top-down) or LR (left-right) for architecture
-- Use sequenceDiagram for interactions
-- Use graph for simple flows
-- Always use simple node IDs like A, B, C, A1, B2 (letters/numbers only)
-- Put all human-readable text inside brackets, not in the node ID
-- Keep labels SHORT (2-4 words) and avoid parentheses, commas, and colons
-- Avoid subgraphs, pipes, and complex shapes; use plain rectangles
-- Keep diagrams clear, readable, and presentation-friendly
+        cache_namespace = f"approaches:{session.provider}:{session.template.value}"
+        embedding = self._embed_for_cache(
+            session.provider, session.model, api_key, f"{session.idea}\n{qa_summary}"
+        )
+        if embedding:
+            cached = self._semantic_cache.get(cache_namespace, embedding)
+            if cached is not None:
+                logger.info(f"Semantic cache hit for approaches: session={session_id}")
+                return cached
 
-TASK RULES:
-- 4-8 tasks per approach
-- Complexity: Low, Medium, or High
-- Tech stack: comma-separated technologies
-- Description: 1-2 sentences explaining the task"""
+        system_prompt = _APPROACHES_SYSTEM_PROMPT
 
         user_prompt = f"""Generate 4 different implementation approaches for this idea.
 
@@ -637,6 +1626,7 @@ Return ONLY the JSON object."""
             json_mode=True,
             step_name="generate_approaches",
             preferred_model=session.model,
+            api_key=api_key,
         )
 
         # Parse response
@@ -645,6 +1635,8 @@ Return ONLY the JSON object."""
         if not data or "approaches" not in data:
             # Create fallback structure
             data = {"approaches": self._create_fallback_approaches(session)}
+        elif embedding:
+            self._semantic_cache.set(cache_namespace, embedding, data)
 
         return data
 
@@ -715,60 +1707,142 @@ Return ONLY the JSON object."""
         Returns:
             Updated approach dict
         """
-        session = self._sessions.get(session_id)
+        session = self._store.get(session_id)
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
-        self._configure_api_key(session.provider, api_key)
+        system_prompt = _REFINE_SYSTEM_PROMPT
 
-        system_prompt = """You are refining an implementation approach based on user feedback.
+        user_prompt = f"""Refine this approach based on user feedback.
 
-Update ONLY the relevant parts of the approach while keeping the overall structure.
-Return the complete updated approach in the same JSON format.
+CURRENT APPROACH:
+{orjson.dumps(current_approach, option=orjson.OPT_INDENT_2).decode()}
+
+USER CLICKED ON: {element_type} with ID "{element_id}"
+
+USER'S REFINEMENT REQUEST: {refinement_answer}
+
+Update the approach to address the user's feedback. If they clicked on:
+- A diagram element: Update the mermaid code and related tasks
+- A task: Update that specific task and potentially related diagram elements
+
+Return the complete updated approach as JSON."""
+
+        response = self._call_llm_with_fallback(
+            provider=session.provider,
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            max_tokens=3000,
+            temperature=0.6,
+            json_mode=True,
+            step_name="refine_approach",
+            preferred_model=session.model,
+            api_key=api_key,
+        )
+
+        data = self._parse_question_response(response)
+
+        if not data or "id" not in data:
+            # Return original if parsing failed
+            return current_approach
+
+        return data
+
+    def refine_approaches_batch(
+        self,
+        session_id: str,
+        api_key: str,
+        refinements: list[dict],
+    ) -> list[dict]:
+        """Apply several refinements with a single LLM call.
+
+        Args:
+            session_id: The session ID
+            api_key: API key for LLM
+            refinements: Refinement dicts with approach_index, element_id,
+                element_type, refinement_answer and current_approach keys
+
+        Returns:
+            Updated approach dicts, one per refinement in request order
+        """
+        if len(refinements) == 1:
+            return [self.refine_approach(session_id, api_key, **refinements[0])]
 
-{
-  "id": "approach_id",
-  "name": "Approach Name",
-  "mermaidCode": "updated mermaid code",
-  "tasks": [updated tasks array]
-}"""
+        session = self._store.get(session_id)
+        if not session:
+            raise ValueError(f"Session not found: {session_id}")
 
-        user_prompt = f"""Refine this approach based on user feedback.
+        system_prompt = _REFINE_BATCH_SYSTEM_PROMPT
 
+        request_blocks = []
+        for index, item in enumerate(refinements):
+            request_blocks.append(
+                f"""REQUEST {index}:
 CURRENT APPROACH:
-{json.dumps(current_approach, indent=2)}
+{orjson.dumps(item["current_approach"], option=orjson.OPT_INDENT_2).decode()}
 
-USER CLICKED ON: {element_type} with ID "{element_id}"
+USER CLICKED ON: {item["element_type"]} with ID "{item["element_id"]}"
 
-USER'S REFINEMENT REQUEST: {refinement_answer}
+USER'S REFINEMENT REQUEST: {item["refinement_answer"]}"""
+            )
 
-Update the approach to address the user's feedback. If they clicked on:
+        requests_text = "\n\n".join(request_blocks)
+        user_prompt = f"""Refine these approaches based on user feedback.
+
+{requests_text}
+
+For each request, if the user clicked on:
 - A diagram element: Update the mermaid code and related tasks
 - A task: Update that specific task and potentially related diagram elements
 
-Return the complete updated approach as JSON."""
+Return one entry in "updates" per request, using the request number as "index"."""
 
         response = self._call_llm_with_fallback(
             provider=session.provider,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            max_tokens=3000,
+            max_tokens=min(3000 * len(refinements), 8000),
             temperature=0.6,
             json_mode=True,
-            step_name="refine_approach",
+            step_name="refine_approaches_batch",
             preferred_model=session.model,
+            api_key=api_key,
         )
 
         data = self._parse_question_response(response)
+        updates = {
+            update.get("index"): update.get("approach")
+            for update in data.get("updates", [])
+            if isinstance(update, dict)
+        }
 
-        if not data or "id" not in data:
-            # Return original if parsing failed
-            return current_approach
-
-        return data
+        results = []
+        for index, item in enumerate(refinements):
+            approach = updates.get(index)
+            if not isinstance(approach, dict) or "id" not in approach:
+                # Keep the original if this entry is missing or malformed
+                approach = item["current_approach"]
+            results.append(approach)
+        return results
+
+    def _session_cache_key(self, kind: str, session: CanvasSession, *extra) -> str:
+        """Key a generated artifact by everything in the session that shapes it."""
+        return ResponseCache.make_key(
+            kind,
+            session.idea,
+            session.template.value,
+            session.conversation_history,
+            session.provider,
+            session.model,
+            *extra,
+        )
 
     def generate_report(
-        self, session_id: str, api_key: str, image_api_key: str | None = None
+        self,
+        session_id: str,
+        api_key: str,
+        image_api_key: str | None = None,
+        max_tokens: int = REPORT_MAX_TOKENS,
     ) -> dict:
         """Generate an LLM-powered implementation plan from a canvas session.
 
@@ -776,171 +1850,35 @@ Return the complete updated approach as JSON."""
             session_id: The session ID
             api_key: API key for LLM
             image_api_key: API key for image generation (optional)
+            max_tokens: Completion budget for the report
 
         Returns:
             Dict with title and markdown_content
         """
-        session = self._sessions.get(session_id)
+        session = self._store.get(session_id)
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
-        # Configure LLM
-        self._configure_api_key(session.provider, api_key)
-        llm_service = LLMService(provider=session.provider, model=session.model)
+        cache_key = None
+        if self._report_cache is not None:
+            cache_key = self._session_cache_key(
+                "report", session, bool(image_api_key), max_tokens
+            )
+            cached = self._report_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Report cache hit: session={session_id}")
+                return cached
 
         # Build Q&A summary for the LLM
-        qa_summary = ""
-        for i, item in enumerate(session.conversation_history, 1):
-            question = item.get("question", "")
-            answer = item.get("answer", "")
-            qa_summary += f"\nQ{i}: {question}\nA{i}: {answer}\n"
+        qa_summary = session.full_history_text
 
         # Create dynamic prompt based on template type
         template_name = session.template.value
 
-        # Define sections based on template type
-        if template_name == "startup":
-            # Startup planning template with specific sections
-            sections_guidance = """1. **Hook & Problem Statement**
-   - Start with one compelling story OR one striking statistic that illustrates the problem
-   - Explain why this problem matters NOW (timing, market trends, urgency)
-   - Define the user/customer clearly - who exactly experiences this pain?
-   - Current workflow: How do they solve this problem today? What's broken/inefficient?
-
-2. **Solution Overview**
-   - What is the core solution and how does it solve the problem?
-   - Key differentiators from existing solutions
-   - MVP scope: What are the essential features for launch?
-
-3. **Market Opportunity & Audience**
-   - Target market size (TAM, SAM, SOM if applicable)
-   - Customer segments and personas
-   - Customer acquisition strategy
-   - Go-to-market approach
-
-4. **Business / Impact Model**
-   - Revenue streams OR impact metrics (for non-profit/internal tools)
-   - Impact generated:
-     * Productivity improvements (time saved, efficiency gains)
-     * Quality improvements
-     * Cost savings
-     * Revenue potential or risk reduction
-   - Integration and adoption path - how will users transition to this solution?
-   - Pricing strategy (if applicable)
-
-5. **Implementation Roadmap**
-   - Phase 1 (MVP): Core features and timeline
-   - Phase 2: Growth features
-   - Future: Long-term vision
-
-6. **Team & Resources**
-   - Key roles needed
-   - Technology requirements
-   - Budget considerations
-
-7. **Risk Analysis & Mitigation**
-   - Key risks (market, technical, execution)
-   - Mitigation strategies
-
-8. **Next Steps**
-   - Immediate action items to validate and begin"""
-            doc_type = "Startup Plan"
-            writer_role = "expert startup advisor and business strategist"
-        elif template_name in ("web_app", "ai_agent", "tech_stack"):
-            # Technical templates with code examples
-            sections_guidance = """1. **Executive Summary** - A brief overview of the project (2-3 paragraphs)
-2. **Project Overview** - Goals, target users, and key value propositions
-3. **Technical Architecture** - Recommended tech stack, system components, and architecture patterns
-4. **Feature Breakdown** - Detailed list of features organized by priority (MVP, Phase 2, Future)
-5. **Implementation Roadmap** - Phased approach with milestones and estimated timelines
-6. **Code Examples** - Include relevant Python/SQL code snippets for key components
-7. **Risk Analysis** - Potential challenges and mitigation strategies
-8. **Success Metrics** - KPIs and how to measure project success
-9. **Next Steps** - Immediate action items to get started"""
-            doc_type = "Implementation Plan"
-            writer_role = "expert technical writer and product strategist"
-        elif template_name == "project_spec":
-            # Project specification
-            sections_guidance = """1. **Executive Summary** - Brief overview of the project scope
-2. **Project Goals & Objectives** - What success looks like
-3. **Scope & Deliverables** - What's included and excluded
-4. **Requirements** - Functional and non-functional requirements
-5. **Timeline & Milestones** - Key dates and checkpoints
-6. **Resources & Budget** - Required resources and cost estimates
-7. **Risks & Dependencies** - Potential blockers and how to mitigate
-8. **Acceptance Criteria** - How deliverables will be validated"""
-            doc_type = "Project Specification"
-            writer_role = "expert project manager and technical writer"
-        elif template_name == "implement_feature":
-            # Feature implementation planning
-            sections_guidance = """1. **Feature Overview** - What this feature does and why it matters
-2. **User Stories** - Who benefits and how
-3. **Functional Requirements** - Detailed behavior specifications
-4. **UI/UX Considerations** - Interface and experience design notes
-5. **Technical Approach** - How to implement this feature
-6. **Edge Cases & Error Handling** - What could go wrong and how to handle it
-7. **Testing Strategy** - How to validate the feature works correctly
-8. **Rollout Plan** - How to release this feature safely"""
-            doc_type = "Feature Implementation Spec"
-            writer_role = "expert product manager and technical writer"
-        else:
-            # Custom/general ideas - adapt to content dynamically
-            sections_guidance = """Analyze the idea and questions/answers to determine the appropriate document structure.
-Choose sections that make sense for this specific idea. Examples:
-
-For creative projects (books, art, music):
-- Vision & Concept, Target Audience, Creative Direction, Content Outline, Production Plan, Distribution Strategy
-
-For business ideas:
-- Executive Summary, Market Analysis, Value Proposition, Business Model, Go-to-Market Strategy, Financial Projections
-
-For personal projects (travel, events, learning):
-- Overview, Goals & Objectives, Planning Details, Timeline, Budget, Resources Needed
-
-For research or academic work:
-- Abstract, Background, Methodology, Expected Outcomes, Timeline, References
-
-Choose the most appropriate structure based on the actual idea content."""
-            doc_type = "Comprehensive Plan"
-            writer_role = "expert writer who adapts to any domain"
-
-        system_prompt = f"""You are an {writer_role}. Your task is to generate a comprehensive {doc_type} document based on the user's idea exploration session.
-
-The document should be in Markdown format. Structure it with the following sections (adapt as needed based on the idea):
-
-{sections_guidance}
-
-CRITICAL FORMATTING RULES:
-1. Use proper Markdown headers: # for main title, ## for sections, ### for subsections
-2. Use bullet points (- ) for lists of items
-3. ALWAYS wrap code in triple backticks with the language specified:
-   ```python
-   # Python code here
-   ```
-   ```sql
-   -- SQL code here
-   ```
-4. NEVER write code as plain text or bullet points
-5. Every code example MUST be in a fenced code block with language tag
-
-CODE REQUIREMENTS:
-- For technical projects, include practical code examples
-- Use Python for: backend logic, API endpoints, data processing, automation
-- Use SQL for: database schemas, queries, migrations
-- Use bash for: setup commands, deployment scripts
-- Each code block should be complete and runnable
-- Include comments in code to explain key parts
-
-READABILITY RULES (VERY IMPORTANT):
-- Start each major section with a 1-2 sentence overview paragraph
-- Prefer short paragraphs (2-4 sentences) over large text walls
-- Use bullet lists for decisions, requirements, risks, and next steps
-- Use tables where helpful (e.g., MVP scope, roadmap, metrics, tradeoffs)
-- Keep bullet points concise (ideally one line each)
-- Split large code examples into smaller focused snippets with ### subheadings
-- Avoid repeating the same heading or section twice
-
-Make the document actionable, specific, and tailored to the decisions made during the exploration session."""
+        _, doc_type, _ = _TEMPLATE_CONFIG.get(template_name, _DEFAULT_TEMPLATE_CONFIG)
+        system_prompt = _REPORT_SYSTEM_PROMPTS.get(
+            template_name, _DEFAULT_REPORT_SYSTEM_PROMPT
+        )
 
         user_prompt = f"""Based on the following idea exploration session, generate a comprehensive {doc_type} document.
 
@@ -952,57 +1890,39 @@ TEMPLATE: {session.template.value.replace('_', ' ').title()}
 EXPLORATION Q&A:
 {qa_summary}
 
-Generate a detailed, actionable {doc_type} document in Markdown format.
-
-REQUIREMENTS:
-1. Reference the specific decisions and answers from the exploration
-2. Include Python and SQL code examples where relevant
-3. CRITICAL: All code MUST be in fenced code blocks with triple backticks and language tag
-4. Do NOT write code as plain text or bullet points
-5. Each code example should be complete and practical
-
-Example of correct code formatting:
-```python
-def example_function():
-    return "This is correct"
-```
-
-Wrong (do NOT do this):
-- def example_function():
-- return "This is wrong\""""
+Generate a detailed, actionable {doc_type} document in Markdown format that references the specific decisions and answers from the exploration, with Python and SQL code examples where relevant."""
 
         # Generate the implementation plan with model fallback
         response = self._call_llm_with_fallback(
             provider=session.provider,
             system_prompt=system_prompt,
             user_prompt=user_prompt,
-            max_tokens=4000,
+            max_tokens=max_tokens,
             temperature=0.7,
             json_mode=False,
             step_name="generate_report",
             preferred_model=session.model,
+            api_key=api_key,
+            cache_key=f"canvas_report:{template_name}",
         )
 
         # Clean up the response (remove markdown code blocks if present)
-        markdown_content = response.strip()
-        if markdown_content.startswith("```markdown"):
-            markdown_content = markdown_content[11:]
-        if markdown_content.startswith("```"):
-            markdown_content = markdown_content[3:]
-        if markdown_content.endswith("```"):
-            markdown_content = markdown_content[:-3]
-        markdown_content = markdown_content.strip()
+        markdown_content = _strip_code_fence(response)
+        if markdown_content:
+            session.last_report_markdown = markdown_content
+            session.last_report_fingerprint = self._session_cache_key(
+                "report_markdown", session
+            )
+            self._store.save(session)
 
         # Add decision tree from the canvas
-        decision_tree = self._build_decision_tree_markdown(session.nodes)
+        decision_tree = self._build_decision_tree_markdown(session)
 
         # Add header and footer
         title = (
             f"{doc_type}: {session.idea[:50]}{'...' if len(session.idea) > 50 else ''}"
         )
 
-        from datetime import datetime
-
         footer = f"\n\n---\n*Generated by PrismDocs on {datetime.now().strftime('%Y-%m-%d %H:%M')} | Based on {session.question_count} exploration questions*"
 
         full_content = markdown_content
@@ -1010,125 +1930,79 @@ Wrong (do NOT do this):
             full_content += f"\n\n{decision_tree}"
         full_content += footer
 
+        # The summary image is returned alongside the PDF rather than embedded
+        # in it, so the image API call and the PDF render run concurrently.
         summary_image_base64 = None
         if image_api_key:
-            summary_image_base64 = self._generate_report_image(
-                title, markdown_content, image_api_key
-            )
-
-        # Generate PDF
-        pdf_base64 = self._generate_pdf_from_markdown(
-            title, full_content, image_base64=summary_image_base64
-        )
+            with ThreadPoolExecutor(max_workers=1) as image_executor:
+                image_future = image_executor.submit(
+                    self._generate_report_image, title, markdown_content, image_api_key
+                )
+                pdf_base64 = self._generate_pdf_from_markdown(title, full_content)
+                try:
+                    summary_image_base64 = image_future.result()
+                except Exception as exc:
+                    logger.warning(f"Failed to generate summary image: {exc}")
+        else:
+            pdf_base64 = self._generate_pdf_from_markdown(title, full_content)
 
-        return {
+        result = {
             "title": title,
             "markdown_content": full_content,
             "pdf_base64": pdf_base64,
             "image_base64": summary_image_base64,
             "image_format": "png" if summary_image_base64 else None,
         }
+        if cache_key and markdown_content:
+            self._report_cache.set(cache_key, result)
+        return result
 
     def _generate_pdf_from_markdown(
         self,
         title: str,
         markdown_content: str,
-        image_base64: str | None = None,
     ) -> str:
         """Generate PDF from markdown content and return as base64 string.
 
+        Rendering is CPU-bound, so it runs in the shared PDF worker pool.
+
         Args:
             title: Document title
             markdown_content: Markdown content to convert
-            image_base64: Optional base64 image to embed in PDF
 
         Returns:
             Base64-encoded PDF data
         """
-        import base64
-        import re
-        import tempfile
-        from pathlib import Path
-        from datetime import datetime
-
         try:
-            from ....infrastructure.generators.pdf.generator import PDFGenerator
-
-            pdf_generator = PDFGenerator()
-
-            # Create temporary directory for output
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Generate a clean filename from the title
-                # Remove special characters and limit length
-                clean_title = re.sub(r"[^\w\s-]", "", title).strip()
-                clean_title = re.sub(r"[-\s]+", "_", clean_title)[:50]
-                filename = f"{clean_title}.pdf" if clean_title else "canvas_report.pdf"
-
-                pdf_markdown = markdown_content
-                if image_base64:
-                    image_path = temp_path / "idea_canvas_summary.png"
-                    try:
-                        cleaned = image_base64.split(",", 1)[-1]
-                        image_path.write_bytes(base64.b64decode(cleaned))
-                        pdf_markdown = (
-                            f"![Implementation Summary]({image_path})\n\n"
-                            + markdown_content
-                        )
-                    except Exception as exc:
-                        logger.warning(f"Failed to embed summary image: {exc}")
-
-                # Prepare content for PDF generator
-                content = {
-                    "title": title,
-                    "markdown": pdf_markdown,
-                }
-
-                metadata = {
-                    "title": title,  # PDF generator uses this for display title
-                    "custom_filename": (
-                        clean_title if clean_title else "canvas_report"
-                    ),  # For file output
-                    "source": "Idea Canvas",
-                    "created_at": datetime.now().isoformat(),
-                    "content_type": "Implementation Spec",
-                }
-
-                # Generate PDF
-                pdf_path = pdf_generator.generate(content, metadata, temp_path)
-
-                # Read and encode as base64
-                with open(pdf_path, "rb") as f:
-                    pdf_bytes = f.read()
-                    pdf_base64 = base64.b64encode(pdf_bytes).decode("utf-8")
-
-                return pdf_base64
-
+            return _get_pdf_pool().submit(
+                _render_pdf_base64, title, markdown_content
+            ).result()
         except Exception as e:
-            logger.error(f"Failed to generate PDF: {e}")
+            logger.error(f"PDF worker failed: {e}")
             return ""
 
-    def _add_node_to_markdown(self, node: CanvasNode, lines: list, depth: int) -> None:
-        """Recursively add canvas nodes to markdown."""
-        indent = "  " * depth
-
-        if node.type == CanvasNodeType.ROOT:
-            lines.append(f"- 💡 **{node.label}**")
-        elif node.type == CanvasNodeType.QUESTION:
-            lines.append(f"{indent}- ❓ *{node.label}*")
-        elif node.type == CanvasNodeType.ANSWER:
-            lines.append(f"{indent}- ✅ **{node.label}**")
-        elif node.type == CanvasNodeType.APPROACH:
-            lines.append(f"{indent}- 🔧 **{node.label}**")
+    def _build_decision_tree_markdown(self, session: CanvasSession) -> str:
+        """Build a markdown decision tree section from the session's canvas nodes.
 
-        for child in node.children:
-            self._add_node_to_markdown(child, lines, depth + 1)
-
-    def _build_decision_tree_markdown(self, root: CanvasNode) -> str:
-        """Build a markdown decision tree section from the canvas nodes."""
+        The result is kept on the session and reused until the tree changes.
+        """
+        if session._cached_decision_tree_version == session._state_version:
+            return session._cached_decision_tree
+        session._cached_decision_tree = self._render_decision_tree(session.nodes)
+        session._cached_decision_tree_version = session._state_version
+        return session._cached_decision_tree
+
+    @staticmethod
+    def _render_decision_tree(root: CanvasNode) -> str:
+        """Render the canvas tree as a markdown decision tree section."""
         lines: list[str] = []
-        self._add_node_to_markdown(root, lines, 0)
+        stack: list[tuple[CanvasNode, int]] = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            line_format = _DECISION_TREE_LINES.get(node.type)
+            if line_format:
+                lines.append("  " * depth + line_format.format(node.label))
+            stack.extend((child, depth + 1) for child in reversed(node.children))
         if not lines:
             return ""
         return "## Decision Tree\n\n" + "\n".join(lines)
@@ -1159,9 +2033,13 @@ Wrong (do NOT do this):
         image_data, _prompt_used = service.generate_raster_image(
             prompt=prompt, style=style, free_text_mode=False
         )
-        return image_data
+        if not image_data:
+            return None
+        return image_data.split(",", 1)[-1]
 
-    def generate_mindmap_from_session(self, session_id: str, api_key: str) -> dict:
+    async def generate_mindmap_from_session(
+        self, session_id: str, api_key: str, max_tokens: int = MINDMAP_MAX_TOKENS
+    ) -> dict:
         """Generate a mind map from the canvas session's implementation report.
 
         This first generates an implementation report from the Q&A, then creates
@@ -1170,91 +2048,36 @@ Wrong (do NOT do this):
         Args:
             session_id: The session ID
             api_key: API key for LLM
+            max_tokens: Completion budget for the mind map JSON
 
         Returns:
             MindMapTree-compatible dict
         """
-        session = self._sessions.get(session_id)
+        session = await self.load_session(session_id)
         if not session:
             raise ValueError(f"Session not found: {session_id}")
 
-        # Configure API key for LLM calls
-        self._configure_api_key(session.provider, api_key)
-
-        # Step 1: Generate the implementation report from Q&A
-        # (Reuse the report generation logic but just get the markdown)
-        qa_summary = ""
-        for i, item in enumerate(session.conversation_history, 1):
-            question = item.get("question", "")
-            answer = item.get("answer", "")
-            qa_summary += f"\nQ{i}: {question}\nA{i}: {answer}\n"
-
-        template_name = session.template.value
-
-        report_system_prompt = """You are an expert technical writer. Generate a concise implementation plan based on the exploration session. 
-Focus on actionable items organized by category. Use markdown format with clear headers."""
-
-        report_user_prompt = f"""Based on this idea exploration session, generate a concise implementation plan.
-
-ORIGINAL IDEA: {session.idea}
-TEMPLATE: {template_name.replace('_', ' ').title()}
-
-EXPLORATION Q&A:
-{qa_summary}
-
-Generate a structured implementation plan with clear sections for:
-- Overview (1-2 sentences)
-- Key Components/Features
-- Technical Approach  
-- Implementation Steps
-- Next Actions"""
-
-        # Generate the report content with model fallback
-        report_content = self._call_llm_with_fallback(
-            provider=session.provider,
-            system_prompt=report_system_prompt,
-            user_prompt=report_user_prompt,
-            max_tokens=3000,
-            temperature=0.6,
-            json_mode=False,
-            step_name="generate_report_for_mindmap",
-            preferred_model=session.model,
-        )
+        cache_key = None
+        if self._report_cache is not None:
+            cache_key = self._session_cache_key("mindmap", session, max_tokens)
+            cached = self._report_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Mind map cache hit: session={session_id}")
+                return cached
+
+        # Step 1: Reuse the latest report if the session has not changed since,
+        # otherwise generate a concise implementation plan from the Q&A
+        fingerprint = self._session_cache_key("report_markdown", session)
+        if (
+            session.last_report_markdown
+            and session.last_report_fingerprint == fingerprint
+        ):
+            logger.info(f"Reusing generated report for mind map: session={session_id}")
+            report_content = session.last_report_markdown
+        else:
+            report_content = await self._generate_mindmap_report(session, api_key)
 
         # Step 2: Generate mind map from the implementation report
-        mindmap_system_prompt = """You are an expert at creating clear, hierarchical mind maps.
-
-Your task is to analyze an implementation plan and generate a mind map structure as JSON.
-
-The JSON structure must follow this exact format:
-{
-  "title": "Project Name",
-  "summary": "Brief 1-2 sentence summary of the implementation",
-  "nodes": {
-    "id": "root",
-    "label": "Project Name",
-    "children": [
-      {
-        "id": "1",
-        "label": "Component/Phase 1",
-        "children": [
-          {"id": "1.1", "label": "Task/Feature", "children": []},
-          {"id": "1.2", "label": "Task/Feature", "children": []}
-        ]
-      }
-    ]
-  }
-}
-
-Rules:
-1. The root node should be the project/idea name
-2. First-level children should be major components, phases, or categories
-3. Deeper levels should break down into specific tasks, features, or sub-components
-4. Each node must have unique "id", concise "label" (max 50 chars), and "children" array
-5. Make labels actionable and clear
-6. Determine the appropriate depth based on content complexity (2-6 levels as needed)
-7. Return ONLY the JSON object, no markdown code blocks"""
-
         mindmap_user_prompt = f"""Create a mind map from this implementation plan.
 
 GUIDELINES:
@@ -1271,48 +2094,28 @@ IMPLEMENTATION PLAN:
 Generate the mind map JSON now. Return ONLY valid JSON."""
 
         # Use Pro model for mindmap JSON as it produces better structured output
-        response = self._call_llm_with_fallback(
+        response = await self._call_llm_with_fallback_async(
             provider=session.provider,
-            system_prompt=mindmap_system_prompt,
+            system_prompt=_MINDMAP_SYSTEM_PROMPT,
             user_prompt=mindmap_user_prompt,
-            max_tokens=4000,
+            max_tokens=max_tokens,
             temperature=0.5,
             json_mode=True,
             step_name="generate_mindmap",
             preferred_model="gemini-2.5-pro",  # Pro produces better JSON
+            api_key=api_key,
+            cache_key="canvas_mindmap",
         )
 
-        # Parse response - handle various JSON formats
-        data = None
-
-        # First, try direct JSON parse
+        # Parse response: strip any code fence once, then fall back to
+        # extracting the first JSON object embedded in surrounding text
         try:
-            data = json.loads(response)
-        except json.JSONDecodeError:
-            pass
-
-        # If direct parse failed, try to extract JSON from markdown code blocks
-        if data is None:
-            # Remove markdown code blocks if present
-            cleaned_response = response.strip()
-            if cleaned_response.startswith("```json"):
-                cleaned_response = cleaned_response[7:]
-            elif cleaned_response.startswith("```"):
-                cleaned_response = cleaned_response[3:]
-            if cleaned_response.endswith("```"):
-                cleaned_response = cleaned_response[:-3]
-            cleaned_response = cleaned_response.strip()
-
-            try:
-                data = json.loads(cleaned_response)
-            except json.JSONDecodeError:
-                pass
-
-        # If still no luck, try to extract JSON object from text
-        if data is None:
+            data = orjson.loads(_strip_code_fence(response))
+        except orjson.JSONDecodeError:
             data = self._extract_json(response)
 
         # If all parsing attempts failed, create a fallback structure
+        parsed = data is not None
         if data is None:
             logger.warning(
                 f"Failed to parse mindmap JSON, using fallback structure. Response: {response[:500]}"
@@ -1336,39 +2139,186 @@ Generate the mind map JSON now. Return ONLY valid JSON."""
             }
 
         # Build MindMapTree-compatible structure
-        return {
+        result = {
             "title": data.get("title", session.idea[:50]),
             "summary": data.get("summary", ""),
             "source_count": session.question_count,
             "mode": "summarize",
             "nodes": self._ensure_node_structure(data.get("nodes", {})),
         }
+        # Fallback structures are not cached so the next request retries
+        if cache_key and parsed:
+            self._report_cache.set(cache_key, result)
+        return result
 
-    def _ensure_node_structure(self, node_data: dict) -> dict:
-        """Ensure node has proper structure with id, label, children."""
-        import uuid as uuid_mod
+    async def _generate_mindmap_report(
+        self, session: CanvasSession, api_key: str
+    ) -> str:
+        """Generate a concise implementation plan to build the mind map from."""
+        qa_summary = session.full_history_text
+        template_name = session.template.value
+
+        report_user_prompt = f"""Based on this idea exploration session, generate a concise implementation plan.
 
-        node_id = str(node_data.get("id", uuid_mod.uuid4().hex[:8]))
-        label = str(node_data.get("label", ""))[:100]
+ORIGINAL IDEA: {session.idea}
+TEMPLATE: {template_name.replace('_', ' ').title()}
 
-        children = []
-        for child_data in node_data.get("children", []):
-            children.append(self._ensure_node_structure(child_data))
+EXPLORATION Q&A:
+{qa_summary}
 
-        return {
-            "id": node_id,
-            "label": label,
-            "children": children,
-        }
+Generate a structured implementation plan with clear sections for:
+- Overview (1-2 sentences)
+- Key Components/Features
+- Technical Approach  
+- Implementation Steps
+- Next Actions"""
+
+        # Generate the report content with model fallback
+        return await self._call_llm_with_fallback_async(
+            provider=session.provider,
+            system_prompt=_MINDMAP_REPORT_SYSTEM_PROMPT,
+            user_prompt=report_user_prompt,
+            max_tokens=3000,
+            temperature=0.6,
+            json_mode=False,
+            step_name="generate_report_for_mindmap",
+            preferred_model=session.model,
+            api_key=api_key,
+            cache_key="canvas_mindmap_report",
+        )
+
+    def _ensure_node_structure(self, node_data: dict) -> dict:
+        """Ensure every node has proper structure with id, label, children.
+
+        Walks the tree with an explicit stack so deep mind maps cannot hit
+        the recursion limit.
+        """
+        root: dict = {}
+        stack: list[tuple[dict, dict]] = [(node_data, root)]
+        while stack:
+            source, target = stack.pop()
+            node_id = source.get("id")
+            if not isinstance(node_id, str):
+                node_id = secrets.token_hex(4) if node_id is None else str(node_id)
+            label = source.get("label", "")
+            if not isinstance(label, str):
+                label = str(label)
+
+            children: list[dict] = []
+            target["id"] = node_id
+            target["label"] = label[:100]
+            target["children"] = children
+            for child_data in source.get("children", []):
+                child: dict = {}
+                children.append(child)
+                stack.append((child_data, child))
+        return root
+
+
+# Window during which rapid refine clicks on one session are merged
+REFINE_BATCH_WINDOW_SECONDS = 0.075
+
+
+class RefinementCoalescer:
+    """Coalesce refine requests that arrive close together into one LLM call.
+
+    The first request for a session waits a short window, then issues a single
+    batched refinement for everything queued meanwhile and hands each caller
+    its own result.
+    """
+
+    def __init__(
+        self,
+        service: IdeaCanvasService,
+        window_seconds: float = REFINE_BATCH_WINDOW_SECONDS,
+    ):
+        self._service = service
+        self._window_seconds = window_seconds
+        self._pending: dict[tuple[str, str], list[tuple[dict, asyncio.Future]]] = {}
+        # Strong references to running dispatches until they finish
+        self._tasks: set[asyncio.Task] = set()
+
+    async def refine(self, session_id: str, api_key: str, refinement: dict) -> dict:
+        """Queue a refinement and wait for its (possibly batched) result."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        key = (session_id, api_key)
+
+        batch = self._pending.get(key)
+        if batch is not None:
+            batch.append((refinement, future))
+            return await future
+
+        batch = [(refinement, future)]
+        self._pending[key] = batch
+        # Detached, so cancelling the first caller does not strand the rest
+        task = asyncio.ensure_future(self._dispatch(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def _dispatch(
+        self, key: tuple[str, str], batch: list[tuple[dict, asyncio.Future]]
+    ) -> None:
+        """Run one batched refinement and settle every waiter in batch."""
+        results: list = []
+        error: BaseException | None = None
+        try:
+            try:
+                await asyncio.sleep(self._window_seconds)
+            finally:
+                self._pending.pop(key, None)
+            results = await self._service.run_blocking(
+                self._service.refine_approaches_batch,
+                key[0],
+                key[1],
+                [item for item, _ in batch],
+            )
+        except BaseException as e:  # cancellation too; re-raised
+            error = e
+            raise
+        finally:
+            for index, (_, waiter) in enumerate(batch):
+                if waiter.done():
+                    continue
+                if index < len(results):
+                    waiter.set_result(results[index])
+                elif isinstance(error, asyncio.CancelledError):
+                    waiter.cancel()
+                else:
+                    waiter.set_exception(
+                        error
+                        or RuntimeError("Batched refinement returned no result")
+                    )
 
 
 # Singleton instance
 _idea_canvas_service: IdeaCanvasService | None = None
+_refinement_coalescer: RefinementCoalescer | None = None
+# Guards first creation so concurrent requests cannot build separate
+# instances (each with its own session store and caches)
+_singleton_lock = threading.Lock()
 
 
 def get_idea_canvas_service() -> IdeaCanvasService:
     """Get or create idea canvas service instance."""
     global _idea_canvas_service
     if _idea_canvas_service is None:
-        _idea_canvas_service = IdeaCanvasService()
+        with _singleton_lock:
+            if _idea_canvas_service is None:
+                canvas_settings = get_settings().idea_canvas
+                _idea_canvas_service = IdeaCanvasService(
+                    enable_semantic_cache=canvas_settings.semantic_cache_enabled
+                )
     return _idea_canvas_service
+
+
+def get_refinement_coalescer() -> RefinementCoalescer:
+    """Get or create the refine request coalescer."""
+    global _refinement_coalescer
+    if _refinement_coalescer is None:
+        service = get_idea_canvas_service()
+        with _singleton_lock:
+            if _refinement_coalescer is None:
+                _refinement_coalescer = RefinementCoalescer(service)
+    return _refinement_coalescer
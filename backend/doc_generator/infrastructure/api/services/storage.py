@@ -1,13 +1,56 @@
 """Storage service for uploads and outputs."""
 
+import base64
+import hashlib
+import hmac
+import os
 import secrets
-import time
+import shutil
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 from loguru import logger
 
 from ...settings import get_settings
 
+# Chunk size for copying uploads to disk (bounds memory per upload)
+UPLOAD_COPY_BUFFER_BYTES = 1024 * 1024
+UPLOAD_PATH_CACHE_SIZE = 2048
+# fdatasync is unavailable on macOS; fsync also flushes metadata
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+DOWNLOAD_TOKEN_CACHE_SIZE = 4096
+
+# Process-wide key for download tokens (tokens are not checked yet)
+_DOWNLOAD_TOKEN_KEY = secrets.token_bytes(32)
+
+
+@lru_cache(maxsize=DOWNLOAD_TOKEN_CACHE_SIZE)
+def _download_token(rel_path: str) -> str:
+    """Sign rel_path, so repeated URLs for a file reuse the same token."""
+    digest = hmac.new(_DOWNLOAD_TOKEN_KEY, rel_path.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode("ascii")
+
+
+@lru_cache(maxsize=UPLOAD_PATH_CACHE_SIZE)
+def _resolve_upload(base_output_dir: str, file_id: str) -> Path:
+    """Find the stored file for file_id, scanning its source dir once.
+
+    Misses raise instead of returning None so they are not cached; file_ids
+    are never reused, so a found path stays valid.
+    """
+    source_dir = os.path.join(base_output_dir, file_id, "source")
+    try:
+        with os.scandir(source_dir) as entries:
+            entry = next(entries, None)
+    except (FileNotFoundError, NotADirectoryError):
+        entry = None
+    if entry is None:
+        raise FileNotFoundError(f"Upload not found: {file_id}")
+    return Path(entry.path)
+
+
 class StorageService:
     """Manages uploads and generated outputs with organized folder structure.
     
@@ -43,18 +86,16 @@ class StorageService:
         self.base_output_dir = Path(base_output_dir)
         self.cache_dir = Path(cache_dir)
         self.base_url = base_url
+        self.durable_uploads = settings.generator.durable_uploads
 
         # Ensure base directories exist
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Track upload metadata
-        self._uploads: dict[str, dict] = {}
-
     def _get_file_dir(self, file_id: str) -> Path:
         """Get the directory for a specific file_id.
 
-        Used by: save_upload, get_upload_path.
+        Used by: _ensure_file_dirs, save_output.
         Invoked by: src/doc_generator/infrastructure/api/services/storage.py, src/doc_generator/infrastructure/storage/file_storage.py
         """
         return self.base_output_dir / file_id
@@ -89,11 +130,37 @@ class StorageService:
     ) -> str:
         """Save uploaded file and return file_id.
 
+        Thin wrapper over save_upload_stream for content already in memory.
+
+        Args:
+            content: File content bytes
+            filename: Original filename
+            mime_type: MIME type of file
+
+        Returns:
+            Unique file ID (f_...)
+
+        Invoked by: tests/api/test_storage_service.py
+        """
+        return self.save_upload_stream(BytesIO(content), filename, mime_type)
+
+    def save_upload_stream(
+        self,
+        reader: BinaryIO,
+        filename: str,
+        mime_type: str,
+    ) -> str:
+        """Stream an uploaded file to disk and return file_id.
+
         Creates organized folder structure:
         data/output/<file_id>/source/<original_filename>
 
+        The file is copied in UPLOAD_COPY_BUFFER_BYTES chunks, so the upload
+        is never held in memory as a whole. With durable_uploads enabled the
+        data is flushed to disk before returning.
+
         Args:
-            content: File content bytes
+            reader: Binary file-like object positioned at the start of the data
             filename: Original filename
             mime_type: MIME type of file
 
@@ -101,25 +168,21 @@ class StorageService:
             Unique file ID (f_...)
 
         Used by: src/doc_generator/infrastructure/api/routes/upload.py
-        Invoked by: src/doc_generator/infrastructure/api/routes/upload.py, tests/api/test_storage_service.py
+        Invoked by: src/doc_generator/infrastructure/api/routes/upload.py
         """
         file_id = f"f_{secrets.token_hex(12)}"
         dirs = self._ensure_file_dirs(file_id)
-        
+
         # Save to source directory with original filename
         storage_path = dirs["source"] / filename
 
-        storage_path.write_bytes(content)
-        logger.info(f"Saved upload: {storage_path}")
-
-        self._uploads[file_id] = {
-            "filename": filename,
-            "mime_type": mime_type,
-            "path": storage_path,
-            "file_id": file_id,
-            "dirs": dirs,
-            "created_at": time.time(),
-        }
+        fd = os.open(storage_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        with open(fd, "wb") as f:
+            shutil.copyfileobj(reader, f, UPLOAD_COPY_BUFFER_BYTES)
+            if self.durable_uploads:
+                f.flush()
+                _fdatasync(fd)
+        logger.info(f"Saved upload: {storage_path} ({mime_type})")
 
         return file_id
 
@@ -138,20 +201,33 @@ class StorageService:
         Used by: src/doc_generator/infrastructure/api/services/generation.py
         Invoked by: src/doc_generator/infrastructure/api/services/generation.py, src/doc_generator/infrastructure/storage/file_storage.py, tests/api/test_storage_service.py
         """
-        if file_id in self._uploads:
-            return self._uploads[file_id]["path"]
-        
-        # Try to find on disk if not in memory (after server restart)
-        file_dir = self._get_file_dir(file_id)
-        source_dir = file_dir / "source"
-        if source_dir.exists():
-            files = list(source_dir.iterdir())
-            if files:
-                return files[0]
-        
-        raise FileNotFoundError(f"Upload not found: {file_id}")
+        # Resolved from disk (cached per file_id), so lookups work across
+        # StorageService instances, workers and restarts
+        return _resolve_upload(str(self.base_output_dir), file_id)
 
 
+    def save_output(self, content: bytes, filename: str, kind: str) -> Path:
+        """Save generated output bytes under a new file_id.
+
+        Creates data/output/<file_id>/<kind>/<filename>.
+
+        Args:
+            content: File content bytes
+            filename: Output filename
+            kind: Output subdirectory (e.g. "audio")
+
+        Returns:
+            Path to the saved file
+        """
+        file_id = f"f_{secrets.token_hex(12)}"
+        output_dir = self._get_file_dir(file_id) / kind
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        output_path = output_dir / filename
+        output_path.write_bytes(content)
+        logger.info(f"Saved output: {output_path}")
+        return output_path
+
     def get_download_url(self, output_path: Path) -> str:
         """Generate download URL for output file.
 
@@ -159,33 +235,32 @@ class StorageService:
             output_path: Path to the output file
 
         Returns:
-            Download URL with token
+            Download URL with a token signed over the relative path
 
         Used by: src/doc_generator/infrastructure/api/services/generation.py,
                  src/doc_generator/infrastructure/api/routes/generate.py
         Invoked by: src/doc_generator/infrastructure/api/routes/generate.py, src/doc_generator/infrastructure/api/services/generation.py, tests/api/test_storage_service.py
         """
-        # Generate a simple token (in production, use signed URLs)
-        token = secrets.token_urlsafe(16)
-        
-        # Try to extract file_id and create a cleaner URL
-        parts = output_path.parts
-        for i, part in enumerate(parts):
-            if part.startswith("f_"):
-                # Found file_id, construct relative path from there
-                rel_path = "/".join(parts[i:])
-                return f"{self.base_url}/{rel_path}?token={token}"
-
-        # Use path relative to output root when possible to avoid collisions
+        # Outputs normally live under the output root, which gives the
+        # path directly (<file_id>/<kind>/<name> for stored outputs)
         try:
             rel_path = output_path.relative_to(self.base_output_dir).as_posix()
-            return f"{self.base_url}/{rel_path}?token={token}"
         except ValueError:
-            pass
-
-        # Fallback to just filename
-        filename = output_path.name
-        return f"{self.base_url}/{filename}?token={token}"
+            rel_path = None
+
+        if rel_path is None:
+            # Try to extract file_id and create a cleaner URL
+            parts = output_path.parts
+            for i, part in enumerate(parts):
+                if part.startswith("f_"):
+                    # Found file_id, construct relative path from there
+                    rel_path = "/".join(parts[i:])
+                    break
+            else:
+                # Fallback to just filename
+                rel_path = output_path.name
+
+        return f"{self.base_url}/{rel_path}?token={_download_token(rel_path)}"
 
     # Legacy compatibility properties
     @property
@@ -5,10 +5,12 @@ This service provides a unified interface for all content generation types
 while enabling session-based state reuse across output formats.
 """
 
-import base64
+import asyncio
+import itertools
 import json
+import mmap
 import os
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import AsyncIterator, Callable, Optional
@@ -20,37 +22,94 @@ from ....application import (
     run_unified_workflow_with_session,
 )
 from ....application.unified_state import UnifiedWorkflowState
-from ..schemas.responses import (
-    CompleteEvent,
-    ErrorEvent,
-    ProgressEvent,
-    CompletionMetadata,
-    GenerationStatus,
-)
-from ..schemas.podcast import (
-    PodcastCompleteEvent,
-    PodcastErrorEvent,
-    PodcastProgressEvent,
+from ....utils.base64_utils import b64encode_ascii
+from ....utils.podcast_utils import wave_bytes
+from ...settings import get_settings
+from ..schemas.faq import (
+    FAQCompleteEvent,
+    FAQDocumentResponse,
+    FAQErrorEvent,
+    FAQItemResponse,
+    FAQMetadataResponse,
+    FAQProgressEvent,
 )
 from ..schemas.mindmap import (
     MindMapCompleteEvent,
     MindMapErrorEvent,
+    MindMapMode,
+    MindMapNode,
     MindMapProgressEvent,
     MindMapTree,
-    MindMapNode,
-    MindMapMode,
 )
-from ..schemas.faq import (
-    FAQCompleteEvent,
-    FAQDocumentResponse,
-    FAQErrorEvent,
-    FAQMetadataResponse,
-    FAQItemResponse,
-    FAQProgressEvent,
+from ..schemas.podcast import (
+    PodcastCompleteEvent,
+    PodcastErrorEvent,
+    PodcastProgressEvent,
+)
+from ..schemas.responses import (
+    CompleteEvent,
+    CompletionMetadata,
+    ErrorEvent,
+    GenerationStatus,
+    ProgressEvent,
 )
 from .storage import StorageService
 
 DEFAULT_INLINE_PREVIEW_BYTES = 8 * 1024 * 1024
+# Document progress events waiting for a slow SSE client; workflow threads
+# block once this many are queued
+PROGRESS_QUEUE_MAXSIZE = 32
+# Minimum gap between document progress batches (about 20 SSE frames/s)
+PROGRESS_BATCH_SECONDS = 0.05
+# Idle mind map streams get a progress tick this often while the model runs
+MINDMAP_HEARTBEAT_SECONDS = 0.5
+MINDMAP_HEARTBEAT_MAX_PERCENT = 89
+
+# Validated once; static events are yielded as-is and variable ones are
+# model_copy'd from these (model_copy skips validation). Treat as read-only.
+_MINDMAP_START_EVENT = MindMapProgressEvent(
+    stage="extracting",
+    percent=5,
+    message="Starting mind map generation...",
+)
+_MINDMAP_STEP_EVENT = MindMapProgressEvent(stage="extracting", percent=5)
+_MINDMAP_BRANCH_EVENT = MindMapProgressEvent(stage="generating", percent=50)
+_MINDMAP_CACHED_EVENT = MindMapProgressEvent(
+    stage="cached",
+    percent=95,
+    message="Reused the mind map generated for identical content",
+)
+
+# Marks an exhausted child iterator; ``None`` is a valid (skipped) child
+_END = object()
+
+# Document output_format -> unified workflow output_type
+_FORMAT_MAPPING: dict[str, str] = {
+    "pdf": "article_pdf",
+    "pptx": "presentation_pptx",
+    "markdown": "article_markdown",
+    "pdf_from_pptx": "slide_deck_pdf",
+}
+# Workflow node -> status reported for its progress events
+_WORKFLOW_STATUS_MAP: dict[str, GenerationStatus] = {
+    "validate_sources": GenerationStatus.PARSING,
+    "resolve_sources": GenerationStatus.PARSING,
+    "extract_sources": GenerationStatus.PARSING,
+    "merge_sources": GenerationStatus.PARSING,
+    "detect_format": GenerationStatus.PARSING,
+    "parse_document_content": GenerationStatus.PARSING,
+    "summarize_sources": GenerationStatus.TRANSFORMING,
+    "build_image_prompt": GenerationStatus.TRANSFORMING,
+    "transform_content": GenerationStatus.TRANSFORMING,
+    "enhance_content": GenerationStatus.TRANSFORMING,
+    "generate_images": GenerationStatus.GENERATING_IMAGES,
+    "describe_images": GenerationStatus.GENERATING_IMAGES,
+    "persist_image_manifest": GenerationStatus.GENERATING_IMAGES,
+    "image_generate": GenerationStatus.GENERATING_IMAGES,
+    "image_edit": GenerationStatus.GENERATING_IMAGES,
+    "generate_output": GenerationStatus.GENERATING_OUTPUT,
+    "validate_output": GenerationStatus.GENERATING_OUTPUT,
+}
 
 
 def _get_max_inline_preview_bytes() -> int:
@@ -68,6 +127,68 @@ def _get_max_inline_preview_bytes() -> int:
         return DEFAULT_INLINE_PREVIEW_BYTES
 
 
+def _put_latest_progress(
+    queue: asyncio.Queue[ProgressEvent], event: ProgressEvent
+) -> None:
+    """Queue event, dropping any still-unsent event for the same stage.
+
+    Only the newest update per stage reaches the client, so the queue holds
+    at most one event per stage. Never waits: should the queue still be
+    full, the oldest pending event is dropped. Must run on the loop thread.
+    """
+    pending = []
+    while not queue.empty():
+        queued = queue.get_nowait()
+        if queued.status != event.status:
+            pending.append(queued)
+    if queue.maxsize > 0:
+        pending = pending[len(pending) - queue.maxsize + 1 :]
+    for queued in pending:
+        queue.put_nowait(queued)
+    queue.put_nowait(event)
+
+
+def _drain_latest_progress(
+    queue: asyncio.Queue[ProgressEvent], events: list[ProgressEvent]
+) -> list[ProgressEvent]:
+    """Take every queued event and keep only the newest one per stage."""
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    latest: dict[GenerationStatus, ProgressEvent] = {}
+    for event in events:
+        latest.pop(event.status, None)
+        latest[event.status] = event
+    return list(latest.values())
+
+
+def _map_file(path: Path) -> mmap.mmap | bytes:
+    """Map a file read-only so previews encode straight from the page cache."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # Empty files cannot be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _read_pdf_preview(path: Path) -> str:
+    """Base64-encode a PDF without first reading it into a bytes copy."""
+    mapped = _map_file(path)
+    try:
+        return b64encode_ascii(mapped)
+    finally:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+
+def _read_text_preview(path: Path) -> str:
+    """Decode a UTF-8 file straight from its mapping."""
+    mapped = _map_file(path)
+    try:
+        return str(mapped, "utf-8")
+    finally:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+
 class UnifiedGenerationService:
     """
     Unified service for all content generation types with checkpointing.
@@ -82,6 +203,16 @@ class UnifiedGenerationService:
         """Initialize unified generation service."""
         self.storage = storage_service or StorageService()
         self.checkpoint_manager = get_checkpoint_manager()
+        # Workflows hold a thread for minutes; a dedicated pool keeps them
+        # from starving short asyncio.to_thread calls on the default one
+        self._workflow_executor = ThreadPoolExecutor(
+            max_workers=get_settings().generator.workflow_workers,
+            thread_name_prefix="docgen-wf",
+        )
+
+    async def aclose(self) -> None:
+        """Stop the workflow pool, cancelling workflows that have not started."""
+        self._workflow_executor.shutdown(wait=False, cancel_futures=True)
 
     async def generate_document(
         self,
@@ -95,6 +226,7 @@ class UnifiedGenerationService:
         image_model: str = "gemini-2.5-flash-image",
         user_id: Optional[str] = None,
         session_id: Optional[str] = None,
+        inline_preview: bool = False,
     ) -> AsyncIterator:
         """
         Generate a document with checkpointing support.
@@ -109,18 +241,14 @@ class UnifiedGenerationService:
             model: Model name
             user_id: Optional user ID
             session_id: Optional session ID for content reuse
+            inline_preview: Embed the file in the complete event; otherwise
+                clients fetch it from download_url
 
         Yields:
             Progress and completion events
         """
         # Map output_format to unified output_type
-        format_mapping = {
-            "pdf": "article_pdf",
-            "pptx": "presentation_pptx",
-            "markdown": "article_markdown",
-            "pdf_from_pptx": "slide_deck_pdf",
-        }
-        output_type = format_mapping.get(output_format, "article_pdf")
+        output_type = _FORMAT_MAPPING.get(output_format, "article_pdf")
 
         # Build request data
         request_data = {
@@ -145,7 +273,6 @@ class UnifiedGenerationService:
                 progress=10,
                 message="Processing content...",
             )
-            import asyncio
 
             # 1. Get the current event loop
             # The event loop is the core of asyncio - it schedules and runs async tasks.
@@ -156,41 +283,25 @@ class UnifiedGenerationService:
             # This queue acts as a thread-safe communication channel.
             # The synchronous workflow running in a separate thread will put events here,
             # and this async function will read from it.
-            progress_queue: asyncio.Queue[ProgressEvent] = asyncio.Queue()
-
-            workflow_status_map = {
-                "validate_sources": GenerationStatus.PARSING,
-                "resolve_sources": GenerationStatus.PARSING,
-                "extract_sources": GenerationStatus.PARSING,
-                "merge_sources": GenerationStatus.PARSING,
-                "detect_format": GenerationStatus.PARSING,
-                "parse_document_content": GenerationStatus.PARSING,
-                "summarize_sources": GenerationStatus.TRANSFORMING,
-                "build_image_prompt": GenerationStatus.TRANSFORMING,
-                "transform_content": GenerationStatus.TRANSFORMING,
-                "enhance_content": GenerationStatus.TRANSFORMING,
-                "generate_images": GenerationStatus.GENERATING_IMAGES,
-                "describe_images": GenerationStatus.GENERATING_IMAGES,
-                "persist_image_manifest": GenerationStatus.GENERATING_IMAGES,
-                "image_generate": GenerationStatus.GENERATING_IMAGES,
-                "image_edit": GenerationStatus.GENERATING_IMAGES,
-                "generate_output": GenerationStatus.GENERATING_OUTPUT,
-                "validate_output": GenerationStatus.GENERATING_OUTPUT,
-            }
+            # Bounded so a slow client cannot make it grow without limit
+            progress_queue: asyncio.Queue[ProgressEvent] = asyncio.Queue(
+                maxsize=PROGRESS_QUEUE_MAXSIZE
+            )
+
             workflow_progress_base = 30
             workflow_progress_span = 60
 
             # 3. Define the Callback Function
             # This function is passed to the synchronous workflow.
-            # It's called from a worker thread, so it must use `call_soon_threadsafe`
-            # to interact with the main event loop safely.
+            # It's called from a worker thread, so it must hand events to the
+            # main event loop with `call_soon_threadsafe`.
             def workflow_progress(
                 step_number: int,
                 total_steps: int,
                 node_name: str,
                 display_name: str,
             ) -> None:
-                status = workflow_status_map.get(
+                status = _WORKFLOW_STATUS_MAP.get(
                     node_name, GenerationStatus.TRANSFORMING
                 )
                 progress = workflow_progress_base + int(
@@ -204,38 +315,53 @@ class UnifiedGenerationService:
                 )
                 # THREAD SAFETY CRITICAL:
                 # Put the event into the queue so the async loop can process it.
-                loop.call_soon_threadsafe(progress_queue.put_nowait, event)
+                # The put coalesces per stage and never waits, so a slow or
+                # stalled client cannot block the workflow thread.
+                loop.call_soon_threadsafe(_put_latest_progress, progress_queue, event)
 
             # 4. Run the Workflow in a Thread Pool
-            # `run_in_executor(None, ...)` runs the blocking synchronous function
-            # in the default thread pool executor. This prevents blocking the main
+            # `_submit_workflow` runs the blocking synchronous function in the
+            # service's workflow pool. This prevents blocking the main
             # asyncio loop, keeping the server responsive.
-            workflow_future = loop.run_in_executor(
-                None,
-                lambda: run_unified_workflow_with_session(
-                    output_type=output_type,
-                    request_data=request_data,
-                    api_key=api_key,
-                    gemini_api_key=image_api_key,
-                    user_id=user_id,
-                    session_id=session_id,
-                    progress_callback=workflow_progress,
-                ),
+            workflow_future = self._submit_workflow(
+                output_type=output_type,
+                request_data=request_data,
+                api_key=api_key,
+                gemini_api_key=image_api_key,
+                user_id=user_id,
+                session_id=session_id,
+                progress_callback=workflow_progress,
             )
 
             # 5. Monitor Workflow & Stream Progress
-            while True:
-                # If the workflow is done and no more progress events are in queue, stop.
-                if workflow_future.done() and progress_queue.empty():
-                    break
-                try:
-                    # Wait for a progress event from the queue with a short timeout.
-                    # This allows us to frequently check if the workflow has finished.
-                    event = await asyncio.wait_for(progress_queue.get(), timeout=0.2)
-                    yield event
-                except asyncio.TimeoutError:
-                    # No new progress event in 0.2s, loop back to check status.
-                    continue
+            # Wake on whichever comes first, the next progress event or the
+            # end of the workflow, instead of polling on a timer.
+            get_task = asyncio.ensure_future(progress_queue.get())
+            try:
+                while True:
+                    await asyncio.wait(
+                        {get_task, workflow_future},
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if get_task.done():
+                        for event in _drain_latest_progress(
+                            progress_queue, [get_task.result()]
+                        ):
+                            yield event
+                        # Let further updates collect before the next frame,
+                        # unless the workflow finishes first
+                        await asyncio.wait(
+                            {workflow_future}, timeout=PROGRESS_BATCH_SECONDS
+                        )
+                        get_task = asyncio.ensure_future(progress_queue.get())
+                    elif workflow_future.done():
+                        # Each put finishes before the workflow moves on, so
+                        # everything it reported is already queued.
+                        for event in _drain_latest_progress(progress_queue, []):
+                            yield event
+                        break
+            finally:
+                get_task.cancel()
 
             # 6. Get Final Result
             # Await the future to get the return value (or raise exception if it failed).
@@ -269,14 +395,13 @@ class UnifiedGenerationService:
             markdown_content = None
 
             path = Path(output_path)
-            if path.exists():
+            if inline_preview and path.exists():
                 max_preview_bytes = _get_max_inline_preview_bytes()
                 file_size = path.stat().st_size
                 suffix = path.suffix.lower()
                 if suffix == ".pdf":
                     if max_preview_bytes > 0 and file_size <= max_preview_bytes:
-                        with open(path, "rb") as f:
-                            pdf_base64 = base64.b64encode(f.read()).decode("utf-8")
+                        pdf_base64 = _read_pdf_preview(path)
                     else:
                         logger.info(
                             "Skipping inline PDF preview (%s bytes > %s)",
@@ -285,7 +410,7 @@ class UnifiedGenerationService:
                         )
                 elif suffix == ".md":
                     if max_preview_bytes > 0 and file_size <= max_preview_bytes:
-                        markdown_content = path.read_text(encoding="utf-8")
+                        markdown_content = _read_text_preview(path)
                     else:
                         logger.info(
                             "Skipping inline markdown preview (%s bytes > %s)",
@@ -332,6 +457,7 @@ class UnifiedGenerationService:
         model: str = "gemini-2.5-flash",
         user_id: Optional[str] = None,
         session_id: Optional[str] = None,
+        inline_audio: bool = False,
     ) -> AsyncIterator:
         """
         Generate a podcast with checkpointing support.
@@ -347,6 +473,7 @@ class UnifiedGenerationService:
             model: Model name
             user_id: Optional user ID
             session_id: Optional session ID for content reuse
+            inline_audio: Also return the WAV as base64 in the complete event
 
         Yields:
             Progress and completion events
@@ -358,6 +485,7 @@ class UnifiedGenerationService:
             "duration_minutes": duration_minutes,
             "provider": provider,
             "model": model,
+            "inline_audio": inline_audio,
         }
 
         yield PodcastProgressEvent(
@@ -377,15 +505,53 @@ class UnifiedGenerationService:
                         message=f"Reusing content from session (previously: {', '.join(info['outputs_generated'])})",
                     )
 
-            result, session_id = await self._run_workflow_async(
-                output_type="podcast",
-                request_data=request_data,
-                api_key=api_key,
-                gemini_api_key=gemini_api_key,
-                user_id=user_id,
-                session_id=session_id,
+            loop = asyncio.get_running_loop()
+            progress_queue: asyncio.Queue[PodcastProgressEvent] = asyncio.Queue()
+
+            # Called from the workflow thread: node starts, plus one call per
+            # PCM chunk as the TTS response streams in (progress only).
+            def workflow_progress(
+                step_number: int,
+                total_steps: int,
+                node_name: str,
+                display_name: str,
+            ) -> None:
+                if node_name == "podcast_audio_chunk":
+                    event = PodcastProgressEvent(
+                        stage="synthesizing",
+                        percent=min(60 + step_number, 95),
+                        message=f"Synthesizing audio ({step_number} chunks received)",
+                    )
+                else:
+                    event = PodcastProgressEvent(
+                        stage="extracting",
+                        percent=10 + int((step_number / max(total_steps, 1)) * 40),
+                        message=f"STEP {step_number}/{total_steps}: {display_name}",
+                    )
+                loop.call_soon_threadsafe(progress_queue.put_nowait, event)
+
+            workflow_task = asyncio.ensure_future(
+                self._run_workflow_async(
+                    output_type="podcast",
+                    request_data=request_data,
+                    api_key=api_key,
+                    gemini_api_key=gemini_api_key,
+                    user_id=user_id,
+                    session_id=session_id,
+                    progress_callback=workflow_progress,
+                )
             )
 
+            while True:
+                if workflow_task.done() and progress_queue.empty():
+                    break
+                try:
+                    yield await asyncio.wait_for(progress_queue.get(), timeout=0.2)
+                except asyncio.TimeoutError:
+                    continue
+
+            result, session_id = await workflow_task
+
             if result.get("errors"):
                 yield PodcastErrorEvent(
                     message=result["errors"][0],
@@ -394,16 +560,26 @@ class UnifiedGenerationService:
                 return
 
             # Get audio data
-            audio_base64 = result.get("podcast_audio_base64", "")
-            if not audio_base64:
+            audio_data = result.get("podcast_audio_data")
+            if not audio_data:
                 yield PodcastErrorEvent(
                     message="Podcast generation failed - no audio generated",
                     code="no_audio",
                 )
                 return
 
+            # Serve the WAV from storage so clients fetch raw bytes instead
+            # of a base64 copy inside the event stream
+            audio_path = await asyncio.to_thread(
+                self.storage.save_output,
+                wave_bytes(audio_data),
+                "podcast.wav",
+                "audio",
+            )
+
             yield PodcastCompleteEvent(
-                audio_base64=audio_base64,
+                audio_url=self.storage.get_download_url(audio_path),
+                audio_base64=result.get("podcast_audio_base64") or None,
                 title=result.get("podcast_title", "Podcast Episode"),
                 description=result.get("podcast_description", ""),
                 duration_seconds=result.get("podcast_duration_seconds", 0.0),
@@ -450,21 +626,82 @@ class UnifiedGenerationService:
             "model": model,
         }
 
-        yield MindMapProgressEvent(
-            stage="extracting",
-            percent=5,
-            message="Starting mind map generation...",
-        )
+        yield _MINDMAP_START_EVENT
 
         try:
-            result, session_id = await self._run_workflow_async(
-                output_type="mindmap",
-                request_data=request_data,
-                api_key=api_key,
-                user_id=user_id,
-                session_id=session_id,
+            loop = asyncio.get_running_loop()
+            progress_queue: asyncio.Queue[MindMapProgressEvent] = asyncio.Queue()
+
+            # Called from the workflow thread: node starts, plus one call per
+            # main branch as the mind map JSON streams in.
+            def workflow_progress(
+                step_number: int,
+                total_steps: int,
+                node_name: str,
+                display_name: str,
+            ) -> None:
+                if node_name == "mindmap_branch":
+                    event = _MINDMAP_BRANCH_EVENT.model_copy(
+                        update={
+                            "percent": min(50 + step_number * 5, 90),
+                            "message": f"Added branch: {display_name}",
+                        }
+                    )
+                else:
+                    event = _MINDMAP_STEP_EVENT.model_copy(
+                        update={
+                            "percent": 5
+                            + int((step_number / max(total_steps, 1)) * 40),
+                            "message": f"STEP {step_number}/{total_steps}: {display_name}",
+                        }
+                    )
+                loop.call_soon_threadsafe(progress_queue.put_nowait, event)
+
+            workflow_task = asyncio.ensure_future(
+                self._run_workflow_async(
+                    output_type="mindmap",
+                    request_data=request_data,
+                    api_key=api_key,
+                    user_id=user_id,
+                    session_id=session_id,
+                    progress_callback=workflow_progress,
+                )
             )
 
+            # Forward workflow events as they arrive; while none arrive (the
+            # model is still generating), tick the progress bar so the SSE
+            # stream stays warm. Percent never moves backwards.
+            last_event = _MINDMAP_START_EVENT
+            while True:
+                if workflow_task.done() and progress_queue.empty():
+                    break
+                try:
+                    event = await asyncio.wait_for(
+                        progress_queue.get(), timeout=MINDMAP_HEARTBEAT_SECONDS
+                    )
+                    if event.percent < last_event.percent:
+                        event = event.model_copy(
+                            update={"percent": last_event.percent}
+                        )
+                except asyncio.TimeoutError:
+                    if workflow_task.done():
+                        continue
+                    event = last_event.model_copy(
+                        update={
+                            "percent": max(
+                                last_event.percent,
+                                min(
+                                    MINDMAP_HEARTBEAT_MAX_PERCENT,
+                                    last_event.percent + 1,
+                                ),
+                            )
+                        }
+                    )
+                last_event = event
+                yield event
+
+            result, session_id = await workflow_task
+
             if result.get("errors"):
                 yield MindMapErrorEvent(
                     message=result["errors"][0],
@@ -481,6 +718,9 @@ class UnifiedGenerationService:
                 )
                 return
 
+            if result.get("metadata", {}).get("mindmap_cached"):
+                yield _MINDMAP_CACHED_EVENT
+
             # Convert to response format - generate IDs for nodes
             nodes = self._parse_mindmap_node(tree_data.get("nodes", {}))
 
@@ -491,10 +731,12 @@ class UnifiedGenerationService:
                 mode_enum = MindMapMode.SUMMARIZE
 
             yield MindMapCompleteEvent(
-                tree=MindMapTree(
-                    title=tree_data.get("title", "Mind Map"),
-                    summary=tree_data.get("summary", ""),
-                    source_count=result.get("metadata", {}).get("source_count", 1),
+                tree=MindMapTree.model_construct(
+                    title=str(tree_data.get("title") or "Mind Map"),
+                    summary=str(tree_data.get("summary") or ""),
+                    source_count=int(
+                        result.get("metadata", {}).get("source_count", 1)
+                    ),
                     mode=mode_enum,
                     nodes=nodes,
                 ),
@@ -669,41 +911,90 @@ class UnifiedGenerationService:
         session_id: Optional[str] = None,
         progress_callback: Optional[Callable] = None,
     ) -> tuple[UnifiedWorkflowState, str]:
-        """Run the unified workflow asynchronously."""
-        import asyncio
-
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: run_unified_workflow_with_session(
-                output_type=output_type,
-                request_data=request_data,
-                api_key=api_key,
-                gemini_api_key=gemini_api_key,
-                user_id=user_id,
-                session_id=session_id,
-                progress_callback=progress_callback,
-            ),
+        """Run the unified workflow on the workflow thread pool."""
+        return await self._submit_workflow(
+            output_type=output_type,
+            request_data=request_data,
+            api_key=api_key,
+            gemini_api_key=gemini_api_key,
+            user_id=user_id,
+            session_id=session_id,
+            progress_callback=progress_callback,
         )
 
-    def _parse_mindmap_node(self, node_data: dict, prefix: str = "node") -> MindMapNode:
-        """Parse node data into MindMapNode with generated IDs."""
-        node_id = f"{prefix}_{uuid.uuid4().hex[:8]}"
-        label = node_data.get("label", "Node")
-        children = node_data.get("children", [])
-
-        parsed_children = [
-            self._parse_mindmap_node(child, prefix=f"{node_id}")
-            for child in children
-            if isinstance(child, dict)
-        ]
-
-        return MindMapNode(
-            id=node_id,
-            label=label,
-            children=parsed_children if parsed_children else [],
+    def _submit_workflow(self, **workflow_kwargs) -> asyncio.Future:
+        """Start run_unified_workflow_with_session on the workflow pool.
+
+        Submits straight to the executor, with no wrapper closure or copied
+        context: context variables set by the caller are not visible in the
+        workflow thread. Progress callbacks are passed explicitly and the
+        workflow installs them in its own thread.
+        """
+        return asyncio.wrap_future(
+            self._workflow_executor.submit(
+                run_unified_workflow_with_session, **workflow_kwargs
+            )
         )
 
+    def _parse_mindmap_node(
+        self, node_data: dict, prefix: str = "node", dedup: bool = True
+    ) -> MindMapNode:
+        """Parse node data into MindMapNode with generated IDs.
+
+        Fields are coerced here, so nodes are built with model_construct
+        and skip per-node validation; the enclosing event is still validated.
+        Walks the tree with an explicit stack, so depth is not limited by
+        the recursion limit, and numbers nodes in pre-order.
+
+        Args:
+            node_data: Root node dict from the workflow
+            prefix: ID prefix for every node
+            dedup: Share one MindMapNode between identical subtrees. Every
+                child is kept; MindMapTree gives repeated nodes unique IDs
+                when it is serialized.
+        """
+        counter = itertools.count()
+        # Interned subtrees: (label, child keys) -> (small int key, node)
+        subtree_pool: dict[tuple, tuple[int, MindMapNode]] = {}
+
+        def open_frame(data: dict) -> tuple:
+            # (id, label, pending children, parsed children, child keys)
+            return (
+                f"{prefix}_{next(counter):x}",
+                str(data.get("label", "Node")),
+                iter(data.get("children", [])),
+                [],
+                [],
+            )
+
+        stack = [open_frame(node_data)]
+        while True:
+            node_id, label, pending, parsed_children, child_keys = stack[-1]
+            child = next(pending, _END)
+            if child is not _END:
+                if isinstance(child, dict):
+                    stack.append(open_frame(child))
+                continue
+
+            stack.pop()
+            pool_key = (label, tuple(child_keys))
+            pooled = subtree_pool.get(pool_key) if dedup else None
+            if pooled is None:
+                node = MindMapNode.model_construct(
+                    id=node_id,
+                    label=label,
+                    children=parsed_children,
+                )
+                pooled = (len(subtree_pool), node)
+                if dedup:
+                    subtree_pool[pool_key] = pooled
+            subtree_key, node = pooled
+            if not stack:
+                return node
+
+            siblings, sibling_keys = stack[-1][3], stack[-1][4]
+            siblings.append(node)
+            sibling_keys.append(subtree_key)
 
 # Singleton instance
 _unified_service: Optional[UnifiedGenerationService] = None
@@ -715,3 +1006,11 @@ def get_unified_service() -> UnifiedGenerationService:
     if _unified_service is None:
         _unified_service = UnifiedGenerationService()
     return _unified_service
+
+
+async def close_unified_service() -> None:
+    """Shut down the unified generation service if it was created."""
+    global _unified_service
+    if _unified_service is not None:
+        await _unified_service.aclose()
+        _unified_service = None
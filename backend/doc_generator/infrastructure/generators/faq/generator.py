@@ -25,6 +25,11 @@ TAG_GRADIENTS = [
     "slate-gray",
 ]
 
+FAQ_WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Runs of characters not allowed in output filenames
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
 
 class FAQGenerator:
     """Generate FAQ JSON output from structured content."""
@@ -49,7 +54,7 @@ class FAQGenerator:
 
             title = metadata.get("title", "FAQ Document")
             filename = metadata.get("custom_filename", title)
-            safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", filename).strip("_")
+            safe_name = _UNSAFE_NAME_RE.sub("_", filename).strip("_")
             if not safe_name:
                 safe_name = "faq"
             output_path = output_dir / f"{safe_name}.json"
@@ -69,14 +74,14 @@ class FAQGenerator:
                     tags=item.get("tags", []),
                 ))
 
-            # Collect unique tags and assign colors
-            unique_tags = set()
-            for item in items:
-                unique_tags.update(item.tags)
-
+            # Assign colors to tags in order of first appearance
             tag_colors = {}
-            for i, tag in enumerate(sorted(unique_tags)):
-                tag_colors[tag] = TAG_GRADIENTS[i % len(TAG_GRADIENTS)]
+            for item in items:
+                for tag in item.tags:
+                    if tag not in tag_colors:
+                        tag_colors[tag] = TAG_GRADIENTS[
+                            len(tag_colors) % len(TAG_GRADIENTS)
+                        ]
 
             # Build document
             faq_doc = FAQDocument(
@@ -90,11 +95,12 @@ class FAQGenerator:
                 ),
             )
 
-            # Write JSON
-            output_path.write_text(
-                faq_doc.model_dump_json(indent=2),
-                encoding="utf-8",
-            )
+            # Serialize with pydantic's Rust encoder (json.dump with indent
+            # falls back to the pure-Python encoder) and write it buffered
+            with output_path.open(
+                "w", encoding="utf-8", buffering=FAQ_WRITE_BUFFER_BYTES
+            ) as fp:
+                fp.write(faq_doc.model_dump_json(indent=2))
             logger.info(f"FAQ generated successfully: {output_path}")
             return output_path
 
@@ -4,12 +4,19 @@ Markdown generator.
 Writes structured markdown content to a .md file.
 """
 
+import codecs
 from pathlib import Path
 
 from loguru import logger
 
 from ....domain.exceptions import GenerationError
 
+# Spaces and path separators become underscores in output filenames
+_SAFE_NAME_TABLE = str.maketrans({" ": "_", "/": "_"})
+# Characters encoded per write, so a large document is never held twice
+MARKDOWN_WRITE_CHUNK_CHARS = 64 * 1024
+MARKDOWN_WRITE_BUFFER_BYTES = 1024 * 1024
+
 
 class MarkdownGenerator:
     """Generate Markdown output from structured content."""
@@ -35,14 +42,19 @@ class MarkdownGenerator:
 
             title = metadata.get("title", "document")
             filename = metadata.get("custom_filename", title)
-            safe_name = filename.replace(" ", "_").replace("/", "_")
+            safe_name = filename.translate(_SAFE_NAME_TABLE)
             output_path = output_dir / f"{safe_name}.md"
 
             markdown_content = content.get("markdown", content.get("raw_content", ""))
             if not markdown_content:
                 raise GenerationError("No content provided for Markdown generation")
 
-            output_path.write_text(markdown_content, encoding="utf-8")
+            encoder = codecs.getincrementalencoder("utf-8")()
+            with output_path.open("wb", buffering=MARKDOWN_WRITE_BUFFER_BYTES) as fp:
+                step = MARKDOWN_WRITE_CHUNK_CHARS
+                for start in range(0, len(markdown_content), step):
+                    fp.write(encoder.encode(markdown_content[start : start + step]))
+                fp.write(encoder.encode("", final=True))
             logger.info(f"Markdown generated successfully: {output_path}")
             return output_path
         except Exception as e:
@@ -1,6 +1,12 @@
 """LLM providers for document generation."""
 
-from .service import LLMService, get_llm_service
+from .service import LLMService, get_llm_service, normalize_provider
 from .content_generator import LLMContentGenerator, get_content_generator
 
-__all__ = ["LLMService", "LLMContentGenerator", "get_llm_service", "get_content_generator"]
+__all__ = [
+    "LLMService",
+    "LLMContentGenerator",
+    "get_llm_service",
+    "get_content_generator",
+    "normalize_provider",
+]
@@ -16,6 +16,7 @@ from loguru import logger
 
 from ..observability.opik import log_llm_call
 from ..settings import get_settings
+from .service import normalize_provider
 from ...domain.prompts.text.content_generator_prompts import (
     build_blog_from_outline_prompt,
     build_chunk_prompt,
@@ -113,12 +114,9 @@ class LLMContentGenerator:
         self.content_model = None
         
         # Setup content generation client (provider-driven)
-        resolved_provider = (provider or self.settings.llm.content_provider or "openai").lower()
-        if resolved_provider == "google":
-            resolved_provider = "gemini"
-        if resolved_provider == "anthropic":
-            resolved_provider = "claude"
-        self.content_provider = resolved_provider
+        self.content_provider = normalize_provider(
+            provider or self.settings.llm.content_provider or "openai"
+        )
         self.content_model = model or self.settings.llm.content_model or self.settings.llm.model
 
         self._init_content_client()
@@ -4,12 +4,14 @@ LLM service for intelligent content transformation.
 Provides OpenAI and Claude-powered content summarization, slide generation, and enhancement.
 """
 
+import asyncio
 import json
 import os
 import time
-from typing import Optional
+from typing import Iterator, Optional
 
 from loguru import logger
+from pydantic import BaseModel
 
 from ..settings import get_settings
 from ..observability.opik import log_llm_call
@@ -46,6 +48,13 @@ except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI package not available")
 
+try:
+    from openai import AsyncOpenAI
+
+    ASYNC_OPENAI_AVAILABLE = True
+except ImportError:
+    ASYNC_OPENAI_AVAILABLE = False
+
 try:
     from anthropic import Anthropic
 
@@ -54,6 +63,24 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
     logger.warning("Anthropic package not available")
 
+try:
+    from anthropic import AsyncAnthropic
+
+    ASYNC_ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ASYNC_ANTHROPIC_AVAILABLE = False
+
+# Request-facing provider names that map to a different LLMService provider
+_PROVIDER_ALIASES = {"google": "gemini", "anthropic": "claude"}
+
+
+def normalize_provider(provider: str) -> str:
+    """
+    Map a request or settings provider name to the name LLMService expects.
+    """
+    provider = provider.lower()
+    return _PROVIDER_ALIASES.get(provider, provider)
+
 
 class LLMService:
     """
@@ -63,6 +90,12 @@ class LLMService:
     and executive presentation enhancement.
     """
 
+    # Embedding models per provider (Claude has no embeddings API)
+    EMBEDDING_MODELS = {
+        "gemini": "gemini-embedding-001",
+        "openai": "text-embedding-3-small",
+    }
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -94,6 +127,7 @@ class LLMService:
 
         self.model = model
         self.client = None
+        self._async_client = None
         self.provider = None
         self.requested_provider = provider
         self.max_summary_points = max_summary_points
@@ -137,6 +171,145 @@ class LLMService:
         """
         return self.client is not None
 
+    def embed_text(self, text: str) -> Optional[list[float]]:
+        """
+        Embed text with the provider's embedding model.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector, or None if the provider has no embeddings API
+            or the call fails
+        """
+        embedding_model = self.EMBEDDING_MODELS.get(self.provider or "")
+        if not self.is_available() or not embedding_model:
+            return None
+
+        try:
+            if self.provider == "gemini":
+                response = self.client.models.embed_content(
+                    model=embedding_model, contents=text
+                )
+                return list(response.embeddings[0].values)
+            response = self.client.embeddings.create(model=embedding_model, input=text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Embedding failed for {self.provider}: {e}")
+            return None
+
+    def _gemini_request(
+        self, system_msg: str, user_msg: str, json_mode: bool
+    ) -> tuple[str, Optional[object]]:
+        """
+        Build the Gemini prompt and generation config for a call.
+
+        Gemini takes a single prompt, so the system message is inlined.
+        """
+        prompt = user_msg
+        if system_msg:
+            prompt = f"System: {system_msg}\n\nUser: {user_msg}"
+        if json_mode:
+            prompt += "\n\nRespond with valid JSON only."
+        config = None
+        if json_mode and types is not None:
+            config = types.GenerateContentConfig(response_mime_type="application/json")
+        return prompt, config
+
+    def _start_call(self) -> float:
+        """
+        Record usage counters for a call and return its start time.
+        """
+        LLMService._total_calls += 1
+        if self.model:
+            LLMService._models_used.add(self.model)
+        if self.provider:
+            LLMService._providers_used.add(self.provider)
+        logger.opt(colors=True).info(
+            "<cyan>LLM call</cyan> provider={} model={}", self.provider, self.model
+        )
+        return time.perf_counter()
+
+    def _finish_call(
+        self,
+        step: str,
+        prompt: str,
+        response_text: str,
+        start_time: float,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        Record call details and observability for a completed call.
+        """
+        duration_ms = int((time.perf_counter() - start_time) * 1000)
+        LLMService._call_details.append(
+            {
+                "kind": "llm",
+                "step": step,
+                "provider": self.provider,
+                "model": self.model,
+                "duration_ms": duration_ms,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+            }
+        )
+        log_llm_call(
+            name=step,
+            prompt=prompt,
+            response=response_text,
+            provider=self.provider,
+            model=self.model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            duration_ms=duration_ms,
+        )
+        return response_text
+
+    def _openai_kwargs(
+        self,
+        system_msg: str,
+        user_msg: str,
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool,
+        cache_key: Optional[str] = None,
+    ) -> dict:
+        """
+        Build chat completion kwargs for OpenAI.
+
+        A cache_key pins requests sharing a static prefix to the same prompt cache.
+        """
+        kwargs = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg},
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        if cache_key:
+            kwargs["prompt_cache_key"] = cache_key
+        return kwargs
+
+    @staticmethod
+    def _claude_system(system_msg: str, cache_key: Optional[str] = None):
+        """
+        Build the Claude system parameter, marking it cacheable when keyed.
+        """
+        if not cache_key:
+            return system_msg
+        return [
+            {
+                "type": "text",
+                "text": system_msg,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
     def _call_llm(
         self,
         system_msg: str,
@@ -145,6 +318,7 @@ class LLMService:
         temperature: float,
         json_mode: bool = False,
         step: str = "llm_call",
+        cache_key: Optional[str] = None,
     ) -> str:
         """
         Call LLM provider (OpenAI or Claude).
@@ -155,6 +329,8 @@ class LLMService:
             max_tokens: Maximum tokens
             temperature: Temperature
             json_mode: Whether to use JSON mode
+            cache_key: Stable key for the static prompt prefix; enables
+                provider prompt caching (OpenAI cache key, Claude cache_control)
 
         Returns:
             Response text
@@ -164,194 +340,304 @@ class LLMService:
             return ""
 
         try:
-            LLMService._total_calls += 1
-            if self.model:
-                LLMService._models_used.add(self.model)
-            if self.provider:
-                LLMService._providers_used.add(self.provider)
-            logger.opt(colors=True).info(
-                "<cyan>LLM call</cyan> provider={} model={}", self.provider, self.model
-            )
-            start_time = time.perf_counter()
-            input_tokens = None
-            output_tokens = None
+            start_time = self._start_call()
 
             if self.provider == "gemini":
-                prompt = user_msg
-                if system_msg:
-                    prompt = f"System: {system_msg}\n\nUser: {user_msg}"
-                if json_mode:
-                    prompt += "\n\nRespond with valid JSON only."
-                if json_mode and types is not None:
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=prompt,
-                        config=types.GenerateContentConfig(
-                            response_mime_type="application/json"
-                        ),
-                    )
-                else:
-                    response = self.client.models.generate_content(
-                        model=self.model, contents=prompt
-                    )
-                usage = getattr(response, "usage_metadata", None)
-                if usage:
-                    input_tokens = getattr(usage, "prompt_token_count", None)
-                    output_tokens = getattr(usage, "candidates_token_count", None)
-                duration_ms = int((time.perf_counter() - start_time) * 1000)
-                LLMService._call_details.append(
-                    {
-                        "kind": "llm",
-                        "step": step,
-                        "provider": self.provider,
-                        "model": self.model,
-                        "duration_ms": duration_ms,
-                        "input_tokens": input_tokens,
-                        "output_tokens": output_tokens,
-                    }
+                prompt, config = self._gemini_request(system_msg, user_msg, json_mode)
+                response = self.client.models.generate_content(
+                    model=self.model, contents=prompt, config=config
                 )
-                response_text = (response.text or "").strip()
-                log_llm_call(
-                    name=step,
-                    prompt=prompt,
-                    response=response_text,
-                    provider=self.provider,
-                    model=self.model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    duration_ms=duration_ms,
+                usage = getattr(response, "usage_metadata", None)
+                return self._finish_call(
+                    step,
+                    prompt,
+                    (response.text or "").strip(),
+                    start_time,
+                    getattr(usage, "prompt_token_count", None),
+                    getattr(usage, "candidates_token_count", None),
                 )
-                return response_text
             if self.provider == "claude":
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=max_tokens,
                     temperature=temperature,
-                    system=system_msg,
+                    system=self._claude_system(system_msg, cache_key),
                     messages=[{"role": "user", "content": user_msg}],
                 )
-                duration_ms = int((time.perf_counter() - start_time) * 1000)
-                LLMService._call_details.append(
-                    {
-                        "kind": "llm",
-                        "step": step,
-                        "provider": self.provider,
-                        "model": self.model,
-                        "duration_ms": duration_ms,
-                        "input_tokens": input_tokens,
-                        "output_tokens": output_tokens,
-                    }
+                return self._finish_call(
+                    step,
+                    f"{system_msg}\n\n{user_msg}".strip(),
+                    response.content[0].text,
+                    start_time,
                 )
-                response_text = response.content[0].text
-                log_llm_call(
-                    name=step,
-                    prompt=f"{system_msg}\n\n{user_msg}".strip(),
-                    response=response_text,
-                    provider=self.provider,
-                    model=self.model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    duration_ms=duration_ms,
-                )
-                return response_text
             else:  # openai
-                kwargs = {
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_msg},
-                        {"role": "user", "content": user_msg},
-                    ],
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                }
-                if json_mode:
-                    kwargs["response_format"] = {"type": "json_object"}
-                response = self.client.chat.completions.create(**kwargs)
+                response = self.client.chat.completions.create(
+                    **self._openai_kwargs(
+                        system_msg, user_msg, max_tokens, temperature, json_mode, cache_key
+                    )
+                )
                 usage = getattr(response, "usage", None)
-                if usage:
-                    input_tokens = getattr(usage, "prompt_tokens", None)
-                    output_tokens = getattr(usage, "completion_tokens", None)
-                duration_ms = int((time.perf_counter() - start_time) * 1000)
-                LLMService._call_details.append(
-                    {
-                        "kind": "llm",
-                        "step": step,
-                        "provider": self.provider,
-                        "model": self.model,
-                        "duration_ms": duration_ms,
-                        "input_tokens": input_tokens,
-                        "output_tokens": output_tokens,
-                    }
+                return self._finish_call(
+                    step,
+                    f"{system_msg}\n\n{user_msg}".strip(),
+                    response.choices[0].message.content.strip(),
+                    start_time,
+                    getattr(usage, "prompt_tokens", None),
+                    getattr(usage, "completion_tokens", None),
                 )
-                response_text = response.choices[0].message.content.strip()
-                log_llm_call(
-                    name=step,
-                    prompt=f"{system_msg}\n\n{user_msg}".strip(),
-                    response=response_text,
-                    provider=self.provider,
+        except Exception as e:
+            return self._handle_call_error(e, system_msg, user_msg, json_mode)
+
+    async def _call_llm_async(
+        self,
+        system_msg: str,
+        user_msg: str,
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool = False,
+        step: str = "llm_call",
+        cache_key: Optional[str] = None,
+    ) -> str:
+        """
+        Call LLM provider with its native async client.
+
+        Same contract as _call_llm, but awaits the provider SDK directly so
+        no worker thread is held for the duration of the request. Providers
+        without an async client fall back to _call_llm in a thread.
+
+        Returns:
+            Response text
+        """
+        if not self.is_available():
+            return ""
+
+        async_client = self._get_async_client()
+        if async_client is None:
+            return await asyncio.to_thread(
+                self._call_llm,
+                system_msg,
+                user_msg,
+                max_tokens,
+                temperature,
+                json_mode,
+                step,
+                cache_key,
+            )
+
+        try:
+            start_time = self._start_call()
+
+            if self.provider == "gemini":
+                prompt, config = self._gemini_request(system_msg, user_msg, json_mode)
+                response = await async_client.models.generate_content(
+                    model=self.model, contents=prompt, config=config
+                )
+                usage = getattr(response, "usage_metadata", None)
+                return self._finish_call(
+                    step,
+                    prompt,
+                    (response.text or "").strip(),
+                    start_time,
+                    getattr(usage, "prompt_token_count", None),
+                    getattr(usage, "candidates_token_count", None),
+                )
+            if self.provider == "claude":
+                response = await async_client.messages.create(
                     model=self.model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    duration_ms=duration_ms,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=self._claude_system(system_msg, cache_key),
+                    messages=[{"role": "user", "content": user_msg}],
+                )
+                return self._finish_call(
+                    step,
+                    f"{system_msg}\n\n{user_msg}".strip(),
+                    response.content[0].text,
+                    start_time,
                 )
-                return response_text
+            response = await async_client.chat.completions.create(
+                **self._openai_kwargs(
+                    system_msg, user_msg, max_tokens, temperature, json_mode, cache_key
+                )
+            )
+            usage = getattr(response, "usage", None)
+            return self._finish_call(
+                step,
+                f"{system_msg}\n\n{user_msg}".strip(),
+                response.choices[0].message.content.strip(),
+                start_time,
+                getattr(usage, "prompt_tokens", None),
+                getattr(usage, "completion_tokens", None),
+            )
         except Exception as e:
-            error_str = str(e)
-            # Check if this is a Gemini 503 overload error - try fallback models
-            if (
-                self.provider == "gemini"
-                and "503" in error_str
-                and "overloaded" in error_str.lower()
-            ):
-                fallback_models = [
-                    "gemini-2.5-pro",
-                    "gemini-2.0-flash",
-                    "gemini-1.5-flash",
-                ]
-                # Remove current model from fallback list if present
-                fallback_models = [m for m in fallback_models if m != self.model]
-
-                for fallback_model in fallback_models:
-                    try:
-                        logger.warning(
-                            f"Model {self.model} overloaded, trying fallback: {fallback_model}"
-                        )
-                        prompt = user_msg
-                        if system_msg:
-                            prompt = f"System: {system_msg}\n\nUser: {user_msg}"
-                        if json_mode:
-                            prompt += "\n\nRespond with valid JSON only."
-
-                        if json_mode and types is not None:
-                            response = self.client.models.generate_content(
-                                model=fallback_model,
-                                contents=prompt,
-                                config=types.GenerateContentConfig(
-                                    response_mime_type="application/json"
-                                ),
-                            )
-                        else:
-                            response = self.client.models.generate_content(
-                                model=fallback_model, contents=prompt
-                            )
-
-                        response_text = (response.text or "").strip()
-                        if response_text:
-                            logger.info(f"Fallback model {fallback_model} succeeded")
-                            LLMService._models_used.add(fallback_model)
-                            return response_text
-                    except Exception as fallback_error:
-                        logger.warning(
-                            f"Fallback model {fallback_model} also failed: {fallback_error}"
-                        )
-                        continue
-
-                logger.error(
-                    f"All Gemini models failed (overloaded). Original error: {e}"
+            return await asyncio.to_thread(
+                self._handle_call_error, e, system_msg, user_msg, json_mode
+            )
+
+    async def _call_llm_structured_async(
+        self,
+        system_msg: str,
+        user_msg: str,
+        max_tokens: int,
+        temperature: float,
+        schema: type[BaseModel],
+        step: str = "llm_call",
+    ) -> Optional[BaseModel]:
+        """
+        Call LLM provider with native structured output for a Pydantic schema.
+
+        Gemini and OpenAI constrain the response to the schema's JSON schema;
+        Claude is forced to call a tool whose input schema is the model.
+
+        Returns:
+            Validated schema instance, or None if structured output is not
+            available or the call failed (callers fall back to JSON mode)
+        """
+        if not self.is_available():
+            return None
+        async_client = self._get_async_client()
+        if async_client is None or (self.provider == "gemini" and types is None):
+            return None
+
+        json_schema = schema.model_json_schema()
+        try:
+            start_time = self._start_call()
+
+            if self.provider == "gemini":
+                prompt, _ = self._gemini_request(system_msg, user_msg, False)
+                response = await async_client.models.generate_content(
+                    model=self.model,
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_json_schema=json_schema,
+                    ),
                 )
-            else:
-                logger.error(f"LLM call failed: {e}")
-            return ""
+                usage = getattr(response, "usage_metadata", None)
+                response_text = self._finish_call(
+                    step,
+                    prompt,
+                    (response.text or "").strip(),
+                    start_time,
+                    getattr(usage, "prompt_token_count", None),
+                    getattr(usage, "candidates_token_count", None),
+                )
+                return schema.model_validate_json(response_text)
+            if self.provider == "claude":
+                response = await async_client.messages.create(
+                    model=self.model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_msg,
+                    messages=[{"role": "user", "content": user_msg}],
+                    tools=[
+                        {
+                            "name": schema.__name__,
+                            "description": "Return the response in this structure.",
+                            "input_schema": json_schema,
+                        }
+                    ],
+                    tool_choice={"type": "tool", "name": schema.__name__},
+                )
+                data = next(
+                    block.input for block in response.content if block.type == "tool_use"
+                )
+                self._finish_call(
+                    step,
+                    f"{system_msg}\n\n{user_msg}".strip(),
+                    json.dumps(data),
+                    start_time,
+                )
+                return schema.model_validate(data)
+            kwargs = self._openai_kwargs(
+                system_msg, user_msg, max_tokens, temperature, False
+            )
+            kwargs["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": schema.__name__, "schema": json_schema},
+            }
+            response = await async_client.chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            response_text = self._finish_call(
+                step,
+                f"{system_msg}\n\n{user_msg}".strip(),
+                response.choices[0].message.content.strip(),
+                start_time,
+                getattr(usage, "prompt_tokens", None),
+                getattr(usage, "completion_tokens", None),
+            )
+            return schema.model_validate_json(response_text)
+        except Exception as e:
+            logger.warning(
+                f"Structured output failed for {self.provider}, falling back to JSON mode: {e}"
+            )
+            return None
+
+    def _get_async_client(self):
+        """
+        Get (lazily creating) the provider's async client, if it has one.
+        """
+        if self._async_client is not None:
+            return self._async_client
+        if self.provider == "gemini":
+            self._async_client = self.client.aio
+        elif self.provider == "openai" and ASYNC_OPENAI_AVAILABLE:
+            self._async_client = AsyncOpenAI(api_key=self.openai_api_key)
+        elif self.provider == "claude" and ASYNC_ANTHROPIC_AVAILABLE:
+            self._async_client = AsyncAnthropic(api_key=self.claude_api_key)
+        return self._async_client
+
+    def _handle_call_error(
+        self, error: Exception, system_msg: str, user_msg: str, json_mode: bool
+    ) -> str:
+        """
+        Handle a failed call, retrying overloaded Gemini calls on fallback models.
+
+        Returns:
+            Response text from a fallback model, or "" if nothing succeeded
+        """
+        error_str = str(error)
+        # Check if this is a Gemini 503 overload error - try fallback models
+        if (
+            self.provider == "gemini"
+            and "503" in error_str
+            and "overloaded" in error_str.lower()
+        ):
+            fallback_models = [
+                "gemini-2.5-pro",
+                "gemini-2.0-flash",
+                "gemini-1.5-flash",
+            ]
+            # Remove current model from fallback list if present
+            fallback_models = [m for m in fallback_models if m != self.model]
+
+            prompt, config = self._gemini_request(system_msg, user_msg, json_mode)
+            for fallback_model in fallback_models:
+                try:
+                    logger.warning(
+                        f"Model {self.model} overloaded, trying fallback: {fallback_model}"
+                    )
+                    response = self.client.models.generate_content(
+                        model=fallback_model, contents=prompt, config=config
+                    )
+
+                    response_text = (response.text or "").strip()
+                    if response_text:
+                        logger.info(f"Fallback model {fallback_model} succeeded")
+                        LLMService._models_used.add(fallback_model)
+                        return response_text
+                except Exception as fallback_error:
+                    logger.warning(
+                        f"Fallback model {fallback_model} also failed: {fallback_error}"
+                    )
+                    continue
+
+            logger.error(
+                f"All Gemini models failed (overloaded). Original error: {error}"
+            )
+        else:
+            logger.error(f"LLM call failed: {error}")
+        return ""
 
     def generate(
         self,
@@ -394,6 +680,84 @@ class LLMService:
             step=step,
         )
 
+    def stream_generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        json_mode: bool = True,
+        step: str = "generate",
+    ) -> Iterator[str]:
+        """
+        Generate a response for a single prompt, yielding text as it streams.
+
+        Same contract as generate. If the stream cannot be opened, the
+        batch error handling (including Gemini fallback models) runs and its
+        result is yielded as a single chunk.
+
+        Yields:
+            Response text chunks (nothing if unavailable)
+        """
+        if not self.is_available():
+            return
+
+        settings = get_settings()
+        resolved_max_tokens = (
+            max_tokens
+            if max_tokens is not None
+            else settings.llm.content_max_tokens
+        )
+        resolved_temperature = (
+            temperature
+            if temperature is not None
+            else settings.llm.content_temperature
+        )
+
+        start_time = self._start_call()
+        chunks: list[str] = []
+        logged_prompt = prompt
+        try:
+            if self.provider == "gemini":
+                logged_prompt, config = self._gemini_request("", prompt, json_mode)
+                stream = self.client.models.generate_content_stream(
+                    model=self.model, contents=logged_prompt, config=config
+                )
+                for chunk in stream:
+                    if chunk.text:
+                        chunks.append(chunk.text)
+                        yield chunk.text
+            elif self.provider == "claude":
+                with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=resolved_max_tokens,
+                    temperature=resolved_temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                ) as stream:
+                    for text in stream.text_stream:
+                        chunks.append(text)
+                        yield text
+            else:  # openai
+                stream = self.client.chat.completions.create(
+                    stream=True,
+                    **self._openai_kwargs(
+                        "", prompt, resolved_max_tokens, resolved_temperature, json_mode
+                    ),
+                )
+                for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text:
+                        chunks.append(text)
+                        yield text
+        except Exception as e:
+            if chunks:
+                logger.error(f"LLM stream interrupted: {e}")
+            else:
+                response_text = self._handle_call_error(e, "", prompt, json_mode)
+                if response_text:
+                    chunks.append(response_text)
+                    yield response_text
+        self._finish_call(step, logged_prompt, "".join(chunks), start_time)
+
     def _safe_json_load(self, text: str) -> Optional[object]:
         """
         Invoked by: src/doc_generator/infrastructure/llm/service.py
@@ -105,6 +105,22 @@ def log_node_end(node_name: str, success: bool = True, details: str = "") -> Non
     )
 
 
+def log_node_progress(node_name: str, count: int, detail: str) -> None:
+    """
+    Report incremental progress from inside a running node.
+
+    Emitted through the same progress callback as node starts, with the
+    running count in place of the step number and zero total steps.
+
+    Args:
+        node_name: Name of the reporting sub-step (e.g., "mindmap_branch")
+        count: Number of items completed so far
+        detail: Description of the item just completed
+    """
+    _emit_progress(count, 0, node_name, detail)
+    logger.debug(f"{node_name} #{count}: {detail}")
+
+
 def log_subsection(title: str) -> None:
     """
     Log a subsection within a node.
@@ -8,7 +8,7 @@ type validation and environment variable support.
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 import yaml
 from dotenv import load_dotenv
@@ -176,6 +176,11 @@ class GeneratorSettings(BaseSettings):
     default_output_format: str = "pdf"
     max_retries: int = Field(default=3, ge=1, le=10)
     reuse_cache_by_default: bool = True
+    # fdatasync uploads before reporting success (off: uploads are re-sent
+    # by the client if lost, so the extra flush is usually not worth it)
+    durable_uploads: bool = False
+    # Threads for generation workflows, kept apart from the default pool
+    workflow_workers: int = Field(default=4, ge=1)
     # Audience type: technical (default), executive, client, educational
     audience: str = "technical"
 
@@ -240,6 +245,59 @@ class ImageGenerationSettings(BaseSettings):
     default_height: int = 768
 
 
+class IdeaCanvasSettings(BaseSettings):
+    """Idea Canvas service settings."""
+
+    # Worker threads for blocking LLM/PDF calls (None = min(32, cpu_count * 4))
+    max_workers: Optional[int] = Field(default=None, ge=1)
+    # Worker processes for rendering report PDFs (None = cpu_count // 2, min 1)
+    pdf_workers: Optional[int] = Field(default=None, ge=1)
+
+    # Where sessions live: "memory" (single worker) or "redis" (shared by workers)
+    session_store: Literal["memory", "redis"] = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    session_ttl_seconds: int = 86400
+    session_max_count: int = Field(default=10_000, ge=1)  # in-memory store only
+
+    # Compact older Q&A turns once the rendered history exceeds this budget
+    history_token_budget: int = 6000
+    history_keep_recent_turns: int = Field(default=4, ge=1)
+
+    # Exact-match cache for regenerated reports and mind maps
+    report_cache_enabled: bool = True
+    report_cache_size: int = 256
+    report_cache_ttl_seconds: int = 3600
+
+    # Semantic cache for first-question and approach generation
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = Field(default=0.92, ge=0.0, le=1.0)
+    semantic_cache_size: int = 256  # entries per namespace
+    semantic_cache_ttl_seconds: int = 3600
+
+
+class MindMapSettings(BaseSettings):
+    """Mind map generation settings."""
+
+    # Exact-match cache of trees for identical content/mode/model
+    cache_size: int = Field(default=256, ge=1)
+    cache_ttl_seconds: int = 3600
+
+    # Reuse trees for lightly edited content based on embedding similarity
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = Field(default=0.97, ge=0.0, le=1.0)
+    semantic_cache_chars: int = Field(default=2048, ge=1)  # leading chars embedded
+
+    # Upper bound on source tokens placed in the prompt (0 disables)
+    max_content_tokens: int = Field(default=12000, ge=0)
+
+
+class PodcastSettings(BaseSettings):
+    """Podcast generation settings."""
+
+    # Concurrent Gemini TTS calls per process (each holds a worker thread)
+    max_concurrent_tts: int = Field(default=4, ge=1)
+
+
 class Settings(BaseSettings):
     """
     Main application settings.
@@ -257,6 +315,9 @@ class Settings(BaseSettings):
     image_generation: ImageGenerationSettings = Field(
         default_factory=ImageGenerationSettings
     )
+    idea_canvas: IdeaCanvasSettings = Field(default_factory=IdeaCanvasSettings)
+    mindmap: MindMapSettings = Field(default_factory=MindMapSettings)
+    podcast: PodcastSettings = Field(default_factory=PodcastSettings)
 
     class Config:
         env_prefix = "DOC_GENERATOR_"
@@ -346,6 +407,15 @@ def _merge_config(yaml_config: dict) -> dict:
     if "image_generation" in yaml_config:
         merged["image_generation"] = yaml_config["image_generation"]
 
+    if "idea_canvas" in yaml_config:
+        merged["idea_canvas"] = yaml_config["idea_canvas"]
+
+    if "mindmap" in yaml_config:
+        merged["mindmap"] = yaml_config["mindmap"]
+
+    if "podcast" in yaml_config:
+        merged["podcast"] = yaml_config["podcast"]
+
     return merged
 
 
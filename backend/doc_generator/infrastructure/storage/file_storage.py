@@ -1,13 +1,45 @@
 """Storage service for uploads and outputs."""
 
+import json
 import secrets
 import time
+from functools import lru_cache
 from pathlib import Path
 
 from loguru import logger
 
 from ..settings import get_settings
 
+# Sidecar written next to each upload so metadata survives restarts
+UPLOAD_META_FILENAME = ".meta.json"
+UPLOAD_META_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=UPLOAD_META_CACHE_SIZE)
+def _get_upload_meta(base_output_dir: str, file_id: str) -> dict:
+    """Load metadata for file_id from its sidecar, or from its source dir.
+
+    Uploads saved before sidecars existed only report filename and path.
+    Misses raise instead of returning None so they are not cached.
+    """
+    file_dir = Path(base_output_dir) / file_id
+    try:
+        meta = json.loads((file_dir / UPLOAD_META_FILENAME).read_text())
+        # Only the filename is stored, so the sidecar stays valid if the
+        # base directory is relative or moves
+        meta["path"] = file_dir / "source" / meta["filename"]
+        return meta
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    source_dir = file_dir / "source"
+    if source_dir.exists():
+        files = list(source_dir.iterdir())
+        if files:
+            return {"filename": files[0].name, "path": files[0], "file_id": file_id}
+
+    raise FileNotFoundError(f"Upload not found: {file_id}")
+
 
 class StorageService:
     """Manages uploads and generated outputs with organized folder structure.
@@ -49,9 +81,6 @@ class StorageService:
         self.base_output_dir.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Track upload metadata
-        self._uploads: dict[str, dict] = {}
-
     def _get_file_dir(self, file_id: str) -> Path:
         """
         Get the directory for a specific file_id.
@@ -109,14 +138,13 @@ class StorageService:
         storage_path.write_bytes(content)
         logger.info(f"Saved upload: {storage_path}")
 
-        self._uploads[file_id] = {
+        meta = {
             "filename": filename,
             "mime_type": mime_type,
-            "path": storage_path,
             "file_id": file_id,
-            "dirs": dirs,
             "created_at": time.time(),
         }
+        (dirs["root"] / UPLOAD_META_FILENAME).write_text(json.dumps(meta))
 
         return file_id
 
@@ -133,18 +161,7 @@ class StorageService:
             FileNotFoundError: If file_id not found
         Invoked by: src/doc_generator/infrastructure/api/services/generation.py, src/doc_generator/infrastructure/storage/file_storage.py, tests/api/test_storage_service.py
         """
-        if file_id in self._uploads:
-            return self._uploads[file_id]["path"]
-
-        # Try to find on disk if not in memory (after server restart)
-        file_dir = self._get_file_dir(file_id)
-        source_dir = file_dir / "source"
-        if source_dir.exists():
-            files = list(source_dir.iterdir())
-            if files:
-                return files[0]
-
-        raise FileNotFoundError(f"Upload not found: {file_id}")
+        return _get_upload_meta(str(self.base_output_dir), file_id)["path"]
 
     def get_file_dirs(self, file_id: str) -> dict[str, Path]:
         """Get directory paths for a file_id.
@@ -156,10 +173,6 @@ class StorageService:
             Dict with paths for root, source, images, pdf, pptx
         Invoked by: src/doc_generator/infrastructure/storage/file_storage.py
         """
-        if file_id in self._uploads:
-            return self._uploads[file_id]["dirs"]
-
-        # Recreate dirs structure if needed
         return self._ensure_file_dirs(file_id)
 
     def get_output_dir(self, file_id: str, output_format: str) -> Path:
@@ -213,18 +226,7 @@ class StorageService:
             FileNotFoundError: If file_id not found
         Invoked by: (no references found)
         """
-        if file_id not in self._uploads:
-            # Try to reconstruct from disk
-            try:
-                path = self.get_upload_path(file_id)
-                return {
-                    "filename": path.name,
-                    "path": path,
-                    "file_id": file_id,
-                }
-            except FileNotFoundError:
-                raise FileNotFoundError(f"Upload not found: {file_id}")
-        return self._uploads[file_id].copy()
+        return dict(_get_upload_meta(str(self.base_output_dir), file_id))
 
     def get_download_url(self, output_path: Path) -> str:
         """Generate download URL for output file.
@@ -267,13 +269,12 @@ class StorageService:
         """
         import shutil
 
-        if file_id in self._uploads:
-            del self._uploads[file_id]
-
         file_dir = self._get_file_dir(file_id)
         if file_dir.exists():
             shutil.rmtree(file_dir)
             logger.info(f"Cleaned up: {file_dir}")
+        # lru_cache cannot drop one key; cleanups are rare enough to clear all
+        _get_upload_meta.cache_clear()
 
     def cleanup_expired_uploads(self, max_age_seconds: int = 3600) -> int:
         """Remove uploads older than max_age.
@@ -288,9 +289,13 @@ class StorageService:
         now = time.time()
         expired = []
 
-        for file_id, metadata in self._uploads.items():
-            if now - metadata["created_at"] > max_age_seconds:
-                expired.append(file_id)
+        for meta_path in self.base_output_dir.glob(f"f_*/{UPLOAD_META_FILENAME}"):
+            try:
+                created_at = json.loads(meta_path.read_text())["created_at"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if now - created_at > max_age_seconds:
+                expired.append(meta_path.parent.name)
 
         for file_id in expired:
             self.cleanup_upload(file_id)
@@ -0,0 +1,26 @@
+"""
+Base64 helpers for large binary payloads (audio, PDF previews).
+
+Uses pybase64's SIMD encoder when installed and falls back to the C
+``binascii`` codec otherwise. Output is identical either way.
+"""
+
+from __future__ import annotations
+
+import binascii
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+
+def b64encode_ascii(data) -> str:
+    """Base64-encode a bytes-like object to a str.
+
+    pybase64 writes the str directly; the fallback has to copy the encoded
+    bytes into a new str.
+    """
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return binascii.b2a_base64(data, newline=False).decode("ascii")
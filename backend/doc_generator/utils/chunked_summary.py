@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from loguru import logger
 
-from ..infrastructure.llm import LLMService
+from ..infrastructure.llm import LLMService, normalize_provider
 from ..infrastructure.settings import get_settings
 
 
@@ -76,9 +76,7 @@ def summarize_content_chunked(
     chunk_limit = settings.llm.content_chunk_char_limit
     single_limit = settings.llm.content_single_chunk_char_limit
 
-    provider_name = provider.lower()
-    if provider_name == "google":
-        provider_name = "gemini"
+    provider_name = normalize_provider(provider)
 
     llm = LLMService(
         api_key=api_key,
@@ -58,6 +58,8 @@ def extract_image_content(
 ) -> Tuple[str, dict]:
     """
     Extract text and description from an image using the selected LLM provider.
+
+    The provider is expected to be normalized already (see normalize_provider).
     """
     if not api_key:
         raise ParseError("Missing API key for image understanding.")
@@ -65,9 +67,7 @@ def extract_image_content(
     if not path.exists():
         raise ParseError(f"File not found: {path}")
 
-    provider_name = provider.lower()
-    if provider_name == "google":
-        provider_name = "gemini"
+    provider_name = provider
 
     mime_type = MIME_TYPES.get(path.suffix.lower(), "image/png")
     image_bytes = path.read_bytes()
@@ -4,52 +4,115 @@ Helpers for podcast workflow nodes.
 
 from __future__ import annotations
 
-import json
-import wave
-from io import BytesIO
-from typing import Any
+import struct
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Iterator
 
+import orjson
 from loguru import logger
 
+from ..infrastructure.api.services.common.json_utils import (
+    extract_code_block,
+    extract_json_from_text,
+)
+from ..infrastructure.settings import get_settings
+from .base64_utils import b64encode_ascii
+
+TTS_MODEL = "gemini-2.5-flash-preview-tts"
+# Distinct API keys whose Gemini clients are kept for reuse
+TTS_CLIENT_CACHE_SIZE = 32
+
+
+def _wav_header(
+    data_size: int, channels: int = 1, rate: int = 24000, sample_width: int = 2
+) -> bytes:
+    """Build the 44-byte RIFF/WAVE header for PCM data of the given size."""
+    if (channels, rate, sample_width) == (1, 24000, 2):
+        # Gemini TTS output: only the two size fields differ between calls
+        header = bytearray(_TTS_WAV_HEADER)
+        struct.pack_into("<I", header, 4, 36 + data_size)
+        struct.pack_into("<I", header, 40, data_size)
+        return bytes(header)
+    return _pack_wav_header(data_size, channels, rate, sample_width)
+
+
+def _pack_wav_header(
+    data_size: int, channels: int, rate: int, sample_width: int
+) -> bytes:
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        rate,
+        rate * channels * sample_width,
+        channels * sample_width,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
+
+
+# Header template for Gemini TTS audio (24 kHz mono 16-bit PCM)
+_TTS_WAV_HEADER = _pack_wav_header(0, 1, 24000, 2)
+
 
 def wave_bytes(
     pcm: bytes, channels: int = 1, rate: int = 24000, sample_width: int = 2
 ) -> bytes:
     """Convert PCM audio data to WAV format bytes."""
-    with BytesIO() as wav_buffer:
-        with wave.open(wav_buffer, "wb") as wav_file:
-            wav_file.setnchannels(channels)
-            wav_file.setsampwidth(sample_width)
-            wav_file.setframerate(rate)
-            wav_file.writeframes(pcm)
-        return wav_buffer.getvalue()
+    return _wav_header(len(pcm), channels, rate, sample_width) + pcm
+
+
+def wav_base64(
+    pcm: bytes, channels: int = 1, rate: int = 24000, sample_width: int = 2
+) -> str:
+    """Base64-encode PCM audio as a WAV file without building the WAV bytes.
+
+    The header plus the first PCM byte is 45 bytes (a multiple of 3), so the
+    rest of the PCM encodes on its own, straight from a memoryview, with no
+    padding between the two parts.
+    """
+    header = _wav_header(len(pcm), channels, rate, sample_width)
+    # The large part is encoded once and copied once (into the result);
+    # joining encoded bytes first would copy it again before decoding
+    return b64encode_ascii(header + pcm[:1]) + b64encode_ascii(memoryview(pcm)[1:])
 
 
 def build_tts_prompt(dialogue: list[dict], speakers: list[dict]) -> str:
-    """Build the TTS prompt from dialogue."""
-    lines = []
-    for entry in dialogue:
-        speaker = entry.get("speaker", "Speaker")
-        text = entry.get("text", "")
-        if text.strip():
-            lines.append(f"{speaker}: {text}")
-    return "\n".join(lines)
+    """Build the TTS prompt from dialogue.
 
+    Opens with the multi-speaker instruction line naming the configured
+    speakers; entries without a speaker are voiced by the first speaker.
+    """
+    names = [speaker["name"] for speaker in speakers]
+    default_speaker = names[0] if names else "Speaker"
+    header = f"TTS the following conversation between {' and '.join(names)}:"
+    body = "\n".join(
+        f"{entry.get('speaker') or default_speaker}: {text}"
+        for entry in dialogue
+        if (text := entry.get("text", "")).strip()
+    )
+    return f"{header}\n{body}" if names else body
 
-def synthesize_with_retry(
-    tts_prompt: str,
-    speakers: list[dict],
-    api_key: str,
-    max_retries: int = 3,
-) -> bytes:
-    """Generate audio using Gemini TTS with retry logic."""
-    import random
-    import time
 
+@lru_cache(maxsize=TTS_CLIENT_CACHE_SIZE)
+def _get_tts_client(api_key: str):
+    """Return a Gemini client for api_key, reused across podcasts."""
     from google import genai
-    from google.genai import types
 
-    client = genai.Client(api_key=api_key)
+    return genai.Client(api_key=api_key)
+
+
+def _tts_config(speakers: list[dict]):
+    """Build the multi-speaker Gemini TTS request config."""
+    from google.genai import types
 
     speaker_voice_configs = []
     for speaker in speakers:
@@ -65,20 +128,57 @@ def synthesize_with_retry(
             )
         )
 
-    last_error: Exception | None = None
+    return types.GenerateContentConfig(
+        response_modalities=["AUDIO"],
+        speech_config=types.SpeechConfig(
+            multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
+                speaker_voice_configs=speaker_voice_configs
+            )
+        ),
+    )
+
+
+def _tts_retry_delay(error: Exception, attempt: int, max_retries: int) -> float | None:
+    """Return the backoff before retrying a TTS error, or None to give up."""
+    import random
+
+    error_str = str(error).lower()
+    retryable = any(
+        p in error_str for p in ["500", "internal", "overload", "unavailable"]
+    )
+    if not retryable or attempt >= max_retries - 1:
+        return None
+
+    delay = (2**attempt) * (1 + random.uniform(0, 0.5))
+    logger.warning(
+        "TTS error (attempt {}/{}): {}. Retrying in {:.1f}s...".format(
+            attempt + 1,
+            max_retries,
+            str(error)[:100],
+            delay,
+        )
+    )
+    return delay
+
+
+def synthesize_with_retry(
+    tts_prompt: str,
+    speakers: list[dict],
+    api_key: str,
+    max_retries: int = 3,
+) -> bytes:
+    """Generate audio using Gemini TTS with retry logic."""
+    import time
+
+    client = _get_tts_client(api_key)
+    config = _tts_config(speakers)
+
     for attempt in range(max_retries):
         try:
             response = client.models.generate_content(
-                model="gemini-2.5-flash-preview-tts",
+                model=TTS_MODEL,
                 contents=tts_prompt,
-                config=types.GenerateContentConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        multi_speaker_voice_config=types.MultiSpeakerVoiceConfig(
-                            speaker_voice_configs=speaker_voice_configs
-                        )
-                    ),
-                ),
+                config=config,
             )
 
             audio_data = response.candidates[0].content.parts[0].inline_data.data
@@ -87,87 +187,162 @@ def synthesize_with_retry(
             return audio_data
 
         except Exception as e:
-            last_error = e
-            error_str = str(e).lower()
+            delay = _tts_retry_delay(e, attempt, max_retries)
+            if delay is None:
+                raise
+            time.sleep(delay)
 
-            retryable = any(
-                p in error_str for p in ["500", "internal", "overload", "unavailable"]
-            )
+    raise RuntimeError("TTS generation failed unexpectedly")
 
-            if retryable and attempt < max_retries - 1:
-                delay = (2**attempt) * (1 + random.uniform(0, 0.5))
-                logger.warning(
-                    "TTS error (attempt {}/{}): {}. Retrying in {:.1f}s...".format(
-                        attempt + 1,
-                        max_retries,
-                        str(e)[:100],
-                        delay,
-                    )
-                )
-                time.sleep(delay)
-            else:
+
+def stream_synthesis(
+    tts_prompt: str,
+    speakers: list[dict],
+    api_key: str,
+    max_retries: int = 3,
+) -> Iterator[bytes]:
+    """Stream PCM audio chunks from Gemini TTS as they are generated.
+
+    Errors are retried like ``synthesize_with_retry`` until the first chunk
+    arrives; after that a failure is raised, since the caller has already
+    consumed part of the audio.
+    """
+    import time
+
+    client = _get_tts_client(api_key)
+    config = _tts_config(speakers)
+
+    for attempt in range(max_retries):
+        started = False
+        try:
+            for chunk in client.models.generate_content_stream(
+                model=TTS_MODEL,
+                contents=tts_prompt,
+                config=config,
+            ):
+                if not chunk.candidates or not chunk.candidates[0].content:
+                    continue
+                for part in chunk.candidates[0].content.parts or []:
+                    inline_data = getattr(part, "inline_data", None)
+                    if inline_data and inline_data.data:
+                        started = True
+                        yield inline_data.data
+            if attempt > 0:
+                logger.info(f"TTS succeeded on attempt {attempt + 1}")
+            return
+
+        except Exception as e:
+            delay = None if started else _tts_retry_delay(e, attempt, max_retries)
+            if delay is None:
                 raise
+            time.sleep(delay)
 
-    if last_error:
-        raise last_error
     raise RuntimeError("TTS generation failed unexpectedly")
 
 
+class _TTSRequestPool:
+    """Share one TTS call between concurrent requests for the same audio.
+
+    Each request joins the pool immediately. The first caller for a given
+    prompt, voice set and key runs the synthesis; callers that arrive while
+    it is in flight wait on the same future instead of paying for their own
+    round-trip. Distinct requests are capped at ``max_concurrent`` calls.
+    Only the caller that runs the synthesis receives streamed chunks.
+    """
+
+    def __init__(self, max_concurrent: int | None = None):
+        self._lock = threading.Lock()
+        self._pending: dict[tuple, Future] = {}
+        self._slots = threading.BoundedSemaphore(
+            max_concurrent or get_settings().podcast.max_concurrent_tts
+        )
+
+    def synthesize(
+        self,
+        tts_prompt: str,
+        speakers: list[dict],
+        api_key: str,
+        on_chunk: Callable[[bytes], None] | None = None,
+    ) -> bytes:
+        voices = tuple(
+            (speaker["name"], speaker.get("voice", "Kore")) for speaker in speakers
+        )
+        key = (TTS_MODEL, api_key, voices, tts_prompt)
+
+        with self._lock:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._pending[key] = future
+
+        if not leader:
+            logger.info("Joining in-flight TTS request")
+            return future.result()
+
+        try:
+            with self._slots:
+                if on_chunk is None:
+                    audio_data = synthesize_with_retry(tts_prompt, speakers, api_key)
+                else:
+                    chunks = []
+                    for chunk in stream_synthesis(tts_prompt, speakers, api_key):
+                        on_chunk(chunk)
+                        chunks.append(chunk)
+                    audio_data = b"".join(chunks)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(audio_data)
+            return audio_data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+_tts_pool: _TTSRequestPool | None = None
+_tts_pool_lock = threading.Lock()
+
+
+def synthesize_pooled(
+    tts_prompt: str,
+    speakers: list[dict],
+    api_key: str,
+    on_chunk: Callable[[bytes], None] | None = None,
+) -> bytes:
+    """Synthesize audio, sharing the call with identical in-flight requests.
+
+    When on_chunk is given, audio is streamed and each PCM chunk is passed
+    to it as it arrives.
+    """
+    global _tts_pool
+    if _tts_pool is None:
+        with _tts_pool_lock:
+            if _tts_pool is None:
+                _tts_pool = _TTSRequestPool()
+    return _tts_pool.synthesize(tts_prompt, speakers, api_key, on_chunk)
+
+
 def extract_json(text: str) -> dict[str, Any] | None:
-    """Extract JSON object from text."""
+    """Extract JSON object from text.
+
+    Bare JSON (or the body of a leading code fence) is parsed with orjson
+    in one pass. Otherwise decoding starts at the first '{' with the
+    C-level ``raw_decode``, so text around the object is ignored.
+    """
     if not text:
         return None
 
-    def _parse_candidate(candidate: str) -> dict[str, Any] | None:
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = extract_code_block(stripped) or stripped
+    if stripped.startswith("{"):
         try:
-            parsed = json.loads(candidate)
+            parsed = orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+        else:
             return parsed if isinstance(parsed, dict) else None
-        except json.JSONDecodeError:
-            return None
-
-    direct = _parse_candidate(text)
-    if direct is not None:
-        return direct
-
-    cleaned = text.strip()
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    cleaned = cleaned.strip()
-
-    cleaned_parsed = _parse_candidate(cleaned)
-    if cleaned_parsed is not None:
-        return cleaned_parsed
-
-    start_idx = cleaned.find("{")
-    if start_idx == -1:
-        return None
-
-    brace_count = 0
-    in_string = False
-    escape_next = False
-
-    for i in range(start_idx, len(cleaned)):
-        ch = cleaned[i]
-        if escape_next:
-            escape_next = False
-            continue
-        if ch == "\\":
-            escape_next = True
-            continue
-        if ch == '"' and not escape_next:
-            in_string = not in_string
-            continue
-        if in_string:
-            continue
-        if ch == "{":
-            brace_count += 1
-        elif ch == "}":
-            brace_count -= 1
-            if brace_count == 0:
-                return _parse_candidate(cleaned[start_idx : i + 1])
-
-    return None
+    parsed = extract_json_from_text(stripped)
+    return parsed if isinstance(parsed, dict) else None
@@ -11,6 +11,9 @@ from ..domain.content_types import ContentFormat
 from ..infrastructure.settings import get_settings
 from ..application.unified_state import UnifiedWorkflowState
 
+# Placed between sources when merging them into one text payload
+SOURCE_SEPARATOR = "\n\n---\n\n"
+
 
 def coerce_source_dict(source: object) -> dict:
     """Normalize source models (dict or Pydantic) into a plain dict."""
@@ -72,7 +75,7 @@ def merge_markdown_sources(parsed_blocks: list[dict]) -> str:
         if source and source != "text":
             header += f"\n\nSource: {source}"
         sections.append(f"{header}\n\n{content}")
-    return "\n\n---\n\n".join(sections)
+    return SOURCE_SEPARATOR.join(sections)
 
 
 def resolve_upload_path(storage, file_id: str) -> Path | None:
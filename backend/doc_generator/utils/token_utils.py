@@ -0,0 +1,102 @@
+"""
+Token counting helpers for prompt budgets.
+
+Uses tiktoken's cl100k_base encoding when installed. Otherwise estimates
+roughly four ASCII characters per token and one token per non-ASCII
+character, which keeps CJK-heavy text from overshooting the budget.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+ASCII_CHARS_PER_TOKEN = 4
+# Characters scanned per step when locating the estimated cut point
+_SCAN_BLOCK_CHARS = 4096
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the encoding on first use (it may be downloaded); None if unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # The encoding file could not be loaded
+        return None
+
+
+def _estimate_tokens(text: str) -> int:
+    if text.isascii():
+        return -(-len(text) // ASCII_CHARS_PER_TOKEN)
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return non_ascii + -(-(len(text) - non_ascii) // ASCII_CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate) the tokens in text."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _estimate_tokens(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Return the longest prefix of text that fits in max_tokens.
+
+    Returns text itself when it already fits. Work stops at the cut, so the
+    cost follows the budget rather than the length of text.
+    """
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        # Encode block by block and stop at the block that crosses the
+        # budget, so oversized text is never encoded past the cut
+        used = 0
+        start = 0
+        while start < len(text):
+            block = text[start : start + _SCAN_BLOCK_CHARS]
+            tokens = encoding.encode(block, disallowed_special=())
+            if used + len(tokens) > max_tokens:
+                return text[:start] + encoding.decode(tokens[: max_tokens - used])
+            used += len(tokens)
+            start += len(block)
+        return text
+
+    if len(text) <= max_tokens or (
+        text.isascii() and len(text) <= max_tokens * ASCII_CHARS_PER_TOKEN
+    ):
+        return text
+
+    used = 0
+    start = 0
+    while start < len(text):
+        block = text[start : start + _SCAN_BLOCK_CHARS]
+        block_tokens = _estimate_tokens(block)
+        if used + block_tokens > max_tokens:
+            break
+        used += block_tokens
+        start += len(block)
+    else:
+        return text
+
+    # Finish inside the block that crosses the budget
+    ascii_run = 0
+    for index in range(start, len(text)):
+        if ord(text[index]) > 127:
+            cost = 1
+        else:
+            ascii_run += 1
+            cost = 1 if ascii_run % ASCII_CHARS_PER_TOKEN == 1 else 0
+        if used + cost > max_tokens:
+            return text[:index]
+        used += cost
+    return text
@@ -387,6 +387,8 @@ export default function GeneratePage() {
             max_summary_points: 5,
             enable_image_generation: enableImageGeneration,
           },
+          // PDFs preview from download_url; markdown is rendered from text
+          inline_preview: outputType === "article_markdown",
         },
         contentApiKey,
         enableImageGeneration ? effectiveImageKey : undefined,
@@ -425,6 +427,7 @@ export default function GeneratePage() {
             enable_image_generation: enableImageGeneration,
           },
           cache: DEFAULT_CACHE_OPTIONS,
+          inline_preview: secondaryFormat === "markdown",
         };
 
         // Trigger secondary generation in parallel
@@ -1096,6 +1099,11 @@ export default function GeneratePage() {
                   combinedOutputType={combinedOutputType}
                   secondaryPdfBase64={secondaryPdfBase64}
                   secondaryMarkdownContent={secondaryMarkdownContent}
+                  secondaryDownloadUrl={
+                    secondaryDownloadUrl && !secondaryDownloadUrl.startsWith("http")
+                      ? getApiUrl(secondaryDownloadUrl)
+                      : secondaryDownloadUrl
+                  }
                   isSecondaryGenerating={isSecondaryGenerating}
                 />
               )}
@@ -16,6 +16,7 @@ export function MindMapProgress({ stage, progress, message }: MindMapProgressPro
     extracting: "Extracting Content",
     analyzing: "Analyzing Structure",
     generating: "Generating Mind Map",
+    cached: "Reusing Mind Map",
     complete: "Complete",
   };
 
@@ -23,6 +24,7 @@ export function MindMapProgress({ stage, progress, message }: MindMapProgressPro
     extracting: "Reading and processing your sources...",
     analyzing: "Understanding the content structure...",
     generating: "Creating the mind map visualization...",
+    cached: "Found a mind map for this exact content...",
     complete: "Your mind map is ready!",
   };
 
@@ -50,6 +52,7 @@ export function MindMapProgress({ stage, progress, message }: MindMapProgressPro
             const isComplete =
               (stage === "analyzing" && i === 0) ||
               (stage === "generating" && i <= 1) ||
+              (stage === "cached") ||
               (stage === "complete");
 
             return (
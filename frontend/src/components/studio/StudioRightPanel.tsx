@@ -58,6 +58,7 @@ interface StudioRightPanelProps {
   // Secondary generation data (for combined types)
   secondaryPdfBase64?: string | null;
   secondaryMarkdownContent?: string | null;
+  secondaryDownloadUrl?: string | null;
   isSecondaryGenerating?: boolean;
 }
 
@@ -84,6 +85,7 @@ export function StudioRightPanel({
   combinedOutputType,
   secondaryPdfBase64,
   secondaryMarkdownContent,
+  secondaryDownloadUrl,
   isSecondaryGenerating,
 }: StudioRightPanelProps) {
   const [isFullscreen, setIsFullscreen] = useState(false);
@@ -744,9 +746,9 @@ export function StudioRightPanel({
 
     // Dual preview for Presentation (PPTX + PDF)
     if (combinedOutputType === "presentation" && state === "success") {
-      // Use secondaryPdfBase64 and secondaryPdfObjectUrl for the PDF preview tab
-      const hasPdf = secondaryPdfBase64 || secondaryPdfObjectUrl;
-      const effectivePdfPreviewUrl = secondaryPdfObjectUrl;
+      // Inline PDFs are opt-in; otherwise preview straight from the download URL
+      const effectivePdfPreviewUrl = secondaryPdfObjectUrl || secondaryDownloadUrl || null;
+      const hasPdf = secondaryPdfBase64 || effectivePdfPreviewUrl;
       const hasPptx = downloadUrl;
 
       if (hasPdf || hasPptx) {
@@ -910,7 +912,7 @@ export function StudioRightPanel({
 
       const handleDownloadAudio = () => {
         const link = document.createElement("a");
-        link.href = `data:audio/wav;base64,${podcastResult.audioBase64}`;
+        link.href = podcastResult.audioSrc;
         link.download = `${podcastResult.title.replace(/[^a-zA-Z0-9]/g, '_')}.wav`;
         document.body.appendChild(link);
         link.click();
@@ -942,7 +944,7 @@ export function StudioRightPanel({
             <audio
               controls
               className="w-full h-12"
-              src={`data:audio/wav;base64,${podcastResult.audioBase64}`}
+              src={podcastResult.audioSrc}
             >
               Your browser does not support the audio element.
             </audio>
@@ -1325,8 +1327,8 @@ export function StudioRightPanel({
       {isFullscreen && (() => {
         // Determine which PDF URL to use for fullscreen based on combined type and tab
         let fullscreenUrl = pdfPreviewUrl;
-        if (combinedOutputType === "presentation" && dualPreviewTab === "secondary" && secondaryPdfObjectUrl) {
-          fullscreenUrl = secondaryPdfObjectUrl;
+        if (combinedOutputType === "presentation" && dualPreviewTab === "secondary" && (secondaryPdfObjectUrl || secondaryDownloadUrl)) {
+          fullscreenUrl = secondaryPdfObjectUrl || secondaryDownloadUrl || null;
         }
         return fullscreenUrl ? (
           <div className="fixed inset-0 z-50 bg-black/80 flex items-center justify-center p-4">
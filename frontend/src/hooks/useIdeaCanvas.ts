@@ -10,6 +10,7 @@ import {
   CanvasQuestion,
   CanvasEvent,
   isCanvasReadyEvent,
+  isCanvasReadyWithQuestionEvent,
   isCanvasQuestionEvent,
   isCanvasProgressEvent,
   isCanvasCompleteEvent,
@@ -87,6 +88,12 @@ export function useIdeaCanvas(): UseIdeaCanvasResult {
       setSessionId(event.session_id);
       setCanvas(event.canvas);
       setState("ready");
+    } else if (isCanvasReadyWithQuestionEvent(event)) {
+      setSessionId(event.session_id);
+      setCurrentQuestion(event.question);
+      setCanvas(event.canvas);
+      setState("ready");
+      setProgressMessage(null);
     } else if (isCanvasQuestionEvent(event)) {
       setCurrentQuestion(event.question);
       setCanvas(event.canvas);
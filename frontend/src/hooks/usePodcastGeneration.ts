@@ -4,6 +4,7 @@
 
 import { useState, useCallback } from "react";
 import { generatePodcast, GeneratePodcastOptions } from "@/lib/api/podcast";
+import { getApiUrl } from "@/config/api";
 import {
   PodcastRequest,
   PodcastEvent,
@@ -24,7 +25,8 @@ export interface PodcastProgressState {
 export interface PodcastResult {
   title: string;
   description: string;
-  audioBase64: string;
+  /** Playable source: the download URL, or a data URL for inline audio */
+  audioSrc: string;
   script: Array<{ speaker: string; text: string }>;
   durationSeconds: number;
 }
@@ -49,6 +51,14 @@ const initialProgress: PodcastProgressState = {
   message: undefined,
 };
 
+function resolveAudioSrc(event: PodcastCompleteEvent): string {
+  if (event.audio_base64) {
+    return `data:audio/wav;base64,${event.audio_base64}`;
+  }
+  const url = event.audio_url ?? "";
+  return url.startsWith("/") ? getApiUrl(url) : url;
+}
+
 export function usePodcastGeneration(): UsePodcastGenerationResult {
   const [state, setState] = useState<PodcastGenerationState>("idle");
   const [progress, setProgress] = useState<PodcastProgressState>(initialProgress);
@@ -68,7 +78,7 @@ export function usePodcastGeneration(): UsePodcastGenerationResult {
       setResult({
         title: event.title,
         description: event.description,
-        audioBase64: event.audio_base64,
+        audioSrc: resolveAudioSrc(event),
         script: event.script,
         durationSeconds: event.duration_seconds,
       });
@@ -92,6 +92,13 @@ export interface CanvasReadyEvent {
   canvas: CanvasState;
 }
 
+export interface CanvasReadyWithQuestionEvent {
+  type: "ready_with_question";
+  session_id: string;
+  question: CanvasQuestion;
+  canvas: CanvasState;
+}
+
 export interface CanvasQuestionEvent {
   type: "question";
   question: CanvasQuestion;
@@ -117,6 +124,7 @@ export interface CanvasErrorEvent {
 
 export type CanvasEvent =
   | CanvasReadyEvent
+  | CanvasReadyWithQuestionEvent
   | CanvasQuestionEvent
   | CanvasProgressEvent
   | CanvasCompleteEvent
@@ -128,6 +136,12 @@ export function isCanvasReadyEvent(event: CanvasEvent): event is CanvasReadyEven
   return event.type === "ready";
 }
 
+export function isCanvasReadyWithQuestionEvent(
+  event: CanvasEvent
+): event is CanvasReadyWithQuestionEvent {
+  return event.type === "ready_with_question";
+}
+
 export function isCanvasQuestionEvent(event: CanvasEvent): event is CanvasQuestionEvent {
   return event.type === "question";
 }
@@ -25,7 +25,7 @@ export interface MindMapRequest {
 
 export interface MindMapProgressEvent {
   type: "progress";
-  stage: "extracting" | "analyzing" | "generating" | "complete";
+  stage: "extracting" | "analyzing" | "generating" | "cached" | "complete";
   percent: number;
   message?: string;
 }
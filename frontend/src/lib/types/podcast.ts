@@ -32,6 +32,7 @@ export interface PodcastRequest {
   model: string;
   speakers: SpeakerConfig[];
   duration_minutes: number;
+  inline_audio?: boolean;
 }
 
 // SSE Event types
@@ -46,7 +47,8 @@ export interface PodcastCompleteEvent {
   type: "complete";
   title: string;
   description: string;
-  audio_base64: string;
+  audio_url?: string | null;
+  audio_base64?: string | null;
   script: Array<{ speaker: string; text: string }>;
   duration_seconds: number;
 }
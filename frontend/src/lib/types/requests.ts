@@ -60,6 +60,7 @@ export interface GenerateRequest {
   image_model: string;
   preferences: Preferences;
   cache: CacheOptions;
+  inline_preview?: boolean;
 }
 
 export const DEFAULT_PREFERENCES: Preferences = {
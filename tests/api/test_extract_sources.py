@@ -0,0 +1,98 @@
+"""Tests for the source extraction workflow node."""
+
+import threading
+import time
+
+from doc_generator.application.nodes import extract_sources
+
+
+def _state(sources: list[dict]) -> dict:
+    return {"request_data": {}, "resolved_sources": sources, "metadata": {}}
+
+
+class TestExtractSourcesNode:
+    """Test extraction of resolved sources into content blocks."""
+
+    def test_keeps_source_order_and_skips_empty(self):
+        state = extract_sources.extract_sources_node(
+            _state(
+                [
+                    {"type": "text", "content": " first "},
+                    {"type": "text", "content": "   "},
+                    {"type": "url", "url": ""},
+                    {"type": "text", "content": "second"},
+                ]
+            )
+        )
+
+        assert [block["content"] for block in state["content_blocks"]] == ["first", "second"]
+        assert state["metadata"]["source_count"] == 2
+
+    def test_extracts_sources_concurrently(self, monkeypatch):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_extract(source, provider_name, model, api_key):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return {"title": source["content"], "source": "text", "content": source["content"]}
+
+        monkeypatch.setattr(extract_sources, "_extract_source", slow_extract)
+        state = extract_sources.extract_sources_node(
+            _state([{"type": "text", "content": str(i)} for i in range(4)])
+        )
+
+        assert [block["content"] for block in state["content_blocks"]] == ["0", "1", "2", "3"]
+        assert peak > 1
+
+    def test_no_valid_sources_records_error(self):
+        state = extract_sources.extract_sources_node(_state([{"type": "text", "content": ""}]))
+
+        assert state["errors"] == ["No valid sources provided"]
+
+    def test_failed_source_does_not_discard_others(self, monkeypatch):
+        def flaky_extract(source, provider_name, model, api_key):
+            if source["content"] == "bad":
+                raise RuntimeError("fetch failed")
+            return {"title": "t", "source": "text", "content": source["content"]}
+
+        monkeypatch.setattr(extract_sources, "_extract_source", flaky_extract)
+        state = extract_sources.extract_sources_node(
+            _state([{"type": "text", "content": c} for c in ("good", "bad", "also good")])
+        )
+
+        assert [block["content"] for block in state["content_blocks"]] == ["good", "also good"]
+        assert "errors" not in state
+
+    def test_all_sources_failing_records_error(self, monkeypatch):
+        def failing_extract(source, provider_name, model, api_key):
+            raise RuntimeError("fetch failed")
+
+        monkeypatch.setattr(extract_sources, "_extract_source", failing_extract)
+        state = extract_sources.extract_sources_node(
+            _state([{"type": "text", "content": "a"}, {"type": "text", "content": "b"}])
+        )
+
+        assert state["errors"] == ["Content extraction failed: fetch failed"]
+
+    def test_reuses_file_parsers(self, tmp_path):
+        paths = []
+        for name in ("a.md", "b.md"):
+            path = tmp_path / name
+            path.write_text(f"# {name}\n\nBody")
+            paths.append(path)
+
+        extract_sources._get_file_parser.cache_clear()
+        state = extract_sources.extract_sources_node(
+            _state([{"type": "file", "file_path": str(path)} for path in paths])
+        )
+
+        assert len(state["content_blocks"]) == 2
+        info = extract_sources._get_file_parser.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
@@ -0,0 +1,645 @@
+"""Tests for idea canvas service."""
+
+import asyncio
+import json
+
+import orjson
+import pytest
+from doc_generator.infrastructure.api.schemas.idea_canvas import (
+    CanvasQuestionLLM,
+    CanvasTemplate,
+    QuestionOption,
+)
+from doc_generator.infrastructure.api.services import idea_canvas
+from doc_generator.infrastructure.api.services.idea_canvas import (
+    CanvasSession,
+    IdeaCanvasService,
+    InMemorySessionStore,
+    RefinementCoalescer,
+)
+
+
+def _refinement(approach_id: str) -> dict:
+    return {
+        "approach_index": 0,
+        "element_id": "task_1",
+        "element_type": "task",
+        "refinement_answer": "Use Postgres",
+        "current_approach": {"id": approach_id, "name": "A", "mermaidCode": "", "tasks": []},
+    }
+
+
+@pytest.fixture
+def canvas_service():
+    """Create a canvas service with one session and a stubbed LLM call."""
+    service = IdeaCanvasService()
+    service._store.save(
+        CanvasSession(
+            session_id="sess_test",
+            idea="Build a todo app",
+            template=CanvasTemplate.WEB_APP,
+            provider="gemini",
+            model="gemini-2.5-flash",
+        )
+    )
+    service.llm_calls = []
+
+    def fake_llm(**kwargs):
+        service.llm_calls.append(kwargs["step_name"])
+        return json.dumps(
+            {
+                "updates": [
+                    {"index": 1, "approach": {"id": "updated_1"}},
+                    {"index": 0, "approach": {"id": "updated_0"}},
+                ]
+            }
+        )
+
+    service._call_llm_with_fallback = fake_llm
+    return service
+
+
+class TestRefineApproachesBatch:
+    """Test batched approach refinement."""
+
+    def test_results_follow_request_order(self, canvas_service):
+        results = canvas_service.refine_approaches_batch(
+            "sess_test", "key", [_refinement("a"), _refinement("b")]
+        )
+        assert [r["id"] for r in results] == ["updated_0", "updated_1"]
+        assert canvas_service.llm_calls == ["refine_approaches_batch"]
+
+    def test_missing_update_keeps_original(self, canvas_service):
+        results = canvas_service.refine_approaches_batch(
+            "sess_test", "key", [_refinement("a"), _refinement("b"), _refinement("c")]
+        )
+        assert results[2]["id"] == "c"
+
+    def test_unknown_session_raises(self, canvas_service):
+        with pytest.raises(ValueError):
+            canvas_service.refine_approaches_batch(
+                "missing", "key", [_refinement("a"), _refinement("b")]
+            )
+
+    def test_coalescer_merges_concurrent_requests(self, canvas_service):
+        coalescer = RefinementCoalescer(canvas_service, window_seconds=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                coalescer.refine("sess_test", "key", _refinement("a")),
+                coalescer.refine("sess_test", "key", _refinement("b")),
+            )
+
+        results = asyncio.run(run())
+        assert [r["id"] for r in results] == ["updated_0", "updated_1"]
+        assert canvas_service.llm_calls == ["refine_approaches_batch"]
+
+    def test_followers_survive_cancelled_leader(self, canvas_service):
+        coalescer = RefinementCoalescer(canvas_service, window_seconds=0.05)
+
+        async def run():
+            leader = asyncio.ensure_future(
+                coalescer.refine("sess_test", "key", _refinement("a"))
+            )
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(
+                coalescer.refine("sess_test", "key", _refinement("b"))
+            )
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await asyncio.wait_for(follower, timeout=5)
+
+        assert asyncio.run(run())["id"] == "updated_1"
+
+    def test_waiters_without_result_fail(self, canvas_service):
+        canvas_service.refine_approaches_batch = lambda *args: [{"id": "only"}]
+        coalescer = RefinementCoalescer(canvas_service, window_seconds=0.01)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(
+                    coalescer.refine("sess_test", "key", _refinement("a")),
+                    coalescer.refine("sess_test", "key", _refinement("b")),
+                    return_exceptions=True,
+                ),
+                timeout=5,
+            )
+
+        first, second = asyncio.run(run())
+        assert first == {"id": "only"}
+        assert isinstance(second, RuntimeError)
+
+
+class TestExtractJson:
+    """Test JSON extraction from free-form LLM output."""
+
+    def test_extracts_object_surrounded_by_text(self):
+        service = IdeaCanvasService()
+        text = 'Here you go:\n```json\n{"question": "Why {now}?", "n": {"a": 1}}\n```'
+        assert service._extract_json(text) == {"question": "Why {now}?", "n": {"a": 1}}
+
+    def test_skips_invalid_candidates(self):
+        service = IdeaCanvasService()
+        assert service._extract_json('{oops} then {"ok": true}') == {"ok": True}
+
+    def test_returns_none_without_object(self):
+        service = IdeaCanvasService()
+        assert service._extract_json("no json here") is None
+        assert service._extract_json("") is None
+
+
+
+class TestStripCodeFence:
+    """Test removal of code fences wrapping LLM responses."""
+
+    def test_strips_markdown_fence_keeping_inner_blocks(self):
+        text = "```markdown\n# Plan\n```python\nx = 1\n```\nDone\n```"
+        assert idea_canvas._strip_code_fence(text) == "# Plan\n```python\nx = 1\n```\nDone"
+
+    def test_strips_truncated_json_fence(self):
+        assert idea_canvas._strip_code_fence('```json\n{"a": 1') == '{"a": 1'
+
+    def test_leaves_unfenced_text(self):
+        assert idea_canvas._strip_code_fence("  # Plan\n```sql\nSELECT 1\n```") == (
+            "# Plan\n```sql\nSELECT 1\n```"
+        )
+
+class TestCanvasSession:
+    """Test canvas session tree bookkeeping."""
+
+    def test_match_option_by_id_or_label(self):
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        session.add_question(
+            "Which stack?",
+            "q_1",
+            [QuestionOption(id="opt_1", label="React"), QuestionOption(id="opt_2", label="Vue")],
+        )
+        assert session.match_option("opt_2") == "opt_2"
+        assert session.match_option("React") == "opt_1"
+        assert session.match_option("Svelte") is None
+
+        session.add_answer("React", "a_1", "opt_1")
+        assert session.match_option("React") is None
+
+    def test_history_records_current_question(self):
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        session.add_question("First?", "q_1")
+        session.add_turn(session.current_question_label, "yes")
+        session.add_answer("yes", "a_1")
+        session.add_question("Second?", "q_2")
+        session.add_turn(session.current_question_label, "no")
+
+        assert [item["question"] for item in session.conversation_history] == ["First?", "Second?"]
+        assert session.history_text == "\nQ1: First?\nA1: yes\n\nQ2: Second?\nA2: no\n"
+        assert session.history_text.startswith(session.prompt_buffer[0])
+
+    def test_get_state_reused_until_session_changes(self):
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        session.add_question("First?", "q_1")
+        state = session.get_state()
+        assert session.get_state() is state
+
+        session.add_answer("yes", "a_1")
+        answered = session.get_state()
+        assert answered is not state
+
+        session.is_complete = True
+        completed = session.get_state()
+        assert completed is not answered
+        assert completed.is_complete
+
+    def test_nodes_built_from_flat_graph(self):
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        session.add_question("First?", "q_1", [QuestionOption(id="opt_1", label="A")])
+        session.add_answer("A", "a_1", "opt_1")
+        session.add_question("Second?", "q_2")
+
+        root = session.nodes
+        assert [child.id for child in root.children] == ["q_1", "q_2"]
+        answer = root.children[0].children[0]
+        assert answer.id == "a_1"
+        assert answer.selected_option_id == "opt_1"
+        assert [opt.id for opt in answer.options] == ["opt_1"]
+        assert session.graph.parent_idx == [-1, 0, 1, 0]
+
+    def test_round_trips_through_dict(self):
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.WEB_APP, "gemini", "m")
+        session.add_question("First?", "q_1", [QuestionOption(id="opt_1", label="A")])
+        session.add_turn(session.current_question_label, "A")
+        session.add_answer("A", "a_1", "opt_1")
+        session.add_question("Second?", "q_2", [QuestionOption(id="opt_2", label="B")])
+
+        restored = CanvasSession.from_dict(orjson.loads(orjson.dumps(session.to_dict())))
+
+        assert restored.get_state() == session.get_state()
+        assert restored.history_text == session.history_text
+        assert restored.history_digest == session.history_digest
+        assert restored.match_option("B") == "opt_2"
+        assert restored.last_report_markdown is None
+
+    def test_decision_tree_reused_until_tree_changes(self, canvas_service):
+        session = canvas_service.get_session("sess_test")
+        session.add_question("First?", "q_1")
+        tree = canvas_service._build_decision_tree_markdown(session)
+        assert tree.startswith("## Decision Tree")
+        assert canvas_service._build_decision_tree_markdown(session) is tree
+
+        session.add_answer("yes", "a_1")
+        updated = canvas_service._build_decision_tree_markdown(session)
+        assert updated != tree
+        assert "yes" in updated
+
+
+class TestHistoryCompaction:
+    """Test prompt history compaction for long sessions."""
+
+    class _FakeLLM:
+        def __init__(self):
+            self.calls = []
+
+        async def _call_llm_async(self, system_prompt, user_prompt, *args):
+            self.calls.append(user_prompt)
+            return "- wants a web UI"
+
+    def _long_session(self, turns: int) -> CanvasSession:
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        for i in range(turns):
+            session.add_turn(f"Question {i}?", "x" * 4000)
+        return session
+
+    def test_compacts_older_turns_keeping_recent(self, canvas_service):
+        session = self._long_session(8)
+        llm = self._FakeLLM()
+
+        asyncio.run(canvas_service._compact_history(session, llm))
+
+        assert len(llm.calls) == 1
+        assert "Question 0?" in llm.calls[0]
+        assert "Question 7?" not in llm.calls[0]
+        assert len(session.prompt_buffer) == 5
+        assert session.prompt_buffer[0].startswith("\nSummary of earlier answers (before Q5)")
+        assert session.history_text == "".join(session.prompt_buffer)
+        assert len(session.conversation_history) == 8
+        assert session.full_history_text.startswith("\nQ1: Question 0?\nA1: ")
+        assert "\nQ8: Question 7?\n" in session.full_history_text
+
+    def test_skips_history_under_budget(self, canvas_service):
+        session = self._long_session(2)
+        llm = self._FakeLLM()
+
+        asyncio.run(canvas_service._compact_history(session, llm))
+
+        assert llm.calls == []
+        assert len(session.prompt_buffer) == 2
+
+
+class TestGeminiFallback:
+    """Test model fallback with backoff and per-model cooldown."""
+
+    @pytest.fixture
+    def overloaded(self, monkeypatch):
+        """Make every model but gemini-3-pro-preview fail with a 503."""
+        calls = []
+        sleeps = []
+
+        class FakeService:
+            def __init__(self, model):
+                self.model = model
+
+            def is_available(self):
+                return True
+
+            def _call_llm(self, *args):
+                calls.append(self.model)
+                if self.model != "gemini-3-pro-preview":
+                    raise RuntimeError("503 UNAVAILABLE")
+                return "ok"
+
+            async def _call_llm_async(self, *args):
+                return self._call_llm(*args)
+
+        monkeypatch.setattr(
+            idea_canvas, "_get_llm_service", lambda provider, model, key: FakeService(model)
+        )
+        monkeypatch.setattr(idea_canvas.time, "sleep", sleeps.append)
+
+        async def fake_async_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(idea_canvas.asyncio, "sleep", fake_async_sleep)
+        monkeypatch.setattr(idea_canvas, "_model_overloaded_until", {})
+        return calls, sleeps
+
+    def _call(self):
+        return IdeaCanvasService()._call_llm_with_fallback(
+            provider="gemini",
+            system_prompt="s",
+            user_prompt="u",
+            max_tokens=10,
+            temperature=0.0,
+            json_mode=False,
+            step_name="test",
+        )
+
+    def test_backs_off_between_models(self, overloaded):
+        calls, sleeps = overloaded
+        assert self._call() == "ok"
+        assert calls[-1] == "gemini-3-pro-preview"
+        assert len(sleeps) == len(calls) - 1
+        assert sleeps[0] < sleeps[-1] <= 2.2
+
+    def test_skips_recently_overloaded_models(self, overloaded):
+        calls, _ = overloaded
+        self._call()
+        calls.clear()
+        assert self._call() == "ok"
+        assert calls == ["gemini-3-pro-preview"]
+
+    def test_unavailable_provider_skips_all_models(self, overloaded, monkeypatch):
+        calls, sleeps = overloaded
+        monkeypatch.setattr(
+            idea_canvas,
+            "_get_llm_service",
+            lambda provider, model, key: idea_canvas.LLMService(provider="none"),
+        )
+        assert self._call() == ""
+        assert calls == [] and sleeps == []
+
+    def test_fallback_leaves_cached_services_untouched(self, overloaded, monkeypatch):
+        services = {}
+
+        def cached_service(provider, model, key):
+            return services.setdefault(model, overloaded_service(provider, model, key))
+
+        overloaded_service = idea_canvas._get_llm_service
+        monkeypatch.setattr(idea_canvas, "_get_llm_service", cached_service)
+
+        assert self._call() == "ok"
+        assert all(service.model == model for model, service in services.items())
+
+    def test_async_path_falls_back(self, overloaded):
+        calls, sleeps = overloaded
+        result = asyncio.run(
+            IdeaCanvasService()._call_llm_with_fallback_async(
+                provider="gemini",
+                system_prompt="s",
+                user_prompt="u",
+                max_tokens=10,
+                temperature=0.0,
+                json_mode=False,
+                step_name="test",
+            )
+        )
+        assert result == "ok"
+        assert calls[-1] == "gemini-3-pro-preview"
+        assert len(sleeps) == len(calls) - 1
+
+
+def _as_async(fake_llm):
+    """Wrap a fake LLM call for the async fallback path."""
+
+    async def call(**kwargs):
+        return fake_llm(**kwargs)
+
+    return call
+
+
+class TestMindmapCache:
+    """Test reuse of generated mind maps for unchanged sessions."""
+
+    def test_regeneration_reuses_cached_mindmap(self, canvas_service):
+        def fake_llm(**kwargs):
+            canvas_service.llm_calls.append(kwargs["step_name"])
+            return json.dumps({"title": "Todo", "nodes": {"id": "root", "label": "Todo"}})
+
+        canvas_service._call_llm_with_fallback_async = _as_async(fake_llm)
+
+        first = asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+        second = asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+
+        assert second == first
+        assert canvas_service.llm_calls == ["generate_report_for_mindmap", "generate_mindmap"]
+
+    def test_new_answer_invalidates_cache(self, canvas_service):
+        canvas_service._call_llm_with_fallback_async = _as_async(lambda **kwargs: "{}")
+        asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+        canvas_service.get_session("sess_test").add_turn("Q?", "A")
+        asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+
+        assert canvas_service._report_cache.hits == 0
+
+    def test_reuses_current_report_markdown(self, canvas_service):
+        def fake_llm(**kwargs):
+            canvas_service.llm_calls.append(kwargs["step_name"])
+            if kwargs["step_name"] == "generate_report":
+                return "## Overview\nTodo app"
+            return json.dumps({"title": "Todo", "nodes": {"id": "root", "label": "Todo"}})
+
+        canvas_service._call_llm_with_fallback = fake_llm
+        canvas_service._call_llm_with_fallback_async = _as_async(fake_llm)
+        canvas_service._generate_pdf_from_markdown = lambda *args: ""
+
+        canvas_service.generate_report("sess_test", "key")
+        asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+        assert canvas_service.llm_calls == ["generate_report", "generate_mindmap"]
+
+        canvas_service.get_session("sess_test").add_turn("Q?", "A")
+        asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+        assert canvas_service.llm_calls[2:] == ["generate_report_for_mindmap", "generate_mindmap"]
+
+
+class TestMindmapParsing:
+    """Test parsing of mind map JSON responses."""
+
+    def _generate(self, canvas_service, mindmap_response):
+        responses = iter(["## Plan", mindmap_response])
+        canvas_service._call_llm_with_fallback_async = _as_async(
+            lambda **kwargs: next(responses)
+        )
+        return asyncio.run(canvas_service.generate_mindmap_from_session("sess_test", "key"))
+
+    def test_parses_fenced_json(self, canvas_service):
+        result = self._generate(
+            canvas_service, '```json\n{"title": "Todo", "nodes": {"id": "root", "label": "Todo"}}\n```'
+        )
+        assert result["title"] == "Todo"
+        assert result["nodes"] == {"id": "root", "label": "Todo", "children": []}
+
+    def test_extracts_json_from_prose(self, canvas_service):
+        result = self._generate(
+            canvas_service, 'Here you go: {"title": "Todo", "nodes": {"id": "root"}} Enjoy!'
+        )
+        assert result["title"] == "Todo"
+
+    def test_ensure_node_structure_normalizes_nodes(self, canvas_service):
+        node = canvas_service._ensure_node_structure(
+            {
+                "id": 1,
+                "label": "Root",
+                "children": [
+                    {"id": "a", "label": "x" * 150},
+                    {"label": 7, "children": [{"id": "c", "label": "Leaf"}]},
+                ],
+            }
+        )
+        first, second = node["children"]
+        assert node["id"] == "1"
+        assert first == {"id": "a", "label": "x" * 100, "children": []}
+        assert second["label"] == "7"
+        assert len(second["id"]) == 8
+        assert second["children"] == [{"id": "c", "label": "Leaf", "children": []}]
+
+    def test_ensure_node_structure_handles_deep_trees(self, canvas_service):
+        node = {"id": "leaf", "label": "Leaf"}
+        for depth in range(2000):
+            node = {"id": str(depth), "label": "Node", "children": [node]}
+
+        result = canvas_service._ensure_node_structure(node)
+        for _ in range(2000):
+            result = result["children"][0]
+        assert result == {"id": "leaf", "label": "Leaf", "children": []}
+
+    def test_unparseable_response_uses_fallback(self, canvas_service):
+        result = self._generate(canvas_service, "no json here")
+        assert [child["label"] for child in result["nodes"]["children"]] == [
+            "Overview",
+            "Key Features",
+            "Implementation",
+            "Next Steps",
+        ]
+
+
+class TestGenerateReport:
+    """Test report assembly around the LLM call."""
+
+    def test_image_returned_alongside_pdf(self, canvas_service):
+        pdf_inputs = []
+        canvas_service._call_llm_with_fallback = lambda **kwargs: "## Overview\nTodo app"
+        canvas_service._generate_report_image = lambda *args: "aW1n"
+        canvas_service._generate_pdf_from_markdown = lambda *args: pdf_inputs.append(args) or "cGRm"
+
+        report = canvas_service.generate_report("sess_test", "key", image_api_key="img-key")
+
+        assert report["pdf_base64"] == "cGRm"
+        assert report["image_base64"] == "aW1n"
+        assert report["image_format"] == "png"
+        assert pdf_inputs == [(report["title"], report["markdown_content"])]
+
+    def test_image_failure_keeps_report(self, canvas_service):
+        def failing_image(*args):
+            raise RuntimeError("image API down")
+
+        canvas_service._call_llm_with_fallback = lambda **kwargs: "## Overview\nTodo app"
+        canvas_service._generate_report_image = failing_image
+        canvas_service._generate_pdf_from_markdown = lambda *args: "cGRm"
+
+        report = canvas_service.generate_report("sess_test", "key", image_api_key="img-key")
+
+        assert report["pdf_base64"] == "cGRm"
+        assert report["image_base64"] is None
+
+
+class TestGenerateQuestionData:
+    """Test structured-output question generation with JSON-mode fallback."""
+
+    class _FakeLLM:
+        def __init__(self, structured):
+            self.structured = structured
+            self.json_calls = 0
+
+        async def _call_llm_structured_async(self, *args):
+            return self.structured
+
+        async def _call_llm_async(self, *args):
+            self.json_calls += 1
+            return 'Sure: {"question": "Fallback?", "type": "single_choice"}'
+
+    def test_uses_structured_output(self):
+        llm = self._FakeLLM(
+            CanvasQuestionLLM(
+                question="Which stack?",
+                options=[QuestionOption(id="opt_1", label="React")],
+            )
+        )
+        data = asyncio.run(
+            IdeaCanvasService()._generate_question_data(llm, "s", "u", "first_question")
+        )
+        assert data == {
+            "question": "Which stack?",
+            "options": [{"id": "opt_1", "label": "React"}],
+        }
+        assert llm.json_calls == 0
+
+    def test_falls_back_to_json_mode(self):
+        llm = self._FakeLLM(None)
+        data = asyncio.run(
+            IdeaCanvasService()._generate_question_data(llm, "s", "u", "first_question")
+        )
+        assert data["question"] == "Fallback?"
+        assert llm.json_calls == 1
+
+
+class TestInMemorySessionStore:
+    """Test the default in-process session store."""
+
+    def test_save_get_delete(self):
+        store = InMemorySessionStore()
+        session = CanvasSession("sess_test", "idea", CanvasTemplate.CUSTOM, "gemini", "m")
+        store.save(session)
+
+        assert store.get("sess_test") is session
+        assert store.delete("sess_test") is True
+        assert store.get("sess_test") is None
+        assert store.delete("sess_test") is False
+
+    def test_evicts_least_recently_used(self):
+        store = InMemorySessionStore(maxsize=2)
+        for session_id in ("a", "b"):
+            store.save(CanvasSession(session_id, "idea", CanvasTemplate.CUSTOM, "gemini", "m"))
+        store.get("a")
+        store.save(CanvasSession("c", "idea", CanvasTemplate.CUSTOM, "gemini", "m"))
+
+        assert store.get("b") is None
+        assert store.get("a") is not None
+        assert store.stats()["sessions"] == 2
+
+    def test_expires_idle_sessions(self, monkeypatch):
+        store = InMemorySessionStore(ttl_seconds=10)
+        store.save(CanvasSession("a", "idea", CanvasTemplate.CUSTOM, "gemini", "m"))
+        now = idea_canvas.time.monotonic()
+        monkeypatch.setattr(idea_canvas.time, "monotonic", lambda: now + 11)
+
+        assert store.get("a") is None
+        assert store.stats()["sessions"] == 0
+
+
+class TestSessionLocking:
+    """Test that updates to one session do not interleave."""
+
+    def test_answers_to_same_session_run_one_at_a_time(self, canvas_service):
+        trace = []
+
+        async def fake_submit(request, api_key):
+            trace.append(("start", request.answer))
+            await asyncio.sleep(0.01)
+            trace.append(("end", request.answer))
+            yield request.answer
+
+        canvas_service._submit_answer = fake_submit
+
+        async def answer(text):
+            request = idea_canvas.AnswerRequest(
+                session_id="sess_test", question_id="q_1", answer=text
+            )
+            return [event async for event in canvas_service.submit_answer(request, "key")]
+
+        async def run():
+            return await asyncio.gather(answer("one"), answer("two"))
+
+        assert asyncio.run(run()) == [["one"], ["two"]]
+        assert trace == [("start", "one"), ("end", "one"), ("start", "two"), ("end", "two")]
+
+    def test_load_session_runs_off_loop(self, canvas_service):
+        session = asyncio.run(canvas_service.load_session("sess_test"))
+
+        assert session.idea == "Build a todo app"
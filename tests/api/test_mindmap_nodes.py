@@ -0,0 +1,239 @@
+"""Tests for mind map workflow nodes."""
+
+import pytest
+from doc_generator.application.nodes import mindmap_nodes
+from doc_generator.infrastructure.api.services.common import (
+    ResponseCache,
+    SemanticCache,
+    safe_json_parse,
+)
+from doc_generator.utils.token_utils import count_tokens, truncate_to_tokens
+
+
+class TestParseMindmapItem:
+    """Test normalization of LLM mind map nodes."""
+
+    def test_normalizes_labels_and_children(self):
+        item = mindmap_nodes._parse_mindmap_item(
+            {
+                "name": "Root",
+                "children": [
+                    {"text": "Leaf"},
+                    "not a node",
+                    {},
+                    {"label": "Branch", "children": [{"label": "Deep", "children": []}]},
+                ],
+            }
+        )
+        assert item == {
+            "label": "Root",
+            "children": [
+                {"label": "Leaf"},
+                {"label": "Unknown", "children": []},
+                {"label": "Branch", "children": [{"label": "Deep"}]},
+            ],
+        }
+
+    def test_handles_deep_trees(self):
+        node = {"label": "Leaf"}
+        for _ in range(2000):
+            node = {"label": "Node", "children": [node]}
+
+        item = mindmap_nodes._parse_mindmap_item(node)
+        for _ in range(2000):
+            item = item["children"][0]
+        assert item == {"label": "Leaf"}
+
+
+class TestExtractJson:
+    """Test JSON extraction from LLM responses."""
+
+    def test_parses_fenced_json(self):
+        assert mindmap_nodes._extract_json('```json\n{"title": "T"}\n```') == {"title": "T"}
+
+    def test_extracts_object_from_prose(self):
+        text = 'Here it is: {"title": "a } in a string", "nodes": {}} Hope it helps!'
+        assert mindmap_nodes._extract_json(text) == {"title": "a } in a string", "nodes": {}}
+
+    def test_skips_braces_that_do_not_start_json(self):
+        assert mindmap_nodes._extract_json('Use {curly} style: {"title": "T"}') == {"title": "T"}
+
+    def test_parses_fence_after_prose(self):
+        text = 'Here is the map:\n```json\n{"title": "T"}\n```\nLet me know!'
+        assert mindmap_nodes._extract_json(text) == {"title": "T"}
+
+    def test_parses_unterminated_fence(self):
+        assert mindmap_nodes._extract_json('```json\n{"title": "T"}') == {"title": "T"}
+
+    def test_returns_none_without_object(self):
+        assert mindmap_nodes._extract_json("[1, 2]") is None
+        assert mindmap_nodes._extract_json("no json") is None
+
+
+class TestSafeJsonParse:
+    """Test layered JSON parsing used by workflow nodes."""
+
+    def test_parses_direct_fenced_and_embedded_json(self):
+        assert safe_json_parse('{"a": 1}') == {"a": 1}
+        assert safe_json_parse('```json\n{"a": 1}\n```') == {"a": 1}
+        assert safe_json_parse('Result: {"a": 1}.') == {"a": 1}
+        assert safe_json_parse('Sure:\n```\n[1, 2]\n```') == [1, 2]
+        assert safe_json_parse('```json{"a": 1}```') == {"a": 1}
+        assert safe_json_parse("nothing") is None
+
+
+class TestBoundContent:
+    """Test the prompt content token cap."""
+
+    def test_short_content_is_untouched(self):
+        assert mindmap_nodes._bound_content("abc", 10) == "abc"
+        assert mindmap_nodes._bound_content("x" * 100, 0) == "x" * 100
+
+    def test_drops_whole_trailing_sources(self):
+        head = "a" * 400 + mindmap_nodes.SOURCE_SEPARATOR
+        content = head + "b" * 400
+        max_tokens = (
+            count_tokens(head) + count_tokens(mindmap_nodes.CONTENT_TRUNCATED_MARKER) + 5
+        )
+        bounded = mindmap_nodes._bound_content(content, max_tokens)
+        assert bounded == "a" * 400 + mindmap_nodes.CONTENT_TRUNCATED_MARKER
+
+    def test_cut_fits_token_budget(self):
+        for text in ("x" * 2000, "字" * 2000, "mixed 字 text " * 200):
+            bounded = mindmap_nodes._bound_content(text, 100)
+            assert bounded.endswith(mindmap_nodes.CONTENT_TRUNCATED_MARKER)
+            assert count_tokens(bounded) <= 100
+
+    def test_truncate_returns_fitting_text_unchanged(self):
+        text = "mixed 字 text " * 50
+        assert truncate_to_tokens(text, 10_000) is text
+        assert len(truncate_to_tokens(text * 1000, 50)) < len(text)
+
+    def test_non_ascii_text_counts_more_tokens_per_char(self):
+        assert count_tokens("字" * 100) > count_tokens("x" * 100)
+        assert truncate_to_tokens("x" * 100, 1000) == "x" * 100
+
+
+class TestBranchTracker:
+    """Test detection of main branches in streamed mind map JSON."""
+
+    def test_reports_branches_as_they_close(self):
+        tracker = mindmap_nodes._BranchTracker()
+        chunks = [
+            '{"title": "T", "central_node": {"label": "Root", "children": [',
+            '{"label": "First {brace}", "children": [{"label": "Sub"}]}',
+            ', {"label": "Sec',
+            'ond \\"q\\""}',
+            "]}}",
+        ]
+        assert [tracker.feed(chunk) for chunk in chunks] == [
+            [],
+            ["First {brace}"],
+            [],
+            ['Second "q"'],
+            [],
+        ]
+
+    def test_stream_reports_progress(self, monkeypatch):
+        reported = []
+        monkeypatch.setattr(
+            mindmap_nodes,
+            "log_node_progress",
+            lambda name, count, detail: reported.append((name, count, detail)),
+        )
+
+        class _StreamingLLM:
+            def stream_generate(self, prompt, step="generate"):
+                yield '{"central_node": {"label": "R", "children": [{"label": "A"},'
+                yield ' {"label": "B"}]}}'
+
+        response = mindmap_nodes._stream_mindmap_response(_StreamingLLM(), "prompt")
+
+        assert mindmap_nodes._extract_json(response)["central_node"]["label"] == "R"
+        assert reported == [("mindmap_branch", 1, "A"), ("mindmap_branch", 2, "B")]
+
+
+class TestMindmapCache:
+    """Test reuse of mind map trees for identical and near-identical inputs."""
+
+    class _FakeLLM:
+        calls = 0
+
+        def __init__(self, api_key, provider, model):
+            pass
+
+        def stream_generate(self, prompt, step="generate"):
+            type(self).calls += 1
+            yield '{"title": "T", '
+            yield '"central_node": {"label": "Root"}}'
+
+        def embed_text(self, text):
+            return [1.0, 0.0] if text.startswith("Some content") else [0.0, 1.0]
+
+    @pytest.fixture(autouse=True)
+    def caches(self, monkeypatch):
+        monkeypatch.setattr("doc_generator.infrastructure.llm.LLMService", self._FakeLLM)
+        self._FakeLLM.calls = 0
+        exact = ResponseCache()
+        monkeypatch.setattr(mindmap_nodes, "_get_mindmap_cache", lambda: exact)
+        monkeypatch.setattr(mindmap_nodes, "_get_mindmap_semantic_cache", lambda: None)
+
+    def test_identical_inputs_reuse_tree(self):
+        args = ("Some content", "summarize", "gemini", "gemini-2.5-flash", "key", 1)
+
+        first = mindmap_nodes._generate_mindmap_tree_cached(*args)
+        second = mindmap_nodes._generate_mindmap_tree_cached(*args)
+        other_mode = mindmap_nodes._generate_mindmap_tree_cached(
+            "Some content", "detailed", "gemini", "gemini-2.5-flash", "key", 1
+        )
+
+        assert first == (second[0], False)
+        assert second[1] is True
+        assert other_mode[1] is False
+        assert self._FakeLLM.calls == 2
+
+    def test_similar_content_hits_semantic_cache(self, monkeypatch):
+        semantic = SemanticCache(threshold=0.97)
+        monkeypatch.setattr(mindmap_nodes, "_get_mindmap_semantic_cache", lambda: semantic)
+
+        def generate(content):
+            return mindmap_nodes._generate_mindmap_tree_cached(
+                content, "summarize", "gemini", "gemini-2.5-flash", "key", 1
+            )
+
+        generate("Some content, first draft")
+        tree, cached = generate("Some content, second draft")
+        _, unrelated_cached = generate("Unrelated text")
+
+        assert cached is True
+        assert tree["title"] == "T"
+        assert unrelated_cached is False
+        assert self._FakeLLM.calls == 2
+
+    def test_cache_is_scoped_to_api_key(self):
+        args = ("Some content", "summarize", "gemini", "gemini-2.5-flash")
+
+        mindmap_nodes._generate_mindmap_tree_cached(*args, "key-a", 1)
+        _, same_key_cached = mindmap_nodes._generate_mindmap_tree_cached(
+            *args, "key-a", 1
+        )
+        _, other_key_cached = mindmap_nodes._generate_mindmap_tree_cached(
+            *args, "key-b", 1
+        )
+
+        assert same_key_cached is True
+        assert other_key_cached is False
+        assert self._FakeLLM.calls == 2
+
+    def test_cached_tree_is_not_shared_by_reference(self):
+        args = ("Some content", "summarize", "gemini", "gemini-2.5-flash", "key", 1)
+
+        first, _ = mindmap_nodes._generate_mindmap_tree_cached(*args)
+        first["title"] = "Changed"
+        second, _ = mindmap_nodes._generate_mindmap_tree_cached(*args)
+        second["nodes"]["label"] = "Changed"
+        third, cached = mindmap_nodes._generate_mindmap_tree_cached(*args)
+
+        assert cached is True
+        assert third["title"] == "T"
+        assert third["nodes"]["label"] == "Root"
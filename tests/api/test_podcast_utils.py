@@ -0,0 +1,175 @@
+"""Tests for podcast workflow helpers."""
+
+import base64
+import io
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from doc_generator.utils import podcast_utils
+
+
+class TestWavEncoding:
+    """Test WAV packaging of synthesized PCM audio."""
+
+    @pytest.mark.parametrize("size", [0, 1, 2, 3, 4800, 4801])
+    def test_base64_matches_wave_file(self, size):
+        pcm = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+        decoded = base64.b64decode(podcast_utils.wav_base64(pcm))
+
+        with wave.open(io.BytesIO(decoded), "rb") as wav_file:
+            assert wav_file.getnchannels() == 1
+            assert wav_file.getsampwidth() == 2
+            assert wav_file.getframerate() == 24000
+            assert wav_file.readframes(wav_file.getnframes()) == pcm[: size - size % 2]
+        assert decoded == podcast_utils.wave_bytes(pcm)
+
+    @pytest.mark.parametrize("size", [0, 2, 4800])
+    def test_wave_bytes_matches_wave_module(self, size):
+        pcm = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(24000)
+            wav_file.writeframes(pcm)
+
+        assert podcast_utils.wave_bytes(pcm) == buffer.getvalue()
+
+
+class TestExtractJson:
+    """Test script JSON extraction from LLM responses."""
+
+    def test_parses_bare_fenced_and_embedded_objects(self):
+        script = {"title": "Ep", "dialogue": [{"speaker": "A", "text": "} {"}]}
+        bare = '{"title": "Ep", "dialogue": [{"speaker": "A", "text": "} {"}]}'
+
+        assert podcast_utils.extract_json(bare) == script
+        assert podcast_utils.extract_json(f"```json\n{bare}\n```") == script
+        assert podcast_utils.extract_json(f"Here you go: {bare} Enjoy!") == script
+
+    def test_returns_none_without_object(self):
+        assert podcast_utils.extract_json("") is None
+        assert podcast_utils.extract_json("[1, 2]") is None
+        assert podcast_utils.extract_json("{not json") is None
+
+
+class TestTTSRequestPool:
+    """Test sharing of identical in-flight TTS requests."""
+
+    def test_concurrent_identical_requests_share_one_call(self, monkeypatch):
+        calls = []
+        started = {"A: hi": threading.Event(), "A: bye": threading.Event()}
+        release = threading.Event()
+
+        def fake_synthesize(tts_prompt, speakers, api_key):
+            calls.append(tts_prompt)
+            started[tts_prompt].set()
+            release.wait(5)
+            return tts_prompt.encode()
+
+        monkeypatch.setattr(podcast_utils, "synthesize_with_retry", fake_synthesize)
+        pool = podcast_utils._TTSRequestPool(max_concurrent=2)
+        speakers = [{"name": "Alex", "voice": "Kore"}]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(pool.synthesize, "A: hi", speakers, "key")
+            assert started["A: hi"].wait(timeout=5)
+            second = executor.submit(pool.synthesize, "A: hi", speakers, "key")
+            other = executor.submit(pool.synthesize, "A: bye", speakers, "key")
+            assert started["A: bye"].wait(timeout=5)
+            release.set()
+            results = [first.result(), second.result(), other.result()]
+
+        assert results == [b"A: hi", b"A: hi", b"A: bye"]
+        assert sorted(calls) == ["A: bye", "A: hi"]
+
+    def test_failure_is_shared_and_not_cached(self, monkeypatch):
+        def failing(tts_prompt, speakers, api_key):
+            raise RuntimeError("unavailable")
+
+        monkeypatch.setattr(podcast_utils, "synthesize_with_retry", failing)
+        pool = podcast_utils._TTSRequestPool(max_concurrent=1)
+
+        with pytest.raises(RuntimeError):
+            pool.synthesize("A: hi", [{"name": "Alex"}], "key")
+        assert pool._pending == {}
+
+    def test_streams_chunks_to_the_caller(self, monkeypatch):
+        def fake_stream(tts_prompt, speakers, api_key):
+            yield b"ab"
+            yield b"cd"
+
+        monkeypatch.setattr(podcast_utils, "stream_synthesis", fake_stream)
+        pool = podcast_utils._TTSRequestPool(max_concurrent=1)
+        received = []
+
+        audio = pool.synthesize("A: hi", [{"name": "A"}], "key", received.append)
+
+        assert received == [b"ab", b"cd"]
+        assert audio == b"abcd"
+
+    def test_caps_concurrent_calls(self, monkeypatch):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_synthesize(tts_prompt, speakers, api_key):
+            with lock:
+                active.append(tts_prompt)
+                peak.append(len(active))
+            threading.Event().wait(0.05)
+            with lock:
+                active.remove(tts_prompt)
+            return b""
+
+        monkeypatch.setattr(podcast_utils, "synthesize_with_retry", fake_synthesize)
+        pool = podcast_utils._TTSRequestPool(max_concurrent=2)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            list(
+                executor.map(
+                    lambda i: pool.synthesize(f"A: {i}", [{"name": "A"}], "key"),
+                    range(6),
+                )
+            )
+
+        assert len(peak) == 6
+        assert max(peak) <= 2
+
+
+class TestBuildTtsPrompt:
+    """Test the multi-speaker TTS prompt."""
+
+    def test_names_speakers_and_skips_empty_lines(self):
+        prompt = podcast_utils.build_tts_prompt(
+            [
+                {"speaker": "Alex", "text": "Hi there"},
+                {"speaker": "Sam", "text": "  "},
+                {"text": "No speaker"},
+            ],
+            [{"name": "Alex", "voice": "Kore"}, {"name": "Sam", "voice": "Puck"}],
+        )
+
+        assert prompt == (
+            "TTS the following conversation between Alex and Sam:\n"
+            "Alex: Hi there\n"
+            "Alex: No speaker"
+        )
+
+
+class TestWavHeader:
+    """Test the specialized header for Gemini TTS audio."""
+
+    @pytest.mark.parametrize("size", [0, 1, 4800])
+    def test_template_matches_generic_header(self, size):
+        assert podcast_utils._wav_header(size) == podcast_utils._pack_wav_header(
+            size, 1, 24000, 2
+        )
+
+    def test_other_formats_use_generic_header(self):
+        header = podcast_utils._wav_header(8, channels=2, rate=48000)
+        assert header == podcast_utils._pack_wav_header(8, 2, 48000, 2)
@@ -0,0 +1,37 @@
+"""Tests for response cache."""
+
+import pytest
+from doc_generator.infrastructure.api.services.common import ResponseCache
+
+
+@pytest.fixture
+def response_cache():
+    """Create a small response cache."""
+    return ResponseCache(maxsize=2, ttl_seconds=60)
+
+
+class TestResponseCache:
+    """Test response cache."""
+
+    def test_key_is_order_insensitive_for_dicts(self):
+        assert ResponseCache.make_key({"a": 1, "b": 2}) == ResponseCache.make_key({"b": 2, "a": 1})
+        assert ResponseCache.make_key("report", [1]) != ResponseCache.make_key("mindmap", [1])
+
+    def test_set_then_get_hits(self, response_cache):
+        response_cache.set("k", {"title": "T"})
+        assert response_cache.get("k") == {"title": "T"}
+        assert response_cache.hits == 1
+
+    def test_least_recently_used_evicted(self, response_cache):
+        response_cache.set("a", 1)
+        response_cache.set("b", 2)
+        response_cache.get("a")
+        response_cache.set("c", 3)
+        assert response_cache.get("b") is None
+        assert response_cache.get("a") == 1
+
+    def test_expired_entry_misses(self):
+        cache = ResponseCache(ttl_seconds=0)
+        cache.set("k", 1)
+        assert cache.get("k") is None
+        assert cache.misses == 1
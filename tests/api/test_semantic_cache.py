@@ -0,0 +1,40 @@
+"""Tests for semantic cache."""
+
+import pytest
+from doc_generator.infrastructure.api.services.common import SemanticCache
+
+
+@pytest.fixture
+def semantic_cache():
+    """Create semantic cache with a high similarity threshold."""
+    return SemanticCache(threshold=0.9, maxsize=2, ttl_seconds=60)
+
+
+class TestSemanticCache:
+    """Test semantic cache."""
+
+    def test_similar_embedding_hits(self, semantic_cache):
+        semantic_cache.set("ns", [1.0, 0.0, 0.1], "cached")
+        assert semantic_cache.get("ns", [0.9, 0.0, 0.1]) == "cached"
+        assert semantic_cache.hits == 1
+
+    def test_dissimilar_embedding_misses(self, semantic_cache):
+        semantic_cache.set("ns", [1.0, 0.0], "cached")
+        assert semantic_cache.get("ns", [0.0, 1.0]) is None
+        assert semantic_cache.misses == 1
+
+    def test_namespaces_are_isolated(self, semantic_cache):
+        semantic_cache.set("a", [1.0, 0.0], "cached")
+        assert semantic_cache.get("b", [1.0, 0.0]) is None
+
+    def test_oldest_entry_evicted(self, semantic_cache):
+        semantic_cache.set("ns", [1.0, 0.0, 0.0], "first")
+        semantic_cache.set("ns", [0.0, 1.0, 0.0], "second")
+        semantic_cache.set("ns", [0.0, 0.0, 1.0], "third")
+        assert semantic_cache.get("ns", [1.0, 0.0, 0.0]) is None
+        assert semantic_cache.get("ns", [0.0, 0.0, 1.0]) == "third"
+
+    def test_expired_entry_misses(self):
+        cache = SemanticCache(ttl_seconds=0)
+        cache.set("ns", [1.0, 0.0], "cached")
+        assert cache.get("ns", [1.0, 0.0]) is None
@@ -91,3 +91,112 @@ class TestStorageService:
         assert path.exists()
         storage_service.cleanup_upload(file_id)
         assert not path.exists()
+
+
+class TestStreamedUploads:
+    """Test streaming uploads to disk."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        return StorageService(base_output_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    def test_copies_reader_in_chunks(self, storage, monkeypatch):
+        import io
+
+        from doc_generator.infrastructure.api.services import storage as storage_module
+
+        class RecordingReader(io.BytesIO):
+            def __init__(self, data):
+                super().__init__(data)
+                self.read_sizes = []
+
+            def read(self, size=-1):
+                self.read_sizes.append(size)
+                return super().read(size)
+
+        monkeypatch.setattr(storage_module, "UPLOAD_COPY_BUFFER_BYTES", 4)
+        content = b"0123456789" * 3
+        reader = RecordingReader(content)
+
+        file_id = storage.save_upload_stream(reader, "notes.txt", "text/plain")
+
+        path = storage.get_upload_path(file_id)
+        assert path.name == "notes.txt"
+        assert path.read_bytes() == content
+        assert len(reader.read_sizes) > 1
+        assert all(0 < size <= 4 for size in reader.read_sizes)
+
+    def test_bytes_wrapper_matches_stream(self, storage):
+        file_id = storage.save_upload(b"abc", "a.txt", "text/plain")
+        assert storage.get_upload_path(file_id).read_bytes() == b"abc"
+
+    def test_upload_path_resolves_across_instances(self, storage, tmp_path):
+        file_id = storage.save_upload(b"abc", "a.txt", "text/plain")
+        other = StorageService(base_output_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+        assert other.get_upload_path(file_id) == storage.get_upload_path(file_id)
+        with pytest.raises(FileNotFoundError):
+            other.get_upload_path("f_missing")
+
+    def test_download_url_is_relative_to_output_root(self, storage):
+        path = storage.save_output(b"RIFF", "podcast.wav", "audio")
+
+        url = storage.get_download_url(path)
+        rel_path = path.relative_to(storage.base_output_dir).as_posix()
+
+        assert url.startswith(f"/api/download/{rel_path}?token=")
+        assert storage.get_download_url(path) == url
+        assert storage.get_download_url(storage.base_output_dir / "x.pdf") != url
+
+    def test_durable_uploads_sync_file_data(self, storage, monkeypatch):
+        from doc_generator.infrastructure.api.services import storage as storage_module
+
+        synced = []
+        monkeypatch.setattr(storage_module, "_fdatasync", synced.append)
+
+        storage.save_upload(b"abc", "a.txt", "text/plain")
+        storage.durable_uploads = True
+        file_id = storage.save_upload(b"def", "b.txt", "text/plain")
+
+        assert len(synced) == 1
+        assert storage.get_upload_path(file_id).read_bytes() == b"def"
+
+
+class TestUploadMetadataSidecar:
+    """Test upload metadata persisted next to each upload."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        from doc_generator.infrastructure.storage import StorageService as FileStorage
+
+        return FileStorage(base_output_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+    def test_metadata_survives_new_instance(self, storage, tmp_path):
+        from doc_generator.infrastructure.storage import StorageService as FileStorage
+
+        file_id = storage.save_upload(b"abc", "a.txt", "text/plain")
+        other = FileStorage(base_output_dir=tmp_path, cache_dir=tmp_path / "cache")
+
+        meta = other.get_upload_metadata(file_id)
+        assert meta["mime_type"] == "text/plain"
+        assert meta["path"] == storage.get_upload_path(file_id)
+        assert other.get_upload_content(file_id) == b"abc"
+
+    def test_sidecar_survives_moved_base_dir(self, storage, tmp_path):
+        from doc_generator.infrastructure.storage import StorageService as FileStorage
+
+        file_id = storage.save_upload(b"abc", "a.txt", "text/plain")
+        moved = tmp_path.parent / f"{tmp_path.name}_moved"
+        tmp_path.rename(moved)
+        other = FileStorage(base_output_dir=moved, cache_dir=moved / "cache")
+
+        assert other.get_upload_path(file_id) == moved / file_id / "source" / "a.txt"
+        assert other.get_upload_content(file_id) == b"abc"
+
+    def test_cleanup_uses_sidecars(self, storage):
+        old = storage.save_upload(b"abc", "a.txt", "text/plain")
+        storage.get_upload_path(old)
+
+        assert storage.cleanup_expired_uploads(max_age_seconds=-1) == 1
+        with pytest.raises(FileNotFoundError):
+            storage.get_upload_path(old)
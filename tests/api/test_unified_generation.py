@@ -0,0 +1,381 @@
+"""Tests for the unified generation service."""
+
+import asyncio
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from doc_generator.infrastructure.api.services import unified_generation
+from doc_generator.infrastructure.api.services.unified_generation import (
+    UnifiedGenerationService,
+)
+
+
+@pytest.fixture
+def service():
+    """Create a service without touching real storage or checkpoints."""
+    service = UnifiedGenerationService.__new__(UnifiedGenerationService)
+    service._workflow_executor = ThreadPoolExecutor(max_workers=2)
+    yield service
+    asyncio.run(service.aclose())
+
+
+def _labels(node):
+    return [node.label, [_labels(child) for child in node.children]]
+
+
+class TestParseMindmapNode:
+    """Test conversion of workflow trees into response nodes."""
+
+    def test_assigns_prefixed_ids_and_coerces_labels(self, service):
+        node = service._parse_mindmap_node(
+            {"label": 7, "children": [{"label": "Leaf"}, "not a node"]}
+        )
+        assert node.label == "7"
+        assert node.id.startswith("node_")
+        assert [child.label for child in node.children] == ["Leaf"]
+        assert node.children[0].id.startswith("node_")
+        assert node.children[0].id != node.id
+
+    def test_null_children_do_not_end_the_list(self, service):
+        node = service._parse_mindmap_node(
+            {"children": [None, {"label": "A"}, {"label": "B"}]}
+        )
+        assert [child.label for child in node.children] == ["A", "B"]
+
+    def test_handles_deep_trees(self, service):
+        tree = {"label": "Leaf"}
+        for _ in range(5000):
+            tree = {"label": "Node", "children": [tree]}
+
+        node = service._parse_mindmap_node(tree)
+
+        ids = set()
+        for _ in range(5000):
+            ids.add(node.id)
+            node = node.children[0]
+        assert node.label == "Leaf"
+        assert len(ids) == 5000
+
+    def test_shares_repeated_subtrees_without_dropping_them(self, service):
+        references = {"label": "References", "children": [{"label": "Paper"}]}
+        tree = {
+            "label": "Root",
+            "children": [
+                {"label": "A", "children": [references, dict(references)]},
+                {"label": "B", "children": [references]},
+                {"label": "References", "children": [{"label": "Other"}]},
+            ],
+        }
+
+        node = service._parse_mindmap_node(tree)
+
+        assert _labels(node) == [
+            "Root",
+            [
+                [
+                    "A",
+                    [["References", [["Paper", []]]], ["References", [["Paper", []]]]],
+                ],
+                ["B", [["References", [["Paper", []]]]]],
+                ["References", [["Other", []]]],
+            ],
+        ]
+        first, second = node.children[0].children
+        assert first is second is node.children[1].children[0]
+        assert node.children[2] is not first
+
+    def test_serialized_ids_are_unique(self, service):
+        from doc_generator.infrastructure.api.schemas.mindmap import (
+            MindMapMode,
+            MindMapTree,
+        )
+
+        leaf = {"label": "Leaf", "children": [{"label": "Detail"}]}
+        node = service._parse_mindmap_node(
+            {"label": "Root", "children": [leaf, leaf, {"label": "X", "children": [leaf]}]}
+        )
+        tree = MindMapTree.model_construct(
+            title="t", summary="", source_count=1, mode=MindMapMode.SUMMARIZE, nodes=node
+        )
+
+        dumped = json.loads(tree.model_dump_json())
+        ids = []
+        stack = [dumped["nodes"]]
+        while stack:
+            current = stack.pop()
+            ids.append(current["id"])
+            stack.extend(current["children"])
+        assert len(ids) == 8
+        assert len(set(ids)) == 8
+        # The in-memory tree keeps sharing its nodes
+        assert node.children[0] is node.children[1]
+
+    def test_dedup_can_be_disabled(self, service):
+        child = {"label": "Same"}
+        node = service._parse_mindmap_node(
+            {"label": "Root", "children": [child, child]}, dedup=False
+        )
+        assert len(node.children) == 2
+        assert node.children[0] is not node.children[1]
+        assert len({c.id for c in node.children}) == 2
+
+
+class TestInlinePreviews:
+    """Test inline previews read from mapped output files."""
+
+    def test_pdf_and_markdown_previews(self, tmp_path):
+        pdf = tmp_path / "doc.pdf"
+        pdf.write_bytes(b"%PDF-1.7" * 1000)
+        md = tmp_path / "doc.md"
+        md.write_text("# Título", encoding="utf-8")
+        empty = tmp_path / "empty.pdf"
+        empty.write_bytes(b"")
+
+        assert base64.b64decode(unified_generation._read_pdf_preview(pdf)) == (
+            b"%PDF-1.7" * 1000
+        )
+        assert unified_generation._read_text_preview(md) == "# Título"
+        assert unified_generation._read_pdf_preview(empty) == ""
+
+
+class TestGenerateDocument:
+    """Test how generated documents are delivered."""
+
+    def _collect(self, service, monkeypatch, tmp_path, inline_preview):
+        from doc_generator.infrastructure.api.services.storage import StorageService
+
+        output = tmp_path / "f_doc" / "pdf" / "doc.pdf"
+        output.parent.mkdir(parents=True)
+        output.write_bytes(b"%PDF-1.7")
+
+        def fake_workflow(progress_callback=None, **kwargs):
+            progress_callback(1, 2, "extract_sources", "Extract")
+            progress_callback(2, 2, "generate_output", "Render")
+            return {"output_path": str(output), "metadata": {}}, "sess"
+
+        service.storage = StorageService(
+            base_output_dir=tmp_path, cache_dir=tmp_path / "cache"
+        )
+        monkeypatch.setattr(
+            unified_generation, "run_unified_workflow_with_session", fake_workflow
+        )
+
+        async def run():
+            return [
+                event
+                async for event in service.generate_document(
+                    sources=[{"type": "text", "content": "x"}],
+                    output_format="pdf",
+                    preferences={},
+                    api_key="key",
+                    inline_preview=inline_preview,
+                )
+            ]
+
+        return asyncio.run(run())
+
+    def test_streams_workflow_progress(self, service, monkeypatch, tmp_path):
+        events = self._collect(service, monkeypatch, tmp_path, inline_preview=False)
+
+        messages = [event.message for event in events if event.status != "complete"]
+        assert "STEP 1/2: Extract" in messages
+        assert "STEP 2/2: Render" in messages
+        assert events[-1].status == "complete"
+
+    def test_pdf_is_served_by_url(self, service, monkeypatch, tmp_path):
+        event = self._collect(service, monkeypatch, tmp_path, inline_preview=False)[-1]
+
+        assert event.download_url.startswith("/api/download/f_doc/pdf/doc.pdf?")
+        assert event.pdf_base64 is None
+
+    def test_inline_preview_is_opt_in(self, service, monkeypatch, tmp_path):
+        event = self._collect(service, monkeypatch, tmp_path, inline_preview=True)[-1]
+
+        assert base64.b64decode(event.pdf_base64) == b"%PDF-1.7"
+
+
+class TestWorkflowExecutor:
+    """Test that workflows run on the service's own thread pool."""
+
+    def test_runs_on_workflow_pool(self, monkeypatch):
+        service = UnifiedGenerationService.__new__(UnifiedGenerationService)
+        service._workflow_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="docgen-wf"
+        )
+        monkeypatch.setattr(
+            unified_generation,
+            "run_unified_workflow_with_session",
+            lambda **kwargs: threading.current_thread().name,
+        )
+
+        name = asyncio.run(service._run_workflow_async("mindmap", {}, "key"))
+        asyncio.run(service.aclose())
+
+        assert name.startswith("docgen-wf")
+
+
+class TestDocumentProgressQueue:
+    """Test coalescing of queued document progress events."""
+
+    def test_keeps_only_latest_event_per_stage(self):
+        from doc_generator.infrastructure.api.schemas.responses import (
+            GenerationStatus,
+            ProgressEvent,
+        )
+
+        async def run():
+            queue = asyncio.Queue(maxsize=unified_generation.PROGRESS_QUEUE_MAXSIZE)
+            for status, progress in [
+                (GenerationStatus.PARSING, 30),
+                (GenerationStatus.TRANSFORMING, 40),
+                (GenerationStatus.PARSING, 35),
+                (GenerationStatus.TRANSFORMING, 50),
+            ]:
+                unified_generation._put_latest_progress(
+                    queue, ProgressEvent(status=status, progress=progress)
+                )
+            return [queue.get_nowait().progress for _ in range(queue.qsize())]
+
+        assert asyncio.run(run()) == [35, 50]
+
+    def test_full_queue_drops_oldest_instead_of_waiting(self):
+        from doc_generator.infrastructure.api.schemas.responses import (
+            GenerationStatus,
+            ProgressEvent,
+        )
+
+        queue = asyncio.Queue(maxsize=2)
+        for status, progress in [
+            (GenerationStatus.PARSING, 30),
+            (GenerationStatus.TRANSFORMING, 40),
+            (GenerationStatus.GENERATING_OUTPUT, 50),
+        ]:
+            unified_generation._put_latest_progress(
+                queue, ProgressEvent(status=status, progress=progress)
+            )
+
+        assert [queue.get_nowait().progress for _ in range(queue.qsize())] == [40, 50]
+
+    def test_drain_batches_latest_event_per_stage(self):
+        from doc_generator.infrastructure.api.schemas.responses import (
+            GenerationStatus,
+            ProgressEvent,
+        )
+
+        async def run():
+            queue = asyncio.Queue()
+            queue.put_nowait(
+                ProgressEvent(status=GenerationStatus.PARSING, progress=32)
+            )
+            queue.put_nowait(
+                ProgressEvent(status=GenerationStatus.TRANSFORMING, progress=40)
+            )
+            first = ProgressEvent(status=GenerationStatus.PARSING, progress=30)
+            batch = unified_generation._drain_latest_progress(queue, [first])
+            return [event.progress for event in batch], queue.empty()
+
+        assert asyncio.run(run()) == ([32, 40], True)
+
+
+class TestGenerateMindmapProgress:
+    """Test progress events streamed while a mind map is generated."""
+
+    def _collect(self, service, monkeypatch, work):
+        async def fake_run(progress_callback=None, **kwargs):
+            return await asyncio.to_thread(work, progress_callback)
+
+        monkeypatch.setattr(unified_generation, "MINDMAP_HEARTBEAT_SECONDS", 0.05)
+        monkeypatch.setattr(service, "_run_workflow_async", fake_run, raising=False)
+
+        async def run():
+            return [
+                event
+                async for event in service.generate_mindmap(
+                    [{"type": "text", "content": "x"}], "summarize", "key"
+                )
+            ]
+
+        return asyncio.run(run())
+
+    def test_heartbeats_while_model_runs(self, service, monkeypatch):
+        def work(progress):
+            time.sleep(0.3)
+            progress(1, 0, "mindmap_branch", "Alpha")
+            time.sleep(0.1)
+            tree = {"title": "T", "nodes": {"label": "Root"}}
+            return {"mindmap_tree": tree, "metadata": {}}, "sess"
+
+        events = self._collect(service, monkeypatch, work)
+
+        progress = [event for event in events if event.type == "progress"]
+        percents = [event.percent for event in progress]
+        assert percents == sorted(percents)
+        assert len(progress) > 3
+        assert any(event.message == "Added branch: Alpha" for event in progress)
+        assert events[-1].type == "complete"
+        assert events[-1].tree.nodes.label == "Root"
+
+
+class TestGeneratePodcast:
+    """Test delivery of synthesized podcast audio."""
+
+    def _collect(self, service, monkeypatch, tmp_path, inline_audio):
+        from doc_generator.infrastructure.api.services.storage import StorageService
+
+        async def fake_run(request_data=None, progress_callback=None, **kwargs):
+            progress_callback(1, 0, "podcast_audio_chunk", "2 bytes")
+            result = {"podcast_audio_data": b"\x01\x00" * 10, "podcast_title": "Ep"}
+            if request_data["inline_audio"]:
+                result["podcast_audio_base64"] = "UklGRg=="
+            return result, "sess"
+
+        service.storage = StorageService(
+            base_output_dir=tmp_path, cache_dir=tmp_path / "cache"
+        )
+        monkeypatch.setattr(service, "_run_workflow_async", fake_run, raising=False)
+
+        async def run():
+            return [
+                event
+                async for event in service.generate_podcast(
+                    sources=[{"type": "text", "content": "x"}],
+                    style="conversational",
+                    speakers=[],
+                    duration_minutes=1,
+                    api_key="key",
+                    gemini_api_key="key",
+                    inline_audio=inline_audio,
+                )
+            ]
+
+        return asyncio.run(run())
+
+    def test_reports_synthesis_progress_without_audio(
+        self, service, monkeypatch, tmp_path
+    ):
+        events = self._collect(service, monkeypatch, tmp_path, inline_audio=False)
+
+        chunks = [event for event in events if event.type == "progress"][1:]
+        assert [c.stage for c in chunks] == ["synthesizing"]
+        assert "AQA=" not in chunks[0].model_dump_json()
+
+    def test_serves_audio_from_storage(self, service, monkeypatch, tmp_path):
+        event = self._collect(service, monkeypatch, tmp_path, inline_audio=False)[-1]
+
+        assert event.type == "complete"
+        assert event.audio_base64 is None
+        assert event.audio_url.startswith("/api/download/f_")
+        rel_path = event.audio_url.split("/api/download/")[1].split("?")[0]
+        wav = (tmp_path / rel_path).read_bytes()
+        assert wav[:4] == b"RIFF"
+        assert wav.endswith(b"\x01\x00" * 10)
+
+    def test_inline_audio_is_opt_in(self, service, monkeypatch, tmp_path):
+        event = self._collect(service, monkeypatch, tmp_path, inline_audio=True)[-1]
+
+        assert event.audio_base64 == "UklGRg=="
+        assert event.audio_url
@@ -0,0 +1,31 @@
+"""Tests for the unified generation route helpers."""
+
+import pytest
+from doc_generator.infrastructure.api.routes import unified
+from doc_generator.infrastructure.api.schemas.requests import GenerateRequest
+
+
+@pytest.fixture
+def request_body():
+    return {"output_format": "pdf", "sources": [{"type": "text", "content": "x"}]}
+
+
+class TestWantsInlinePreview:
+    """Test how clients opt in to inline document previews."""
+
+    def test_body_flag_is_the_default(self, request_body):
+        plain = GenerateRequest(**request_body)
+        inline = GenerateRequest(**request_body, inline_preview=True)
+
+        assert unified._wants_inline_preview(plain, None, None) is False
+        assert unified._wants_inline_preview(inline, None, None) is True
+
+    def test_prefer_minimal_skips_preview(self, request_body):
+        inline = GenerateRequest(**request_body, inline_preview=True)
+
+        assert unified._wants_inline_preview(inline, None, "return=minimal") is False
+
+    def test_query_param_wins(self, request_body):
+        plain = GenerateRequest(**request_body)
+
+        assert unified._wants_inline_preview(plain, True, "return=minimal") is True